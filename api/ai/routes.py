@@ -1,35 +1,108 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from core.database import get_db
-from core.models import Message
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.config import settings
+from core.database import get_read_db
+from core.export_store import ExportInfo, export_store
+from core.room_events import sse_event
+from core.room_export import ExportUpstreamError, export_room, export_rooms, exportable_rooms, has_messages, max_batch_concurrency
+from datetime import datetime
+from typing import List, Optional
+import asyncio
 import aiohttp
-import os
+import time
 
 # API 라우터 객체 생성: '/ai' 경로 하위에 엔드포인트 정의
 router = APIRouter()
 
+class BatchExportRequest(BaseModel):
+    room_ids: Optional[List[int]] = None        # 내보낼 방 ID 목록
+    created_from: Optional[datetime] = None     # 이 시각 이후(포함) 생성된 방
+    created_to: Optional[datetime] = None       # 이 시각 이전(미포함) 생성된 방
+    concurrency: Optional[int] = None           # 동시에 처리할 방 수, 기본값은 settings.EXPORT_BATCH_CONCURRENCY
+
 # 채팅 룸 대화를 AI 서버로 내보내고 처리 결과를 저장하는 엔드포인트
 @router.get("/rooms/{room_id}/export")
-async def export_to_ai(room_id: int, db: Session = Depends(get_db)):
-    # 지정된 채팅 룸의 모든 메시지 조회
-    messages = db.query(Message).filter(Message.chat_room_id == room_id).all()
-    if not messages:
+async def export_to_ai(room_id: int, db: AsyncSession = Depends(get_read_db)):
+    if not await has_messages(db, room_id):
         # 메시지가 없으면 404 에러 발생
         raise HTTPException(status_code=404, detail="No messages found")
 
-    # 메시지를 JSON 형식으로 변환
-    conversation = [{"content": m.content, "is_system": m.is_system} for m in messages]
+    # 메시지를 나눠 읽으며 AI LangChain 서버로 스트리밍 전송하고, 응답은 받는 대로 새 버전 파일에 저장
+    try:
+        info = await export_room(db, room_id)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="AI process request timed out")
+    except aiohttp.ClientError as e:
+        raise HTTPException(status_code=502, detail=f"Failed to connect to AI server: {e}")
+    except ExportUpstreamError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    # 성공 메시지와 저장된 버전 정보 반환
+    return {"message": "Exported and processed by AI", "file": info.path, **info.to_dict()}
+
+# 채팅 룸의 저장된 내보내기 버전 목록 조회
+@router.get("/rooms/{room_id}/exports")
+async def list_exports(room_id: int):
+    versions = await export_store.versions(room_id)
+    return [info.to_dict() for info in reversed(versions)]  # 최신 버전부터
+
+# 저장된 내보내기 파일 다운로드 (version은 번호 또는 "latest", Range 요청 지원)
+@router.get("/rooms/{room_id}/exports/{version}")
+async def download_export(room_id: int, version: str):
+    if version == "latest":
+        info = await export_store.get(room_id)
+    elif version.isdigit():
+        info = await export_store.get(room_id, int(version))
+    else:
+        raise HTTPException(status_code=422, detail="version must be a number or 'latest'")
+    if info is None:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return export_file_response(info)
+
+def export_file_response(info: ExportInfo) -> FileResponse:
+    """저장된 파일을 그대로 전송. gzip 파일은 압축을 풀지 않고 .json.gz로 내려줌"""
+    filename = f"room_{info.room_id}_v{info.version}.json" + (".gz" if info.compressed else "")
+    media_type = "application/gzip" if info.compressed else "application/json"
+    return FileResponse(info.path, media_type=media_type, filename=filename)
+
+
+# 여러 채팅 룸을 한 번에 내보내는 엔드포인트: 방별 완료 이벤트를 SSE로 전송
+@router.post("/exports/batch")
+async def batch_export(request: BatchExportRequest, db: AsyncSession = Depends(get_read_db)):
+    """room_ids 또는 생성 시각 범위로 고른 방들을 동시에 내보냄.
+
+    대상 방과 메시지 수는 한 번의 GROUP BY 쿼리로 구하고, 방마다 export와 같은 스트리밍 내보내기를
+    최대 concurrency개씩 동시에 실행한다. 이벤트 순서:
+    start(대상/건너뛴 방) -> room(방 하나가 끝날 때마다, 끝난 순서대로) -> done(요약)
+    """
+    if request.room_ids is None and request.created_from is None and request.created_to is None:
+        raise HTTPException(status_code=422, detail="room_ids, created_from or created_to is required")
+    max_concurrency = max_batch_concurrency()
+    if request.concurrency and not 1 <= request.concurrency <= max_concurrency:
+        raise HTTPException(status_code=422, detail=f"concurrency must be between 1 and {max_concurrency}")
+    concurrency = min(request.concurrency or settings.EXPORT_BATCH_CONCURRENCY, max_concurrency)
 
-    # AI LangChain 서버로 비동기 요청 전송
-    async with aiohttp.ClientSession() as session:
-        async with session.post(f"{settings.AI_LANGCHAIN_URL}/process", json=conversation) as resp:
-            ai_response = await resp.json()  # AI 서버 응답 받기
+    rooms = await exportable_rooms(db, request.room_ids, request.created_from, request.created_to)
+    # 조회에 쓴 연결을 풀에 돌려줌 (방별 내보내기는 각자 읽기 세션을 연다)
+    await db.close()
+    found = {room_id for room_id, _ in rooms}
+    # 요청한 방 중 메시지가 없거나 존재하지 않는 방
+    skipped = sorted(set(request.room_ids) - found) if request.room_ids is not None else []
 
-    # AI 응답을 파일로 저장
-    file_name = f"ai_response_{room_id}.json"
-    with open(file_name, "w") as f:
-        f.write(str(ai_response))  # 응답을 문자열로 저장
+    async def events():
+        started = time.perf_counter()
+        counts = {"exported": 0, "failed": 0}
+        yield sse_event("start", {"total": len(rooms), "concurrency": concurrency, "skipped": skipped})
+        async for result in export_rooms(rooms, concurrency):
+            counts[result["status"]] += 1
+            yield sse_event("room", result)
+        yield sse_event("done", {
+            "total": len(rooms),
+            **counts,
+            "skipped": len(skipped),
+            "seconds": round(time.perf_counter() - started, 3),
+        })
 
-    # 성공 메시지와 파일 이름 반환
-    return {"message": "Exported and processed by AI", "file": file_name}
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
@@ -1,100 +1,211 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from core.database import get_db
-from core.models import ChatRoom, Message
+from sqlalchemy import and_, or_, select
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import AsyncSessionLocal, get_db, get_read_db
+from core.models import ChatRoom, Message, SUMMARY_MESSAGE
+from core.context_builder import build_message_history, encode_payload
+from core.history_cache import history_cache
+from core.jobs import job_queue
+from core.room_events import room_events, sse_event
+from core.room_list_cache import etag_matches, room_list_cache
+from core.single_flight import Flight, IdempotencyConflictError, RoomBusyError, message_flights
+from core.config import settings
+from core.ai_client import ai_client, iter_stream_chunks
+from core.github_client import GitHubError, github_client
+from core.github_push import ensure_repo, push_files
+from core.project_scanner import resolve_data_path, scan_project
 from pydantic import BaseModel
-from dotenv import load_dotenv
 import asyncio
 import json
+import logging
 import aiohttp
-import os
 from datetime import datetime
-import requests
-import base64
 
-# .env 파일에서 환경 변수 로드
-load_dotenv()
+router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# 환경 변수에서 AI_LANGCHAIN_URL 가져오기
-AI_LANGCHAIN_URL = os.getenv("AI_LANGCHAIN_URL", "http://localhost:8001")  # 기본값 설정
-GENERATE_CODE_URL = f"{AI_LANGCHAIN_URL}/generate-code/"  # 최종 URL 구성
+class MessageCreate(BaseModel):
+    content: str
 
-# 환경 변수에서 URL과 토큰 가져오기
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
-# GitHub API 기본 URL
-GITHUB_API_URL = "https://api.github.com"
+def message_to_dict(msg: Message) -> dict:
+    """메시지 목록 API와 방 이벤트에서 공통으로 쓰는 메시지 표현"""
+    return {"message_id": msg.id, "content": msg.content, "sender": "system" if bool(msg.is_system) else "user", "is_system": bool(msg.is_system), "created_at": msg.created_at.isoformat()}
 
-router = APIRouter()
 
-class MessageCreate(BaseModel):
-    content: str
+def publish_message(msg: Message):
+    """저장된 메시지를 방 구독자에게 전달"""
+    room_events.publish(msg.chat_room_id, "message", message_to_dict(msg))
 
 @router.post("/rooms")
-def create_chat_room(repo_url: str = None, db: Session = Depends(get_db)):
+async def create_chat_room(repo_url: str = None, db: AsyncSession = Depends(get_db)):
     chat_room = ChatRoom(repo_url=repo_url)
     db.add(chat_room)
-    db.commit()
-    db.refresh(chat_room)
+    await db.commit()
+    await db.refresh(chat_room)
+    room_list_cache.invalidate()
     return {"room_id": chat_room.id}
 
 @router.get("/rooms")
-def get_chat_rooms(db: Session = Depends(get_db)):
-    chat_rooms = db.query(ChatRoom).all()
-    rooms_list = [
-        {"room_id": room.id, "name": room.name, "repo_url": room.repo_url, "created_at": room.created_at.isoformat()}
-        for room in chat_rooms
-    ]
-    return rooms_list
+async def get_chat_rooms(
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=settings.ROOM_PAGE_MAX_LIMIT),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """방 목록을 ID 순으로 반환. 직렬화된 목록을 캐시하고 ETag로 변경 여부를 알려준다.
+
+    Args:
+        offset (int): 건너뛸 방 개수
+        limit (int, optional): 반환할 최대 방 개수, 미지정 시 전체
+        if_none_match (str, optional): 이전 응답의 ETag. 내용이 같으면 본문 없이 304 반환
+        db (AsyncSession): DB 세션 (캐시가 유효하면 쿼리하지 않음)
+
+    Returns:
+        Response: 방 목록 JSON 배열. X-Total-Count 헤더에 전체 방 개수를 담는다.
+    """
+    page = await room_list_cache.page(db, offset, limit)
+    headers = {"ETag": page.etag, "X-Total-Count": str(page.total), "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, page.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=page.body, media_type="application/json", headers=headers)
 
 @router.delete("/rooms/{room_id}")
-def delete_chat_room(room_id: int, db: Session = Depends(get_db)):
-    room = db.query(ChatRoom).filter(ChatRoom.id == room_id).first()
+async def delete_chat_room(room_id: int, db: AsyncSession = Depends(get_db)):
+    room = await db.get(ChatRoom, room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Chat room not found")
-    db.delete(room)
-    db.commit()
+    await db.delete(room)
+    await db.commit()
+    history_cache.invalidate(room_id)
+    room_list_cache.invalidate()
+    room_events.close(room_id)
     return {"message": "Room deleted"}
 
-# 4. 스트리밍 응답 처리
-@router.post("/rooms/{room_id}/messages")
-async def send_message(room_id: int, message: MessageCreate, db: Session = Depends(get_db)):
-    """대화 방의 정보와 기존 대화 내역을 generate-code에 전달하고, 결과를 처리 후 스트리밍 반환.
-
-    Args:
-        room_id (int): 대화 방 ID
-        message (MessageCreate): 전송할 메시지 데이터
-        db (Session): DB 세션
+async def run_github_pipeline(room_id: int, project_folder_list: list):
+    """생성된 프로젝트 파일로 GitHub 리포지토리를 만들고 커밋 진행 상황을 반환.
 
-    Returns:
-        StreamingResponse: 처리 결과에 따른 스트리밍 응답
+    Raises:
+        GitHubError: 사용자 조회, 리포지토리 생성 또는 파일 푸시 실패 시
+        UnsafePathError: project_folder_list에 데이터 디렉토리 밖의 경로가 있을 때
     """
-    if not GITHUB_TOKEN:
-        raise HTTPException(status_code=500, detail="GITHUB_TOKEN not found in .env file")
+    # 데이터 디렉토리 밖을 가리키는 경로가 있으면 아무것도 푸시하지 않고 실패 (UnsafePathError)
+    filelist = [resolve_data_path(v) for v in project_folder_list]
+    repo_name = f"auto-repo-{room_id}"
+    logger.debug("Pushing project folders for room %s: %s", room_id, filelist)
+
+    yield "Starting GitHub repository creation"
+
+    # GitHub 사용자 이름 가져오기
+    user_resp = await github_client.request("GET", "/user")
+    if user_resp.status != 200:
+        raise GitHubError(user_resp.status, f"Failed to get GitHub user info - {user_resp.text}")
+    username = user_resp.json()["login"]
+
+    # 리포지토리 생성. 같은 방에서 다시 생성한 경우 기존 리포지토리에 바뀐 파일만 푸시
+    branch, created = await ensure_repo(
+        github_client, username, repo_name,
+        description=f"Auto-generated repo for room {room_id}",
+        # bulk/sync 모드는 Git Data API를 사용하므로 초기 커밋이 있는 리포지토리가 필요
+        auto_init=settings.GITHUB_PUSH_MODE != "contents"
+    )
+    if created:
+        push_mode = None
+        yield f"Repository '{repo_name}' created successfully for user '{username}'"
+    else:
+        push_mode = "sync"
+        yield f"Repository '{repo_name}' already exists, pushing only changed files"
+
+    # 파일 커밋 시작
+    yield "Starting file commit process"
+    # 프로젝트 디렉토리 기준 상대 경로로 디렉토리 구조를 유지해 푸시
+    manifest = await scan_project(paths=filelist)
+    for file_path in manifest.missing:
+        yield f"Error: File '{file_path}' does not exist"
+    yield f"Found {len(manifest.entries)} files under '{manifest.root}'"
+
+    async for progress in push_files(
+        github_client, username, repo_name, manifest.files,
+        mode=push_mode, branch=branch, shas=manifest.shas
+    ):
+        yield progress
+
+    yield "File commit process completed"
+
+
+@job_queue.handler("github_pipeline")
+async def github_pipeline_job(payload: dict):
+    """백그라운드 작업: 대화 방의 생성 결과를 GitHub 리포지토리로 푸시.
+
+    진행 상황은 작업 이벤트와 함께 방 구독자에게도 pipeline 이벤트로 전달한다.
+    """
+    room_id = payload["room_id"]
+    try:
+        async for line in run_github_pipeline(room_id, payload["project_folder_list"]):
+            room_events.publish(room_id, "pipeline", {"status": "running", "message": line})
+            yield line
+    except Exception as e:
+        room_events.publish(room_id, "pipeline", {"status": "failed", "message": str(e)})
+        raise
+    room_events.publish(room_id, "pipeline", {"status": "completed"})
+
+
+async def enqueue_github_pipeline(room_id: int, project_folder_list: list) -> int:
+    """GitHub 처리를 백그라운드 작업으로 등록. 클라이언트 연결이 끊겨도 작업은 계속된다."""
+    job_id = await job_queue.enqueue(
+        "github_pipeline",
+        {"room_id": room_id, "project_folder_list": project_folder_list},
+        room_id=room_id
+    )
+    room_events.publish(room_id, "pipeline", {"status": "queued", "job_id": job_id})
+    return job_id
+
+
+# generate-code 응답의 최종 결과 키
+RESULT_KEYS = ("Sub_question", "project_folder_list")
+
+
+def parse_final_result(text: str):
+    """AI 서버가 보낸 조각이 최종 결과 JSON이면 dict를, 아니면 None을 반환"""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if isinstance(data, dict) and any(key in data for key in RESULT_KEYS):
+        return data
+    return None
 
-    # 1. 대화 방 정보 가져오기
-    room = db.query(ChatRoom).filter(ChatRoom.id == room_id).first()
-    if not room:
-        raise HTTPException(status_code=404, detail=f"Room {room_id} not found")
 
-    # 2. 해당 대화 방의 기존 메시지 내역 가져오기
-    messages = db.query(Message).filter(Message.chat_room_id == room_id).order_by(Message.created_at.asc()).all()
-    message_history = [{"content": msg.content, "sender": "system" if bool(msg.is_system) else "user", "created_at": msg.created_at.isoformat()} for msg in messages]
+async def save_system_message(db: AsyncSession, room_id: int, content: str) -> Message:
+    """AI 답변을 시스템 메시지로 저장하고 캐시/구독자에 반영"""
+    system_message = Message(chat_room_id=room_id, content=content, is_system=1, created_at=datetime.utcnow())
+    db.add(system_message)
+    await db.commit()
+    history_cache.append(room_id, system_message)
+    publish_message(system_message)
+    return system_message
+
+
+async def prepare_generate_code(db: AsyncSession, room: ChatRoom, content: str) -> dict:
+    """최근 대화 내역을 구성하고 사용자 메시지를 저장한 뒤 generate-code 요청 본문을 반환"""
+    # 해당 대화 방의 최근 메시지 내역 가져오기 (메시지 수/글자 수 제한)
+    message_history = await build_message_history(db, room.id)
 
     user_message = Message(
         chat_room_id=room.id,
-        content=message.content,
+        content=content,
         is_system=0,
         created_at=datetime.utcnow()
     )
 
     db.add(user_message)
-    db.commit()
-    db.refresh(user_message)
+    await db.commit()
+    history_cache.append(room.id, user_message)
+    publish_message(user_message)
 
-    # 3. POST 요청에 보낼 데이터 구성
-    payload = {
+    return {
         "room": {
             "id": room.id,
             "name": room.name,
@@ -102,120 +213,302 @@ async def send_message(room_id: int, message: MessageCreate, db: Session = Depen
         },
         "message_history": message_history,
         "new_message": {
-            "content": message.content,
+            "content": content,
             "role": "user"
         }
     }
 
-    # generate-code API 호출
-    async with aiohttp.ClientSession() as session:
-        async with session.post(GENERATE_CODE_URL, json=payload) as resp:
 
+async def stream_generate_code(room_id: int, payload: dict, flight: Flight):
+    """generate-code 출력을 받는 즉시 클라이언트로 전달하고, 스트림이 끝나면 최종 결과를 flight.result에 기록.
+
+    AI 서버가 SSE로 응답하면 각 이벤트의 data를, chunked 응답이면 수신한 청크를 token 이벤트로 전달한다.
+    최종 결과가 Sub_question이면 시스템 메시지를 저장하고, project_folder_list이면 GitHub 처리 작업을 등록한다.
+    결과 이벤트는 result_frames()가 만든다.
+
+    Args:
+        room_id (int): 대화 방 ID
+        payload (dict): generate-code 요청 본문
+        flight (Flight): 결과를 기록할 요청 처리 상태
+
+    Yields:
+        str: SSE 프레임
+    """
+    response_data = None
+    chunks = []
+    try:
+        async with ai_client.post(
+            "/generate-code/",
+            data=encode_payload({**payload, "stream": True}, "generate-code"),
+            headers={"Content-Type": "application/json", "Accept": "text/event-stream, application/json"}
+        ) as resp:
+            if resp.status != 200:
+                flight.result = ("error", f"Failed to connect to generate-code: {await resp.text()}")
+                return
+            is_sse = resp.content_type == "text/event-stream"
+            async for chunk in iter_stream_chunks(resp):
+                # SSE 응답에서 최종 결과 JSON 이벤트는 토큰으로 전달하지 않음
+                final = parse_final_result(chunk) if is_sse else None
+                if final is not None:
+                    response_data = final
+                    continue
+                chunks.append(chunk)
+                yield sse_event("token", chunk)
+    except asyncio.TimeoutError:
+        flight.result = ("error", "generate-code request timed out")
+        return
+    except aiohttp.ClientError as e:
+        flight.result = ("error", f"Failed to connect to generate-code: {e}")
+        return
+
+    # 최종 결과 결정: 별도 결과 이벤트가 없으면 조립한 본문을 JSON으로 해석하고, 일반 텍스트면 답변으로 취급
+    assembled = "".join(chunks)
+    if response_data is None:
+        try:
+            response_data = json.loads(assembled)
+        except ValueError:
+            response_data = {"Sub_question": assembled} if assembled else None
+
+    if not isinstance(response_data, dict) or len(response_data) == 0:
+        flight.result = ("error", "Invalid response format from generate-code")
+        return
+
+    key = next(iter(response_data))
+    value = response_data[key]
+
+    if key == "Sub_question":
+        # 의존성 세션은 스트리밍 전에 닫히므로 새 세션으로 저장
+        async with AsyncSessionLocal() as db:
+            await save_system_message(db, room_id, value)
+        flight.result = ("message", value)
+
+    elif key == "project_folder_list":
+        flight.result = ("job", await enqueue_github_pipeline(room_id, value))
+
+    else:
+        flight.result = ("error", f"Unknown response key: {key}")
+
+
+async def result_frames(result: tuple):
+    """메시지 처리 결과를 SSE 프레임으로 변환. GitHub 작업이면 작업 진행 상황을 끝까지 전달"""
+    kind, value = result
+    if kind == "message":
+        yield sse_event("message", {"message": value})
+    elif kind == "job":
+        async for frame in job_queue.sse_stream(value):
+            yield frame
+    else:
+        yield sse_event("error", value)
+
+
+async def stream_message(room: ChatRoom, content: str, idempotency_key: Optional[str]):
+    """스트리밍 모드 메시지 처리. 같은 요청이 처리 중이면 토큰 없이 그 결과만 전달"""
+    try:
+        async with message_flights.acquire(room.id, content, idempotency_key) as flight:
+            if flight.leader:
+                async with AsyncSessionLocal() as db:
+                    payload = await prepare_generate_code(db, room, content)
+                async for frame in stream_generate_code(room.id, payload, flight):
+                    yield frame
+    except (RoomBusyError, IdempotencyConflictError) as e:
+        yield sse_event("error", str(e))
+        return
+    except HTTPException as e:
+        # 같은 내용을 비스트리밍으로 처리하던 요청이 실패한 경우
+        yield sse_event("error", e.detail)
+        return
+
+    async for frame in result_frames(flight.result):
+        yield frame
+
+
+async def request_generate_code(db: AsyncSession, room: ChatRoom, content: str) -> tuple:
+    """비스트리밍 모드 메시지 처리: generate-code 응답 전체를 받아 결과로 분기"""
+    payload = await prepare_generate_code(db, room, content)
+
+    # generate-code API 호출 (공유 AI 클라이언트의 커넥션 풀 재사용)
+    try:
+        async with ai_client.post(
+            "/generate-code/",
+            data=encode_payload(payload, "generate-code"),
+            headers={"Content-Type": "application/json"}
+        ) as resp:
             if resp.status != 200:
                 error_detail = await resp.text()
                 raise HTTPException(status_code=resp.status, detail=f"Failed to connect to generate-code: {error_detail}")
 
             # JSON 응답 처리
             response_data = await resp.json()
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="generate-code request timed out")
+    except aiohttp.ClientError as e:
+        raise HTTPException(status_code=502, detail=f"Failed to connect to generate-code: {e}")
+
+    if not isinstance(response_data, dict) or len(response_data) == 0:
+        raise HTTPException(status_code=500, detail="Invalid response format from generate-code")
 
-            if not isinstance(response_data, dict) or len(response_data) == 0:
-                raise HTTPException(status_code=500, detail="Invalid response format from generate-code")
-
-            key = next(iter(response_data))
-            value = response_data[key]
-
-
-            print(response_data)
-            # moreinfo 경우: 바로 반환
-            if key == "Sub_question":
-                user_message = Message(
-                    chat_room_id=room.id,
-                    content=value,
-                    is_system=1,
-                    created_at=datetime.utcnow()
-                )
-                db.add(user_message)
-                db.commit()
-                db.refresh(user_message)
-                return {"message": value}
-
-            # makecode 경우: 스트리밍으로 GitHub 처리
-            elif key == "project_folder_list":
-                filelist = [v.replace("/root/docker","/app/data") for v in value]
-                repo_name = f"auto-repo-{room_id}"
-                # print("파일제작")
-                # print("filelist")
-                print(filelist)
-                # print("repo_name")
-                # print(repo_name)
-
-                async def stream_github_process():
-                    yield "data: Starting GitHub repository creation\n\n"
-
-                    # GitHub 사용자 이름 가져오기
-                    headers = {
-                        "Authorization": f"token {GITHUB_TOKEN}",
-                        "Accept": "application/vnd.github.v3+json"
-                    }
-                    user_resp = requests.get(f"{GITHUB_API_URL}/user", headers=headers)
-                    if user_resp.status_code != 200:
-                        yield f"data: Error: Failed to get GitHub user info - {user_resp.text}\n\n"
-                        return
-                    username = user_resp.json()["login"]
-
-                    # 리포지토리 생성
-                    create_url = f"{GITHUB_API_URL}/user/repos"
-                    create_payload = {
-                        "name": repo_name,
-                        "private": False,
-                        "description": f"Auto-generated repo for room {room_id}"
-                    }
-                    create_resp = requests.post(create_url, json=create_payload, headers=headers)
-                    if create_resp.status_code != 201:
-                        yield f"data: Error: Failed to create repository - {create_resp.text}\n\n"
-                        return
-                    yield f"data: Repository '{repo_name}' created successfully for user '{username}'\n\n"
-
-                    # 파일 커밋 시작
-                    yield "data: Starting file commit process\n\n"
-                    for file_path in filelist:
-                        if not os.path.exists(file_path):
-                            yield f"data: Error: File '{file_path}' does not exist\n\n"
-                            continue
-
-                        with open(file_path, "rb") as f:
-                            content = f.read()
-                        encoded_content = base64.b64encode(content).decode()
-
-                        commit_url = f"{GITHUB_API_URL}/repos/{username}/{repo_name}/contents/{os.path.basename(file_path)}"
-                        commit_payload = {
-                            "message": f"Add {os.path.basename(file_path)} via API",
-                            "content": encoded_content,
-                            "branch": "main"
-                        }
-                        commit_resp = requests.put(commit_url, json=commit_payload, headers=headers)
-                        if commit_resp.status_code not in (200, 201):
-                            yield f"data: Error committing '{file_path}': {commit_resp.text}\n\n"
-                            continue
-                        yield f"data: Successfully committed '{file_path}' to '{repo_name}'\n\n"
-
-                    yield "data: File commit process completed\n\n"
-
-                return StreamingResponse(stream_github_process(), media_type="text/event-stream")
-
-            else:
-                raise HTTPException(status_code=400, detail=f"Unknown response key: {key}")
+    key = next(iter(response_data))
+    value = response_data[key]
+
+    logger.debug("generate-code response for room %s: %s", room.id, response_data)
+    # moreinfo 경우: 바로 반환
+    if key == "Sub_question":
+        await save_system_message(db, room.id, value)
+        return ("message", value)
+
+    # makecode 경우: GitHub 처리를 백그라운드 작업으로 등록
+    elif key == "project_folder_list":
+        return ("job", await enqueue_github_pipeline(room.id, value))
+
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown response key: {key}")
+
+
+# 4. 스트리밍 응답 처리
+@router.post("/rooms/{room_id}/messages")
+async def send_message(
+    room_id: int,
+    message: MessageCreate,
+    response: Response,
+    stream: bool = False,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: AsyncSession = Depends(get_db),
+):
+    """사용자 메시지를 저장하고 generate-code 결과에 따라 답변 또는 GitHub 처리 진행 상황을 반환.
+
+    같은 방에 같은 내용(또는 같은 Idempotency-Key)의 요청이 처리 중이면 generate-code를 다시 호출하지 않고
+    그 결과를 함께 받는다(X-Deduplicated 헤더). Idempotency-Key 요청의 결과는 IDEMPOTENCY_KEY_TTL 동안
+    보관되어 재시도에도 같은 결과를 돌려준다. 방마다 메시지는 하나씩 순서대로 처리하며, 기다리는 요청이
+    MESSAGE_ROOM_MAX_PENDING개를 넘으면 429를 반환한다.
+
+    Args:
+        room_id (int): 대화 방 ID
+        message (MessageCreate): 전송할 메시지 데이터
+        response (Response): 응답 헤더 설정용
+        stream (bool): True이면 AI 생성 결과를 토큰 단위로 바로 SSE 전달
+        idempotency_key (str, optional): 클라이언트 재시도를 식별하는 Idempotency-Key 헤더
+        db (AsyncSession): DB 세션
+
+    Returns:
+        StreamingResponse: 처리 결과에 따른 스트리밍 응답
+    """
+    if not settings.GITHUB_TOKEN:
+        raise HTTPException(status_code=500, detail="GITHUB_TOKEN not found in .env file")
+
+    # 1. 대화 방 정보 가져오기
+    room = await db.get(ChatRoom, room_id)
+    if not room:
+        raise HTTPException(status_code=404, detail=f"Room {room_id} not found")
+
+    # 스트리밍 모드: 생성 결과를 기다리지 않고 바로 응답 시작
+    if stream:
+        return StreamingResponse(stream_message(room, message.content, idempotency_key), media_type="text/event-stream")
+
+    try:
+        async with message_flights.acquire(room_id, message.content, idempotency_key) as flight:
+            if flight.leader:
+                flight.result = await request_generate_code(db, room, message.content)
+    except RoomBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    headers = {} if flight.leader else {"X-Deduplicated": "true"}
+    kind, value = flight.result
+    if kind == "message":
+        response.headers.update(headers)
+        return {"message": value}
+    if kind == "job":
+        # GitHub 처리 진행 상황을 스트리밍
+        return StreamingResponse(
+            job_queue.sse_stream(value),
+            media_type="text/event-stream",
+            headers={"X-Job-Id": str(value), **headers}
+        )
+    # 같은 내용을 스트리밍으로 처리하던 요청이 실패한 경우
+    raise HTTPException(status_code=502, detail=value)
 
 
 @router.get("/rooms/{room_id}/messages")
-def get_chat_room_messages(room_id: int, db: Session = Depends(get_db)):
-    room = db.query(ChatRoom).filter(ChatRoom.id == room_id).first()
+async def get_chat_room_messages(
+    room_id: int,
+    response: Response,
+    before_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=settings.MESSAGE_PAGE_MAX_LIMIT),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """대화 방의 메시지를 시간순으로 반환. limit 지정 시 커서(before_id) 기반 페이지네이션.
+
+    Args:
+        room_id (int): 대화 방 ID
+        before_id (int, optional): 이 메시지보다 이전 메시지만 조회 (다음 페이지 커서)
+        limit (int, optional): 조회할 최대 메시지 수, 미지정 시 before_id 이전 전체
+        db (AsyncSession): 읽기 전용 DB 세션 (복제본이 설정되어 있으면 복제본)
+
+    Returns:
+        list: 오래된 순으로 정렬된 메시지 목록. 이전 메시지가 더 있으면
+            X-Next-Before-Id 헤더에 다음 페이지 커서를 담는다.
+    """
+    room = await db.get(ChatRoom, room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Chat room not found")
-    messages = db.query(Message).filter(Message.chat_room_id == room_id).all()
-    messages_list = [
-        {"message_id": msg.id, "content": msg.content, "sender": "system" if bool(msg.is_system) else "user", "is_system": bool(msg.is_system), "created_at": msg.created_at.isoformat()}
-        for msg in messages
-    ]
+
+    # (chat_room_id, created_at, id) 인덱스를 타도록 최신순으로 조회한 뒤 뒤집어서 반환
+    query = select(Message).where(Message.chat_room_id == room_id, Message.is_system != SUMMARY_MESSAGE)
+    if before_id is not None:
+        cursor = await db.get(Message, before_id)
+        if not cursor or cursor.chat_room_id != room_id:
+            raise HTTPException(status_code=400, detail=f"Invalid before_id: {before_id}")
+        query = query.where(or_(
+            Message.created_at < cursor.created_at,
+            and_(Message.created_at == cursor.created_at, Message.id < cursor.id)
+        ))
+    query = query.order_by(Message.created_at.desc(), Message.id.desc())
+    if limit is not None:
+        query = query.limit(limit + 1)
+
+    messages = (await db.execute(query)).scalars().all()
+    if limit is not None and len(messages) > limit:
+        messages = messages[:limit]
+        response.headers["X-Next-Before-Id"] = str(messages[-1].id)
+    messages.reverse()
+
+    messages_list = [message_to_dict(msg) for msg in messages]
     # print(messages_list)
     return messages_list
+
+
+@router.get("/rooms/{room_id}/events")
+async def subscribe_room_events(
+    room_id: int,
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    db: AsyncSession = Depends(get_db),
+):
+    """대화 방의 새 메시지(message)와 GitHub 처리 진행 상황(pipeline)을 SSE로 구독.
+
+    같은 방을 보는 모든 탭/사용자가 하나의 파이프라인 진행 상황을 함께 받는다.
+    연결이 끊기면 Last-Event-ID로 최근 이벤트부터 이어서 받을 수 있고, 놓친 이벤트가 보관 범위를
+    벗어났으면 reset 이벤트를 받으므로 메시지 목록을 다시 조회하면 된다.
+
+    Args:
+        room_id (int): 대화 방 ID
+        last_event_id (int, optional): 이 번호 이후의 이벤트부터 전송 (쿼리 파라미터)
+        last_event_id_header (str, optional): EventSource 재연결 시 브라우저가 보내는 Last-Event-ID 헤더
+        db (AsyncSession): DB 세션
+
+    Returns:
+        StreamingResponse: 방 이벤트 스트림
+    """
+    room = await db.get(ChatRoom, room_id)
+    if not room:
+        raise HTTPException(status_code=404, detail="Chat room not found")
+    # 스트림이 길게 유지되므로 DB 연결을 미리 반환
+    await db.close()
+    if last_event_id is None and last_event_id_header and last_event_id_header.isdigit():
+        last_event_id = int(last_event_id_header)
+    return StreamingResponse(
+        room_events.subscribe(room_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
@@ -1,29 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-import requests
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from typing import Dict, Optional, Tuple
+import asyncio
 import base64
 import os
+import time
 from core.config import settings
+from core.github_client import GitHubError, github_client
+from core.github_push import push_contents_bulk
+from core.jobs import job_queue
+from core.templates import TemplateRegistry
 from pydantic import BaseModel
-from nacl import public
-import base64
 
 router = APIRouter()
 
 # GitHub API 기본 설정
-GITHUB_API_URL = "https://api.github.com"  # GitHub API 기본 URL
 GITHUB_USERNAME = settings.GITHUB_USERNAME  # GitHub 사용자 이름
-GITHUB_TOKEN = settings.GITHUB_TOKEN  # GitHub 토큰
-HEADERS = {
-    "Authorization": f"Bearer {GITHUB_TOKEN}",  # 인증 토큰
-    "Accept": "application/vnd.github.v3+json"  # GitHub API 버전 3
-}
 
-def push_file_to_repo(repo_name: str, file_path: str, commit_message: str, content: str = None):
+# 배포 시 레포지토리에 커밋할 템플릿: 앱 시작 시 한 번 읽고 검증 (main.py lifespan)
+cicd_templates = TemplateRegistry(
+    directory=settings.CICD_TEMPLATE_DIR or os.path.dirname(os.path.abspath(__file__)),
+    files={
+        "Dockerfile": "Dockerfile",
+        "main.yml": ".github/workflows/main.yml",
+    },
+    variables={},
+    reload=settings.CICD_TEMPLATE_RELOAD,
+)
+
+async def push_file_to_repo(repo_name: str, file_path: str, commit_message: str, content: str = None):
     """GitHub 레포지토리에 파일을 푸시하는 함수"""
     # GitHub API 엔드포인트
-    url = f"{GITHUB_API_URL}/repos/{GITHUB_USERNAME}/{repo_name}/contents/{file_path}"
+    url = f"/repos/{GITHUB_USERNAME}/{repo_name}/contents/{file_path}"
 
     # Base64로 인코딩
     encoded_content = base64.b64encode(content.encode()).decode()
@@ -35,30 +43,45 @@ def push_file_to_repo(repo_name: str, file_path: str, commit_message: str, conte
     }
 
     # 파일 푸시 요청
-    response = requests.put(url, json=data, headers=HEADERS)
+    response = await github_client.request("PUT", url, json=data)
     
-    if response.status_code in [200, 201]:
+    if response.status in [200, 201]:
         return {"message": f"File '{file_path}' uploaded successfully."}
     else:
-        error_message = response.json().get("message", "Unknown error")
-        raise HTTPException(status_code=response.status_code, detail=f"Failed to upload {file_path}: {error_message}")
+        raise HTTPException(status_code=response.status, detail=f"Failed to upload {file_path}: {response.message}")
+
+# 레포지토리별 Actions 공개 키 캐시: {(owner, repo_name): (key_id, key, 만료 시각)}
+_public_key_cache: Dict[Tuple[str, str], Tuple[str, str, float]] = {}
 
 # GitHub API에서 공개 키를 가져오는 함수
-def get_public_key(owner: str, repo_name: str):
-    """GitHub 레포지토리의 최신 공개 키를 가져오는 함수"""
-    url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/actions/secrets/public-key"
-    response = requests.get(url, headers=HEADERS)
+async def get_public_key(owner: str, repo_name: str, refresh: bool = False):
+    """GitHub 레포지토리의 공개 키를 가져오는 함수
+
+    GITHUB_PUBLIC_KEY_TTL 동안 레포지토리별로 캐시하고, refresh=True이면 캐시를 무시하고 다시 조회한다.
+    """
+    cache_key = (owner, repo_name)
+    cached = _public_key_cache.get(cache_key)
+    if cached is not None and not refresh and cached[2] > time.monotonic():
+        return cached[0], cached[1]
+
+    url = f"/repos/{owner}/{repo_name}/actions/secrets/public-key"
+    response = await github_client.request("GET", url)
         
-    if response.status_code == 200:
+    if response.status == 200:
         public_key_data = response.json()
-        return public_key_data['key_id'], public_key_data['key']
+        key_id, key = public_key_data['key_id'], public_key_data['key']
+        _public_key_cache[cache_key] = (key_id, key, time.monotonic() + settings.GITHUB_PUBLIC_KEY_TTL)
+        return key_id, key
     else:
-        raise HTTPException(status_code=response.status_code, detail="Failed to fetch public key")
+        _public_key_cache.pop(cache_key, None)
+        raise HTTPException(status_code=response.status, detail="Failed to fetch public key")
     
 # 공개 키로 시크릿 값을 암호화하는 함수
 def encrypt_secret(secret_value: str, public_key: str):
     """주어진 공개 키로 시크릿 값을 암호화하는 함수"""
-    
+    # 배포 요청에서만 필요하므로 서버 시작 시간을 줄이기 위해 처음 사용할 때 import
+    from nacl import public
+
     # 공개 키를 바이트로 디코딩
     public_key_bytes = base64.b64decode(public_key)
     
@@ -71,88 +94,140 @@ def encrypt_secret(secret_value: str, public_key: str):
     # Base64로 인코딩하여 반환
     return base64.b64encode(encrypted).decode('utf-8')
 
-def add_secret_to_repo(repo_name: str):
-    """GitHub 레포지토리에 시크릿을 추가하는 함수"""
+async def add_secret_to_repo(repo_name: str) -> dict:
+    """GitHub 레포지토리에 필수 시크릿을 등록하고 시크릿별 결과를 반환하는 함수
+
+    공개 키는 레포지토리별 캐시에서 한 번만 가져오고, 암호화와 등록 요청은
+    GITHUB_SECRET_CONCURRENCY개까지 동시에 보낸다. 일부 시크릿이 실패해도 나머지는 계속 등록하며,
+    공개 키가 바뀌어 422가 오면 키를 다시 받아 한 번 재시도한다.
+
+    Returns:
+        dict: {"repo": 레포지토리 이름, "succeeded": 등록된 시크릿 이름 목록, "failed": {시크릿 이름: 오류 메시지}}
+    """
+    owner = settings.GITHUB_USERNAME
+
+    # 필수 시크릿 값들 정의
+    secrets = {
+        "NCP_REGISTRY_USER": settings.NCP_REGISTRY_USER,
+        "NCP_REGISTRY_PASSWORD": settings.NCP_REGISTRY_PASSWORD,
+        "JARVIS_DOMAIN": settings.JARVIS_DOMAIN, 
+        "NCP_DEV_SERVER_IP": settings.NCP_DEV_SERVER_IP,
+        "NCP_DEV_SSH_PASSWORD": settings.NCP_DEV_SSH_PASSWORD,
+        "ENV_GITHUB_TOKEN": settings.GITHUB_TOKEN,
+        "ENV_GITHUB_USERNAME": settings.GITHUB_USERNAME
+    }
+    names = list(secrets)
     try:
-        # 필수 시크릿 값들 정의
-        secrets = {
-            "NCP_REGISTRY_USER": settings.NCP_REGISTRY_USER,
-            "NCP_REGISTRY_PASSWORD": settings.NCP_REGISTRY_PASSWORD,
-            "JARVIS_DOMAIN": settings.JARVIS_DOMAIN, 
-            "NCP_DEV_SERVER_IP": settings.NCP_DEV_SERVER_IP,
-            "NCP_DEV_SSH_PASSWORD": settings.NCP_DEV_SSH_PASSWORD,
-            "ENV_GITHUB_TOKEN": settings.GITHUB_TOKEN,
-            "ENV_GITHUB_USERNAME": settings.GITHUB_USERNAME
-        }
-        
-        # 각 시크릿에 대해 처리
-        for secret_name, secret_value in secrets.items():
+        current_key = await get_public_key(owner, repo_name)
+    except HTTPException as e:
+        return {"repo": repo_name, "succeeded": [], "failed": {name: f"{e.status_code}: {e.detail}" for name in names}}
+    semaphore = asyncio.Semaphore(settings.GITHUB_SECRET_CONCURRENCY)
+    refresh_lock = asyncio.Lock()
+
+    async def refresh_key(stale_key_id: str):
+        """공개 키를 다시 받음. 다른 시크릿이 이미 새 키를 받았으면 그 키를 사용"""
+        nonlocal current_key
+        async with refresh_lock:
+            if current_key[0] == stale_key_id:
+                current_key = await get_public_key(owner, repo_name, refresh=True)
+            return current_key
+
+    async def add_one(secret_name: str, secret_value: Optional[str]) -> Optional[str]:
+        """시크릿 하나를 등록하고, 실패하면 오류 메시지를 반환"""
+        if secret_value is None:
+            return "Secret value is not configured"
+        url = f"/repos/{owner}/{repo_name}/actions/secrets/{secret_name}"
+        async with semaphore:
             try:
-                # 최신 공개 키 가져오기
-                key_id, public_key = get_public_key(settings.GITHUB_USERNAME, repo_name)
-                
-                # 시크릿 값 암호화
-                encrypted_value = encrypt_secret(secret_value, public_key)
-                
-                # 시크릿을 추가하는 API 엔드포인트
-                url = f"{GITHUB_API_URL}/repos/{settings.GITHUB_USERNAME}/{repo_name}/actions/secrets/{secret_name}"
-                
-                # 시크릿 추가 요청 본문
-                payload = {
-                    "encrypted_value": encrypted_value,
-                    "key_id": key_id
-                }
-                
-                # GitHub API 요청 보내기
-                response = requests.put(url, json=payload, headers=HEADERS)
-                
-                if response.status_code not in [201, 204]:
-                    raise HTTPException(status_code=response.status_code, detail=f"Failed to add secret {secret_name}: {response.text}")
-                    
+                key_id, public_key = current_key
+                for attempt in range(2):
+                    payload = {
+                        "encrypted_value": encrypt_secret(secret_value, public_key),
+                        "key_id": key_id
+                    }
+                    response = await github_client.request("PUT", url, json=payload)
+                    if response.status in (201, 204):
+                        return None
+                    if response.status != 422 or attempt:
+                        break
+                    # 공개 키가 교체되었을 수 있으므로 새 키로 한 번 더 시도
+                    key_id, public_key = await refresh_key(key_id)
+                return f"{response.status}: {response.message}"
+            except HTTPException as e:
+                return f"{e.status_code}: {e.detail}"
             except Exception as e:
-                raise HTTPException(status_code=500, detail=f"Failed to add secret {secret_name}: {str(e)}")
-        
-        return {"message": f"Successfully added all secrets to {repo_name}"}
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to process secrets: {str(e)}")
+                return str(e)
+
+    errors = await asyncio.gather(*(add_one(name, secrets[name]) for name in names))
+    return {
+        "repo": repo_name,
+        "succeeded": [name for name, error in zip(names, errors) if error is None],
+        "failed": {name: error for name, error in zip(names, errors) if error is not None},
+    }
 
 class PublishRepoRequest(BaseModel):
     repo_name: str
 
-@router.post("/publish-repo")
-async def publish_repo(request: PublishRepoRequest):
-    """GitHub 레포지토리를 배포하는 엔드포인트"""
+async def publish_repository(repo_name: str):
+    """레포지토리에 Dockerfile, 시크릿, CI/CD 워크플로를 차례로 추가하고 진행 상황을 반환"""
+    # 레포지토리 존재 여부 확인
+    response = await github_client.request("GET", f"/repos/{settings.GITHUB_USERNAME}/{repo_name}")
+    
+    if response.status != 200:
+        raise HTTPException(status_code=404, detail="Repository not found")
+    
+    # 워크플로가 커밋되면 바로 실행되므로 시크릿을 먼저 등록
+    result = await add_secret_to_repo(repo_name)
+    total = len(result["succeeded"]) + len(result["failed"])
+    yield f"Secrets added: {len(result['succeeded'])}/{total}"
+    if result["failed"]:
+        failed = ", ".join(f"{name} ({error})" for name, error in result["failed"].items())
+        raise HTTPException(status_code=502, detail=f"Failed to add secrets: {failed}")
+
+    # 미리 읽어 둔 Dockerfile과 CI/CD 워크플로를 단일 커밋으로 푸시
+    files = cicd_templates.render_all()
     try:
-        # 레포지토리 존재 여부 확인
-        repo_url = f"https://github.com/{settings.GITHUB_USERNAME}/{request.repo_name}"
-        response = requests.get(repo_url, headers=HEADERS)
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=404, detail="Repository not found")
-        
-        # 도커 파일 푸시
-        with open(os.path.join(os.getcwd(), "api/cicd/Dockerfile"), 'r', encoding='utf-8') as file:
-            dockerfilecontent = file.read()
-
-        push_file_to_repo(
-            repo_name=request.repo_name,
-            file_path="Dockerfile",
-            content=dockerfilecontent,
-            commit_message=f"Add Dockerfile from local"
+        commit_sha = await push_contents_bulk(
+            github_client, settings.GITHUB_USERNAME, repo_name, files,
+            message="Add Dockerfile and Docker CI/CD Workflow"
         )
+    except GitHubError as e:
+        # 커밋이 없는 빈 레포지토리는 Git Data API를 쓸 수 없으므로 파일별로 커밋
+        if e.status_code not in (404, 409):
+            raise
+        for file_path, content in files.items():
+            await push_file_to_repo(
+                repo_name=repo_name,
+                file_path=file_path,
+                content=content,
+                commit_message=f"Add {file_path} from local"
+            )
+        yield "Dockerfile and CI/CD workflow pushed"
+    else:
+        yield f"Dockerfile and CI/CD workflow pushed ({commit_sha[:7]})"
 
-        add_secret_to_repo(request.repo_name)
-        
-        with open(os.path.join(os.getcwd(), "api/cicd/main.yml"), 'r', encoding='utf-8') as file:
-            cicdworkflowcontent = file.read()
-
-        push_file_to_repo(
-            repo_name=request.repo_name,
-            file_path=".github/workflows/main.yml",
-            content=cicdworkflowcontent,
-            commit_message=f"Add Docker CI/CD Workflow from local"
-        )
+    yield f"Successfully published {repo_name}"
+
+@job_queue.handler("publish_repo")
+async def publish_repo_job(payload: dict):
+    """백그라운드 작업: 레포지토리 배포"""
+    async for line in publish_repository(payload["repo_name"]):
+        yield line
+
+@router.post("/publish-repo")
+async def publish_repo(request: PublishRepoRequest, background: bool = False):
+    """GitHub 레포지토리를 배포하는 엔드포인트
+
+    background=true이면 작업 큐에 등록하고 바로 작업 ID를 반환한다.
+    진행 상황은 /jobs/{job_id}, /jobs/{job_id}/events로 확인한다.
+    """
+    if background:
+        job_id = await job_queue.enqueue("publish_repo", {"repo_name": request.repo_name})
+        return JSONResponse(status_code=202, content={"job_id": job_id, "status": "queued"})
+
+    try:
+        async for _ in publish_repository(request.repo_name):
+            pass
 
         return {
             "message": f"Successfully published {request.repo_name}"
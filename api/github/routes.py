@@ -1,18 +1,13 @@
-import base64
+import json
 import os
-from typing import List
-from fastapi import APIRouter, HTTPException
+from typing import List, Literal, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Response
 from fastapi.responses import StreamingResponse
-import requests
 from pydantic import BaseModel
-from dotenv import load_dotenv
-
-# .env 파일에서 환경 변수 로드
-load_dotenv()
-
-# GitHub API 기본 URL 및 토큰 설정
-GITHUB_API_URL = "https://api.github.com"
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")  # .env에서 GITHUB_TOKEN 가져오기
+from core.config import settings
+from core.github_client import GitHubError, github_client
+from core.github_push import ensure_repo, push_files
+from core.project_scanner import UnsafePathError, confine_path, describe_paths, scan_project, stat_many
 
 # 프로젝트 루트 디렉토리 설정
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
@@ -26,28 +21,91 @@ router = APIRouter()
 # 요청 데이터 모델 정의
 class RepoPushRequest(BaseModel):
     repo_name: str     # 생성할 리포지토리 이름
-    file_paths: List[str]  # 커밋할 파일 이름 배열 (예: ["file1.txt", "file2.py"])
+    file_paths: List[str]  # 커밋할 파일/디렉토리 상대 경로 배열 (예: ["file1.txt", "src"]), 비어 있으면 프로젝트 전체
+    push_mode: Optional[Literal["bulk", "sync", "contents"]] = None  # 푸시 방식, 미지정 시 GITHUB_PUSH_MODE 사용
 
 class FileCheckRequest(BaseModel):
     repo_name: str     # 확인할 리포지토리 이름
     file_paths: List[str]  # 확인할 파일 이름 배열
+    # 응답 형식: 미지정 시 파일마다 SSE 한 줄, "json"이면 결과 전체를 JSON 한 번으로,
+    # "sse"이면 CHECK_PROGRESS_CHUNK개마다 진행 상황 이벤트를 보낸 뒤 마지막에 결과 이벤트
+    format: Optional[Literal["json", "sse"]] = None
+    include_hash: bool = True  # json/sse 형식에서 파일 내용의 Git blob SHA 포함 여부
+
+# check-files 결과의 파일별 필드 순서 (파일마다 키를 반복하지 않도록 배열로 반환)
+CHECK_FIELDS = ["path", "exists", "size", "mtime", "sha"]
+# sse 형식에서 진행 상황 이벤트 하나에 담을 파일 수
+CHECK_PROGRESS_CHUNK = 500
+
+
+def compact_json(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def check_rows(names: List[str], entries) -> List[list]:
+    """check-files 결과를 CHECK_FIELDS 순서의 배열 목록으로 변환"""
+    return [
+        [name, True, entry.size, round(entry.mtime, 3), entry.sha] if entry is not None else [name, False, None, None, None]
+        for name, entry in zip(names, entries)
+    ]
+
+
+def check_summary(repo_name: str, rows: List[list]) -> dict:
+    found = sum(1 for row in rows if row[1])
+    return {
+        "repo_name": repo_name,
+        "total": len(rows),
+        "found": found,
+        "missing": len(rows) - found,
+        "fields": CHECK_FIELDS,
+        "files": rows,
+    }
+
+def resolve_project(repo_name: str, file_names: List[str]) -> Tuple[str, List[str]]:
+    """BASE_DIR 아래 프로젝트 디렉토리와 요청한 파일의 실제 경로를 반환.
+
+    repo_name이나 파일 경로가 ".."나 심볼릭 링크로 BASE_DIR/프로젝트 디렉토리 밖을 가리키면
+    서버의 다른 파일 정보를 돌려주거나 푸시하지 않도록 400으로 거절한다.
+    """
+    try:
+        project_dir = confine_path(BASE_DIR, repo_name)
+        if project_dir == os.path.realpath(BASE_DIR):
+            raise UnsafePathError(f"Invalid repository name '{repo_name}'")
+        file_paths = [confine_path(project_dir, file_name) for file_name in file_names]
+    except UnsafePathError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return project_dir, file_paths
 
 # 파일 존재 여부 테스트용 API
 @router.post("/check-files/")
 async def check_files(request: FileCheckRequest):
     """지정된 파일들이 로컬 디렉토리에 존재하는지 확인하는 API.
 
+    format이 "json"이면 모든 파일을 스레드 풀에서 동시에 확인해 존재 여부, 크기, 수정 시간,
+    Git blob SHA를 CHECK_FIELDS 순서의 배열로 한 번에 반환한다. "sse"이면 같은 결과를
+    CHECK_PROGRESS_CHUNK개 단위 progress 이벤트와 마지막 result 이벤트로 스트리밍한다.
+
     Args:
-        request (FileCheckRequest): 리포지토리 이름, 파일 이름 배열.
+        request (FileCheckRequest): 리포지토리 이름, 파일 이름 배열, 응답 형식.
 
     Returns:
-        StreamingResponse: 파일 존재 여부를 스트림으로 반환.
+        StreamingResponse | Response: 파일 존재 여부 스트림 또는 JSON 결과.
     """
     repo_name = request.repo_name
     file_names = request.file_paths
 
-    # 프로젝트 디렉토리 경로
-    project_dir = os.path.join(BASE_DIR, repo_name)
+    # 프로젝트 디렉토리와 파일 경로 (BASE_DIR 밖을 가리키면 400)
+    project_dir, file_paths = resolve_project(repo_name, file_names)
+
+    if request.format == "json":
+        # 모든 파일을 스레드 풀에서 동시에 확인하고 결과를 한 번에 반환
+        if not os.path.isdir(project_dir):
+            raise HTTPException(status_code=404, detail=f"Project directory '{project_dir}' does not exist")
+        entries = await describe_paths(project_dir, file_names, hash_files=request.include_hash)
+        return Response(content=compact_json(check_summary(repo_name, check_rows(file_names, entries))), media_type="application/json")
+
+    if request.format == "sse":
+        return StreamingResponse(check_files_stream(repo_name, project_dir, file_names, request.include_hash), media_type="text/event-stream")
 
     # 스트림으로 파일 존재 여부를 반환하는 제너레이터
     async def event_stream():
@@ -59,10 +117,10 @@ async def check_files(request: FileCheckRequest):
             yield "data: Check completed with errors\n\n"
             return
 
-        # 파일 존재 여부 확인
-        for file_name in file_names:
-            file_path = os.path.join(project_dir, file_name)
-            if os.path.exists(file_path):
+        # 파일 존재 여부 확인 (stat은 스레드 풀에서 한꺼번에 실행)
+        stats = await stat_many(file_paths)
+        for file_name, file_path, stat in zip(file_names, file_paths, stats):
+            if stat is not None:
                 yield f"data: File '{file_name}' exists at '{file_path}'\n\n"
             else:
                 yield f"data: File '{file_name}' does not exist at '{file_path}'\n\n"
@@ -72,6 +130,27 @@ async def check_files(request: FileCheckRequest):
     # StreamingResponse로 이벤트 스트림 반환
     return StreamingResponse(event_stream(), media_type="text/event-stream")
 
+async def check_files_stream(repo_name: str, project_dir: str, file_names: List[str], include_hash: bool):
+    """CHECK_PROGRESS_CHUNK개씩 확인하며 progress 이벤트를 보내고, 마지막에 전체 결과를 result 이벤트로 반환"""
+    if not os.path.isdir(project_dir):
+        yield f"event: error\ndata: {compact_json({'detail': f'Project directory {project_dir!r} does not exist'})}\n\n"
+        return
+
+    rows = []
+    for start in range(0, len(file_names), CHECK_PROGRESS_CHUNK):
+        names = file_names[start:start + CHECK_PROGRESS_CHUNK]
+        entries = await describe_paths(project_dir, names, hash_files=include_hash)
+        chunk = check_rows(names, entries)
+        rows += chunk
+        progress = {
+            "checked": len(rows),
+            "total": len(file_names),
+            "missing": [row[0] for row in chunk if not row[1]],
+        }
+        yield f"event: progress\ndata: {compact_json(progress)}\n\n"
+
+    yield f"event: result\ndata: {compact_json(check_summary(repo_name, rows))}\n\n"
+
 # GitHub 리포지토리 생성 및 파일 푸시 API
 @router.post("/push-to-new-repo/")
 async def push_to_new_repo(request: RepoPushRequest):
@@ -83,39 +162,39 @@ async def push_to_new_repo(request: RepoPushRequest):
     Returns:
         StreamingResponse: 각 단계의 진행 상황을 스트림으로 반환.
     """
-    if not GITHUB_TOKEN:
+    if not settings.GITHUB_TOKEN:
         raise HTTPException(status_code=500, detail="GITHUB_TOKEN not found in .env file")
 
     repo_name = request.repo_name
     file_names = request.file_paths
+    push_mode = request.push_mode or settings.GITHUB_PUSH_MODE
 
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-
-    project_dir = os.path.join(BASE_DIR, repo_name)
+    # 프로젝트 디렉토리 밖의 파일은 푸시하지 않음 (400)
+    project_dir, _ = resolve_project(repo_name, file_names)
 
     async def event_stream():
         yield "data: Starting repository creation\n\n"
 
-        user_resp = requests.get(f"{GITHUB_API_URL}/user", headers=headers)
-        if user_resp.status_code != 200:
-            raise HTTPException(status_code=user_resp.status_code, detail="Failed to get user info")
+        user_resp = await github_client.request("GET", "/user")
+        if user_resp.status != 200:
+            raise HTTPException(status_code=user_resp.status, detail="Failed to get user info")
         username = user_resp.json()["login"]
 
-        create_url = f"{GITHUB_API_URL}/user/repos"
-        create_payload = {
-            "name": repo_name,
-            "private": False,
-            "description": f"Repository created via API for {repo_name}"
-        }
-        create_resp = requests.post(create_url, json=create_payload, headers=headers)
-        if create_resp.status_code != 201:
-            error_msg = create_resp.json().get("message", "Failed to create repository")
-            raise HTTPException(status_code=create_resp.status_code, detail=error_msg)
-
-        yield f"data: Repository '{repo_name}' created successfully for user '{username}'\n\n"
+        try:
+            branch, created = await ensure_repo(
+                github_client, username, repo_name,
+                description=f"Repository created via API for {repo_name}",
+                # bulk/sync 모드는 Git Data API를 사용하므로 초기 커밋이 있는 리포지토리가 필요
+                auto_init=push_mode != "contents"
+            )
+        except GitHubError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+
+        if created:
+            yield f"data: Repository '{repo_name}' created successfully for user '{username}'\n\n"
+        else:
+            # 이미 있는 리포지토리에는 바뀐 파일만 푸시
+            yield f"data: Repository '{repo_name}' already exists, pushing only changed files\n\n"
 
         yield "data: Starting file commit process\n\n"
 
@@ -124,30 +203,22 @@ async def push_to_new_repo(request: RepoPushRequest):
             yield "data: Process completed with errors\n\n"
             return
 
-        for file_name in file_names:
-            file_path = os.path.join(project_dir, file_name)
-            if not os.path.exists(file_path):
-                yield f"data: Error: File '{file_path}' does not exist\n\n"
-                continue
-
-            with open(file_path, "rb") as f:
-                content = f.read()
-            encoded_content = base64.b64encode(content).decode()
-
-            commit_url = f"{GITHUB_API_URL}/repos/{username}/{repo_name}/contents/{file_name}"
-            commit_payload = {
-                "message": f"Add {file_name} via API",
-                "content": encoded_content,
-                "branch": "main"
-            }
-            commit_resp = requests.put(commit_url, json=commit_payload, headers=headers)
-
-            if commit_resp.status_code not in (200, 201):
-                error_msg = commit_resp.json().get("message", "Failed to commit file")
-                yield f"data: Error committing '{file_name}': {error_msg}\n\n"
-                continue
-
-            yield f"data: Successfully committed '{file_name}' to '{repo_name}'\n\n"
+        # 디렉토리 구조를 유지한 파일 목록 (file_paths가 비어 있으면 프로젝트 디렉토리 전체)
+        manifest = await scan_project(project_dir, paths=file_names or None)
+        for file_name in manifest.missing:
+            yield f"data: Error: File '{os.path.join(project_dir, file_name)}' does not exist\n\n"
+
+        try:
+            mode = push_mode if created else "sync"
+            async for progress in push_files(
+                github_client, username, repo_name, manifest.files,
+                mode=mode, branch=branch, shas=manifest.shas
+            ):
+                yield f"data: {progress}\n\n"
+        except GitHubError as e:
+            yield f"data: Error: {e}\n\n"
+            yield "data: Process completed with errors\n\n"
+            return
 
         yield "data: Process completed\n\n"
 
@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import Dict, List, Optional, Type
+from core.jobs import job_queue, job_to_dict
+from core.project_scanner import UnsafePathError, resolve_data_path
+
+# API 라우터 객체 생성: '/jobs' 경로 하위에 엔드포인트 정의
+router = APIRouter()
+
+class JobCreate(BaseModel):
+    kind: str                      # 작업 종류 (예: "publish_repo", "github_pipeline")
+    payload: dict = {}             # 작업 입력 (작업 종류별 스키마로 검증)
+    room_id: Optional[int] = None  # 관련 대화 방 ID, 선택적
+
+class GithubPipelinePayload(BaseModel):
+    room_id: int
+    project_folder_list: List[str] = Field(min_length=1)  # PROJECT_HOST_DIR 또는 PROJECT_DATA_DIR 아래 경로만 허용
+
+class PublishRepoPayload(BaseModel):
+    repo_name: str = Field(pattern=r"^[A-Za-z0-9._-]{1,100}$")
+
+# HTTP로 등록할 수 있는 작업 종류와 payload 스키마 (나머지 종류는 서버 내부에서만 등록)
+HTTP_JOB_KINDS: Dict[str, Type[BaseModel]] = {
+    "github_pipeline": GithubPipelinePayload,
+    "publish_repo": PublishRepoPayload,
+}
+
+def validate_payload(kind: str, payload: dict) -> dict:
+    """작업 종류별 스키마로 payload를 검증하고, 파일 경로는 데이터 디렉토리 안인지 확인"""
+    try:
+        validated = HTTP_JOB_KINDS[kind].model_validate(payload)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+    if isinstance(validated, GithubPipelinePayload):
+        try:
+            for path in validated.project_folder_list:
+                resolve_data_path(path)
+        except UnsafePathError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    return validated.model_dump()
+
+# 작업 등록 엔드포인트
+@router.post("", status_code=202)
+async def create_job(request: JobCreate):
+    """작업을 큐에 등록하고 작업 ID를 반환. HTTP_JOB_KINDS에 있는 종류만 스키마 검증 후 등록한다."""
+    if request.kind not in HTTP_JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {request.kind}. Available: {sorted(HTTP_JOB_KINDS)}")
+    payload = validate_payload(request.kind, request.payload)
+    room_id = payload["room_id"] if request.kind == "github_pipeline" else request.room_id
+    job_id = await job_queue.enqueue(request.kind, payload, room_id=room_id)
+    return {"job_id": job_id, "status": "queued"}
+
+# 작업 상태 조회 엔드포인트
+@router.get("/{job_id}")
+async def get_job(job_id: int):
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
+
+# 작업 진행 상황 스트림 엔드포인트: 연결이 끊겨도 Last-Event-ID로 이어서 받을 수 있음
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: int, last_event_id: Optional[int] = None, last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")):
+    """작업 진행 상황을 SSE로 반환. 작업이 끝나면 스트림도 종료된다.
+
+    Args:
+        job_id (int): 작업 ID
+        last_event_id (int, optional): 이 번호 이후의 이벤트부터 전송 (쿼리 파라미터)
+        last_event_id_header (str, optional): EventSource 재연결 시 브라우저가 보내는 Last-Event-ID 헤더
+
+    Returns:
+        StreamingResponse: 작업 진행 상황 스트림
+    """
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if last_event_id is None:
+        last_event_id = int(last_event_id_header) if last_event_id_header and last_event_id_header.isdigit() else 0
+    return StreamingResponse(job_queue.sse_stream(job_id, last_event_id), media_type="text/event-stream")
@@ -0,0 +1,93 @@
+import asyncio
+import json
+from collections import Counter
+
+from aiohttp import web
+
+
+class AIStub:
+    """AI(LangChain) 서버의 /generate-code/, /process를 흉내내는 로컬 서버.
+
+    Args:
+        latency (float): 모든 응답에 추가할 지연 시간(초)
+        project_files (list, optional): 지정 시 generate-code가 project_folder_list를 반환
+        stream_tokens (int): 스트리밍 요청 시 최종 결과 전에 보낼 토큰 이벤트 수
+        make_keyword (str, optional): 지정 시 메시지에 이 문자열이 있을 때만 project_folder_list를 반환
+        echo_process (bool): True면 /process가 받은 본문을 그대로 스트리밍해 돌려줌
+    """
+
+    def __init__(self, latency: float = 0.0, project_files=None, stream_tokens: int = 20, make_keyword: str = None, echo_process: bool = False):
+        self.latency = latency
+        self.project_files = project_files
+        self.stream_tokens = stream_tokens
+        self.make_keyword = make_keyword
+        self.echo_process = echo_process
+        self.counts = Counter()
+        self.app = web.Application(client_max_size=1024 ** 3)
+        self.app.router.add_post("/generate-code/", self.generate_code)
+        self.app.router.add_post("/process", self.process)
+        self._runner = None
+        self.url = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    def reset(self):
+        self.counts.clear()
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.counts.values())
+
+    async def _hit(self, name: str):
+        self.counts[name] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _result(self, body):
+        content = body["new_message"]["content"]
+        if self.project_files and (self.make_keyword is None or self.make_keyword in content):
+            return {"project_folder_list": self.project_files}
+        return {"Sub_question": f"echo: {content}"}
+
+    async def generate_code(self, request):
+        body = await request.json()
+        if "text/event-stream" not in request.headers.get("Accept", ""):
+            await self._hit("generate_code")
+            return web.json_response(self._result(body))
+
+        # 스트리밍: 지연 시간을 토큰에 나눠 보내고 마지막에 결과 JSON 이벤트 전송
+        self.counts["generate_code_stream"] += 1
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        for i in range(self.stream_tokens):
+            await asyncio.sleep(self.latency / max(self.stream_tokens, 1))
+            await resp.write(f"data: token-{i} \n\n".encode())
+        await resp.write(f"data: {json.dumps(self._result(body))}\n\n".encode())
+        await resp.write_eof()
+        return resp
+
+    async def process(self, request):
+        await self._hit("process")
+        if self.echo_process:
+            # 받은 본문을 그대로 chunked 응답으로 돌려줌 (대용량 응답 스트리밍 확인용)
+            resp = web.StreamResponse(headers={"Content-Type": request.content_type})
+            await resp.prepare(request)
+            async for chunk in request.content.iter_any():
+                await resp.write(chunk)
+            await resp.write_eof()
+            return resp
+        processed = 0
+        async for chunk in request.content.iter_any():
+            processed += len(chunk)
+        return web.json_response({"processed_bytes": processed})
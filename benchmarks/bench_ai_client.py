@@ -0,0 +1,81 @@
+"""요청마다 새 세션을 여는 방식과 공유 AIClient 방식의 /generate-code/ 지연 시간 비교.
+
+실행: python -m benchmarks.bench_ai_client --concurrency 200 --rounds 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import aiohttp
+
+from benchmarks.ai_stub import AIStub
+from core.ai_client import AIClient
+
+PAYLOAD = {
+    "room": {"id": 1, "name": None, "created_at": None},
+    "message_history": [],
+    "new_message": {"content": "hello", "role": "user"},
+}
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "p50_ms": round(pick(0.50) * 1000, 2),
+        "p99_ms": round(pick(0.99) * 1000, 2),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 2),
+    }
+
+
+async def per_request_session(url: str):
+    """기존 방식: 요청마다 ClientSession 생성"""
+    started = time.perf_counter()
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"{url}/generate-code/", json=PAYLOAD) as resp:
+            await resp.json()
+    return time.perf_counter() - started
+
+
+async def shared_client(client: AIClient):
+    """개선 방식: 앱 수명 주기 동안 공유하는 AIClient"""
+    started = time.perf_counter()
+    async with client.post("/generate-code/", json=PAYLOAD) as resp:
+        await resp.json()
+    return time.perf_counter() - started
+
+
+async def run(concurrency: int, rounds: int, latency: float):
+    stub = AIStub(latency=latency)
+    url = await stub.start()
+    client = AIClient(base_url=url, max_concurrency=concurrency)
+    await client.start()
+    results = {}
+    try:
+        for name, call in (
+            ("before", lambda: per_request_session(url)),
+            ("after", lambda: shared_client(client)),
+        ):
+            samples = []
+            for _ in range(rounds):
+                samples += await asyncio.gather(*(call() for _ in range(concurrency)))
+            results[name] = {"requests": len(samples), **percentiles(samples)}
+    finally:
+        await client.close()
+        await stub.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=200, help="동시 채팅 수")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="스텁 응답 지연(초)")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.concurrency, args.rounds, args.latency)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
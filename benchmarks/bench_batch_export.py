@@ -0,0 +1,82 @@
+"""방별 순차 내보내기(GET /ai/rooms/{id}/export)와 일괄 내보내기(POST /ai/exports/batch) 소요 시간 비교.
+
+AI 스텁의 /process 응답 지연을 --latency로 지정해 실제 AI 서버 처리 시간을 흉내낸다.
+
+실행: python -m benchmarks.bench_batch_export --rooms 500 --latency 0.05 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def seed(engine, Base, ChatRoom, Message, rooms: int, messages: int):
+    Base.metadata.create_all(bind=engine)
+    started = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(ChatRoom.__table__.insert(), [
+            {"id": room_id, "name": f"room {room_id}", "created_at": started + timedelta(minutes=room_id)}
+            for room_id in range(1, rooms + 1)
+        ])
+        conn.execute(Message.__table__.insert(), [
+            {"chat_room_id": room_id, "content": f"message {i}", "is_system": i % 2, "created_at": started + timedelta(seconds=i)}
+            for room_id in range(1, rooms + 1) for i in range(messages)
+        ])
+
+
+async def run(rooms: int, messages: int, latency: float, concurrency: int):
+    from benchmarks.ai_stub import AIStub
+
+    stub = AIStub(latency=latency)
+    os.environ["AI_LANGCHAIN_URL"] = await stub.start()
+
+    import httpx
+    from core.ai_client import ai_client
+    from sqlalchemy import create_engine
+    from core.database import Base
+    # 데이터 준비용 동기 엔진 (앱 모듈은 비동기 엔진만 만든다)
+    engine = create_engine(os.environ["DATABASE_URL"])
+    from core.models import ChatRoom, Message
+    from main import app
+
+    seed(engine, Base, ChatRoom, Message, rooms, messages)
+    results = {"rooms": rooms, "messages_per_room": messages, "latency": latency, "concurrency": concurrency}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+            started = time.perf_counter()
+            for room_id in range(1, rooms + 1):
+                resp = await client.get(f"/ai/rooms/{room_id}/export")
+                assert resp.status_code == 200, resp.text
+            results["sequential_seconds"] = round(time.perf_counter() - started, 3)
+
+            started = time.perf_counter()
+            resp = await client.post("/ai/exports/batch", json={"room_ids": list(range(1, rooms + 1)), "concurrency": concurrency})
+            done = json.loads(resp.text.rstrip().rsplit("data: ", 1)[1])
+            results["batch_seconds"] = round(time.perf_counter() - started, 3)
+            results["batch_summary"] = done
+        results["speedup"] = round(results["sequential_seconds"] / results["batch_seconds"], 1)
+        return results
+    finally:
+        await ai_client.close()
+        await stub.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--messages", type=int, default=20, help="방별 메시지 수")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(root, 'bench.db')}"
+        os.environ["EXPORT_DIR"] = os.path.join(root, "exports")
+        print(json.dumps(asyncio.run(run(args.rooms, args.messages, args.latency, args.concurrency)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
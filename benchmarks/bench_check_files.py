@@ -0,0 +1,66 @@
+"""check-files의 기존 방식(파일마다 SSE 한 줄)과 json/sse 배치 형식의 응답 시간과 크기 비교.
+
+실행: python -m benchmarks.bench_check_files --files 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import httpx
+
+import api.github.routes as github_routes
+from main import app
+
+
+def make_project(root: str, count: int, size: int):
+    names = []
+    for i in range(count):
+        name = f"src/mod_{i % 50}/file_{i}.py"
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+        names.append(name)
+    # 일부는 존재하지 않는 파일
+    return names + [f"missing_{i}.py" for i in range(count // 100)]
+
+
+async def run(count: int, size: int):
+    results = []
+    with tempfile.TemporaryDirectory() as base_dir:
+        github_routes.BASE_DIR = base_dir
+        names = make_project(os.path.join(base_dir, "bench"), count, size)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            cases = [
+                ("per-file sse", {}),
+                ("json", {"format": "json"}),
+                ("json without hash", {"format": "json", "include_hash": False}),
+                ("chunked sse", {"format": "sse"}),
+            ]
+            for name, options in cases:
+                started = time.perf_counter()
+                resp = await client.post("/github/check-files/", json={"repo_name": "bench", "file_paths": names, **options})
+                results.append({
+                    "format": name,
+                    "status": resp.status_code,
+                    "seconds": round(time.perf_counter() - started, 3),
+                    "response_bytes": len(resp.content),
+                    "events": resp.text.count("\n\n") if options.get("format") != "json" else 1,
+                })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=2048, help="파일 하나의 크기(바이트)")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.files, args.size)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
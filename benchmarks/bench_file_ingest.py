@@ -0,0 +1,110 @@
+"""큰 파일을 blob으로 업로드할 때 전체 읽기 방식과 메모리 매핑 스트리밍 방식의 최대 RSS 비교.
+
+업로드하는 쪽의 메모리만 측정하도록 각 방식을 별도 프로세스에서 실행하고, 스텁 서버는 부모 프로세스에서 띄운다.
+
+실행: python -m benchmarks.bench_file_ingest --size-mb 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.github_stub import GitHubStub
+
+
+def _status_mb(field: str) -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def current_rss_mb() -> float:
+    return _status_mb("VmRSS")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss는 fork한 부모의 값을 이어받으므로 exec 후 새로 시작하는 VmHWM을 사용
+    return _status_mb("VmHWM")
+
+
+async def upload(mode: str, url: str, path: str) -> dict:
+    """자식 프로세스: 한 가지 방식으로 blob 하나를 업로드하고 메모리 사용량을 반환"""
+    import base64
+    from core.file_ingest import Base64JsonBody
+    from core.github_client import GitHubClient
+
+    client = GitHubClient(token="stub-token", api_url=url)
+    await client.start()
+    baseline = current_rss_mb()
+    started = time.perf_counter()
+    try:
+        if mode == "read":
+            # 기존 방식: 파일 전체 읽기 -> Base64 인코딩 -> 문자열 변환 -> JSON 직렬화
+            with open(path, "rb") as f:
+                content = base64.b64encode(f.read()).decode()
+            blob = await client.request_json(
+                "POST", "/repos/stub-user/bench/git/blobs", (201,),
+                json={"content": content, "encoding": "base64"}
+            )
+        else:
+            body = Base64JsonBody(path, {"encoding": "base64"})
+            blob = await client.request_json(
+                "POST", "/repos/stub-user/bench/git/blobs", (201,),
+                data=body, headers=body.headers
+            )
+    finally:
+        await client.close()
+    return {
+        "mode": mode,
+        "sha": blob["sha"],
+        "seconds": round(time.perf_counter() - started, 3),
+        "baseline_rss_mb": round(baseline, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+async def run(size_mb: int):
+    stub = GitHubStub()
+    url = await stub.start()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "asset.bin")
+            with open(path, "wb") as f:
+                for _ in range(size_mb):  # 압축되지 않는 내용으로 채움
+                    f.write(os.urandom(1024 * 1024))
+            for mode in ("read", "stream"):
+                proc = await asyncio.create_subprocess_exec(
+                    sys.executable, "-m", "benchmarks.bench_file_ingest",
+                    "--worker", mode, "--url", url, "--path", path,
+                    stdout=asyncio.subprocess.PIPE,
+                )
+                out, _ = await proc.communicate()
+                result = json.loads(out)
+                result["peak_over_baseline_mb"] = round(result["peak_rss_mb"] - result["baseline_rss_mb"], 1)
+                results.append(result)
+    finally:
+        await stub.stop()
+    return {"size_mb": size_mb, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--worker", choices=("read", "stream"), help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(asyncio.run(upload(args.worker, args.url, args.path))))
+        return
+    print(json.dumps(asyncio.run(run(args.size_mb)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""contents(파일별 커밋) 방식과 bulk(Git Data API 단일 커밋) 방식의 요청 수와 소요 시간 비교.
+
+실행: python -m benchmarks.bench_github_push --latency 0.02 --sizes 10 100 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.github_stub import GitHubStub
+from core.config import settings
+from core.github_client import GitHubClient
+from core.github_push import push_files
+
+
+def make_files(root: str, count: int, binary: bool = False):
+    files = []
+    for i in range(count):
+        local_path = os.path.join(root, f"file_{i}.bin" if binary else f"file_{i}.py")
+        with open(local_path, "wb") as f:
+            # 바이너리 파일은 트리에 직접 포함할 수 없으므로 blob 업로드 경로를 측정
+            f.write(b"\xff\xfe" + os.urandom(256) if binary else f"print({i})\n".encode() * 20)
+        files.append((os.path.basename(local_path), local_path))
+    return files
+
+
+async def run(sizes, latency: float, concurrency: int, binary: bool = False):
+    stub = GitHubStub(latency=latency)
+    client = GitHubClient(token="stub-token", api_url=await stub.start())
+    settings.GITHUB_BLOB_CONCURRENCY = concurrency
+    results = []
+    try:
+        await client.start()
+        for count in sizes:
+            with tempfile.TemporaryDirectory() as root:
+                files = make_files(root, count, binary)
+                for mode in ("contents", "bulk"):
+                    stub.reset()
+                    started = time.perf_counter()
+                    async for _ in push_files(client, "stub-user", f"bench-{count}", files, mode=mode):
+                        pass
+                    results.append({
+                        "files": count,
+                        "mode": mode,
+                        "requests": stub.total_requests,
+                        "seconds": round(time.perf_counter() - started, 3),
+                    })
+    finally:
+        await client.close()
+        await stub.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--latency", type=float, default=0.02, help="스텁 응답 지연(초)")
+    parser.add_argument("--concurrency", type=int, default=settings.GITHUB_BLOB_CONCURRENCY)
+    parser.add_argument("--binary", action="store_true", help="blob 업로드가 필요한 바이너리 파일로 측정")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.sizes, args.latency, args.concurrency, args.binary)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
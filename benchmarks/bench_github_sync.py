@@ -0,0 +1,99 @@
+"""같은 리포지토리에 다시 푸시할 때 bulk(전체 재업로드)와 sync(바뀐 파일만) 방식의 요청 수와 소요 시간 비교.
+
+실행: python -m benchmarks.bench_github_sync --files 500 --changed 5 --latency 0.02
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.github_stub import GitHubStub
+from core import github_push
+from core.config import settings
+from core.github_client import GitHubClient
+from core.github_push import ensure_repo, push_files
+
+
+def make_files(root: str, count: int):
+    files = []
+    for i in range(count):
+        # 10개 중 1개는 blob 업로드가 필요한 바이너리 파일
+        binary = i % 10 == 0
+        local_path = os.path.join(root, f"pkg_{i % 20}", f"file_{i}.bin" if binary else f"file_{i}.py")
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        with open(local_path, "wb") as f:
+            f.write(b"\xff\xfe" + os.urandom(4096) if binary else f"print({i})\n".encode() * 20)
+        files.append((os.path.relpath(local_path, root), local_path))
+    return files
+
+
+async def measure(stub: GitHubStub, client: GitHubClient, case: str, files, mode: str) -> dict:
+    stub.reset()
+    started = time.perf_counter()
+    last = None
+    async for last in push_files(client, "stub-user", "bench-sync", files, mode=mode):
+        pass
+    return {
+        "case": case,
+        "mode": mode,
+        "requests": stub.total_requests,
+        "blobs_uploaded": stub.counts["create_blob"],
+        "seconds": round(time.perf_counter() - started, 3),
+        "result": last,
+    }
+
+
+async def run(count: int, changed: int, latency: float):
+    stub = GitHubStub(latency=latency)
+    client = GitHubClient(token="stub-token", api_url=await stub.start())
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        settings.GITHUB_SNAPSHOT_DIR = os.path.join(root, "snapshots")
+        try:
+            await client.start()
+            files = make_files(os.path.join(root, "project"), count)
+            await ensure_repo(client, "stub-user", "bench-sync", description="bench")
+            results.append(await measure(stub, client, "initial push", files, "bulk"))
+
+            # 아무것도 바뀌지 않은 재푸시
+            results.append(await measure(stub, client, "unchanged, full re-push", files, "bulk"))
+            results.append(await measure(stub, client, "unchanged", files, "sync"))
+
+            # 일부 파일 수정/삭제/추가
+            for _, local_path in files[2:2 + changed]:
+                with open(local_path, "ab") as f:
+                    f.write(b"# changed\n")
+            new_path = os.path.join(root, "project", "added.py")
+            with open(new_path, "w") as f:
+                f.write("print('added')\n")
+            edited = files[2:] + [("added.py", new_path)]
+            results.append(await measure(stub, client, f"{changed} changed, 2 deleted, 1 added", edited, "sync"))
+
+            # 서버 재시작 후(디스크 스냅샷 사용)와 다른 곳에서 커밋된 뒤(원격 트리를 한 번 조회)
+            github_push._snapshots.clear()
+            github_push._known_blobs.clear()
+            results.append(await measure(stub, client, "unchanged, after restart", edited, "sync"))
+            head = stub.refs["bench-sync"]
+            tree_sha = stub._store_tree(dict(stub.trees[stub.commits[head]], **{"NOTES.md": stub._blob_sha(b"notes")}))
+            stub.commits["external"] = tree_sha
+            stub.refs["bench-sync"] = "external"
+            results.append(await measure(stub, client, "unchanged, branch moved elsewhere", edited, "sync"))
+        finally:
+            await client.close()
+            await stub.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--changed", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02, help="스텁 응답 지연(초)")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.files, args.changed, args.latency)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
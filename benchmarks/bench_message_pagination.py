@@ -0,0 +1,87 @@
+"""대화 방 메시지 전체 조회와 커서 기반 페이지 조회의 지연 시간 비교 (SQLite).
+
+실행: python -m benchmarks.bench_message_pagination --messages 100000 --limit 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def seed(engine, Base, ChatRoom, Message, count: int) -> int:
+    """방 하나에 count개 메시지를 넣고 (다른 방 메시지도 섞어) 방 ID를 반환"""
+    Base.metadata.create_all(bind=engine)
+    started = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(ChatRoom.__table__.insert(), [{"id": 1, "created_at": started}, {"id": 2, "created_at": started}])
+        batch = []
+        for i in range(count):
+            for room_id in (1, 2):
+                batch.append({
+                    "chat_room_id": room_id,
+                    "content": f"message {i}",
+                    "is_system": i % 2,
+                    "created_at": started + timedelta(seconds=i),
+                })
+            if len(batch) >= 20000:
+                conn.execute(Message.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(Message.__table__.insert(), batch)
+    return 1
+
+
+async def measure(client, url: str, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        resp = await client.get(url)
+        resp.raise_for_status()
+        samples.append(time.perf_counter() - started)
+    return {"median_ms": round(statistics.median(samples) * 1000, 2), "bytes": len(resp.content)}
+
+
+async def run(count: int, limit: int, repeat: int):
+    import httpx
+    from sqlalchemy import select
+    from sqlalchemy import create_engine
+    from core.database import Base
+    # 데이터 준비용 동기 엔진 (앱 모듈은 비동기 엔진만 만든다)
+    engine = create_engine(os.environ["DATABASE_URL"])
+    from core.models import ChatRoom, Message
+    from main import app
+
+    room_id = seed(engine, Base, ChatRoom, Message, count)
+    results = {"messages": count}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        results["full_load"] = await measure(client, f"/chat/rooms/{room_id}/messages", repeat)
+        results["latest_page"] = await measure(client, f"/chat/rooms/{room_id}/messages?limit={limit}", repeat)
+        # 히스토리 중간 메시지를 커서로 이전 페이지 조회
+        with engine.connect() as conn:
+            middle_id = conn.execute(
+                select(Message.id).where(Message.chat_room_id == room_id).order_by(Message.id).offset(count // 2).limit(1)
+            ).scalar_one()
+        results["middle_page"] = await measure(
+            client, f"/chat/rooms/{room_id}/messages?limit={limit}&before_id={middle_id}", repeat
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(root, 'bench.db')}"
+        print(json.dumps(asyncio.run(run(args.messages, args.limit, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
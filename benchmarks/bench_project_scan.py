@@ -0,0 +1,89 @@
+"""10k개 파일 프로젝트 트리에서 순차 처리(os.walk + 파일별 stat/읽기/해시)와 병렬 스캐너의 소요 시간 비교.
+
+실행: python -m benchmarks.bench_project_scan --files 10000 --size 2048 [--cold]
+
+--cold는 측정마다 페이지 캐시를 비워(root 권한 필요) 디스크/볼륨 I/O 대기가 있는 상황을 측정한다.
+단일 CPU에서 캐시가 데워진 상태라면 스레드 풀의 이점이 거의 없다.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from core.project_scanner import scan_project
+
+
+def make_tree(root: str, count: int, size: int):
+    for i in range(count):
+        # 깊이 3의 디렉토리에 분산하고, 무시 대상 디렉토리도 일부 포함
+        directory = os.path.join(root, f"pkg_{i % 10}", f"mod_{i % 100}", "__pycache__" if i % 50 == 0 else "src")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"file_{i}.py"), "wb") as f:
+            f.write(os.urandom(size))
+
+
+def drop_caches() -> bool:
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+
+def sequential_scan(root: str):
+    """기존 방식: 한 파일씩 존재 확인, 전체 읽기, 해시"""
+    manifest = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+        for name in filenames:
+            path = os.path.join(directory, name)
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            sha = hashlib.sha1(f"blob {len(data)}\0".encode() + data).hexdigest()
+            manifest.append((os.path.relpath(path, root), os.path.getsize(path), sha))
+    return manifest
+
+
+async def run(count: int, size: int, repeat: int, cold: bool):
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root, count, size)
+        cases = [
+            ("sequential", lambda: asyncio.to_thread(sequential_scan, root)),
+            ("parallel", lambda: scan_project(root)),
+            ("parallel (stat only)", lambda: scan_project(root, hash_files=False)),
+        ]
+        for _ in range(repeat):
+            for name, scan in cases:
+                cache = "cold" if cold and drop_caches() else "warm"
+                started = time.perf_counter()
+                manifest = await scan()
+                files = len(manifest) if isinstance(manifest, list) else len(manifest.entries)
+                results.append({
+                    "scanner": name,
+                    "cache": cache,
+                    "files": files,
+                    "seconds": round(time.perf_counter() - started, 3),
+                })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--size", type=int, default=2048, help="파일 하나의 크기(바이트)")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--cold", action="store_true", help="측정마다 페이지 캐시 비우기")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.files, args.size, args.repeat, args.cold)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
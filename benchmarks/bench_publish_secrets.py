@@ -0,0 +1,62 @@
+"""Actions 시크릿 등록의 요청 수와 소요 시간 측정.
+
+공개 키 캐시가 비어 있을 때(첫 배포)와 채워져 있을 때(재배포), 그리고 공개 키가 교체된 뒤의
+요청 수를 스텁 서버 기준으로 비교한다.
+
+실행: python -m benchmarks.bench_publish_secrets --latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.github_stub import GitHubStub
+from core.config import settings
+from core.github_client import github_client
+
+
+async def run(latency: float, concurrency: int):
+    # 시크릿 값이 비어 있으면 등록 대상에서 실패로 처리되므로 측정용 값을 채움
+    for name in ("NCP_REGISTRY_USER", "NCP_REGISTRY_PASSWORD", "JARVIS_DOMAIN",
+                 "NCP_DEV_SERVER_IP", "NCP_DEV_SSH_PASSWORD", "GITHUB_TOKEN"):
+        setattr(settings, name, getattr(settings, name) or f"bench-{name.lower()}")
+    settings.GITHUB_USERNAME = "stub-user"
+    settings.GITHUB_SECRET_CONCURRENCY = concurrency
+
+    from api.cicd.routes import add_secret_to_repo
+
+    stub = GitHubStub(latency=latency)
+    github_client.api_url = await stub.start()
+    results = []
+    try:
+        await github_client.start()
+        for case in ("cold_key_cache", "warm_key_cache", "rotated_key"):
+            if case == "rotated_key":
+                stub.rotate_key()
+            stub.reset()
+            started = time.perf_counter()
+            result = await add_secret_to_repo("bench-repo")
+            results.append({
+                "case": case,
+                "succeeded": len(result["succeeded"]),
+                "failed": len(result["failed"]),
+                "requests": dict(stub.counts),
+                "total_requests": stub.total_requests,
+                "seconds": round(time.perf_counter() - started, 3),
+            })
+    finally:
+        await github_client.close()
+        await stub.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.05, help="스텁 응답 지연(초)")
+    parser.add_argument("--concurrency", type=int, default=settings.GITHUB_SECRET_CONCURRENCY)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.latency, args.concurrency)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
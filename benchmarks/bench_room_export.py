@@ -0,0 +1,103 @@
+"""대화 내보내기의 전체 로드 방식과 스트리밍 방식의 소요 시간/최대 메모리 비교 (SQLite, 로컬 AI 스텁).
+
+AI 스텁은 받은 본문을 그대로 돌려주므로 요청과 응답 모두 대화 크기만큼의 데이터가 오간다.
+
+실행: python -m benchmarks.bench_room_export --messages 200000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+
+def seed(engine, Base, ChatRoom, Message, count: int):
+    Base.metadata.create_all(bind=engine)
+    started = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(ChatRoom.__table__.insert(), [{"id": 1, "name": "bench", "created_at": started}])
+        for offset in range(0, count, 10000):
+            conn.execute(Message.__table__.insert(), [
+                {"chat_room_id": 1, "content": f"message {i} " + "x" * 200, "is_system": i % 2, "created_at": started + timedelta(seconds=i)}
+                for i in range(offset, min(offset + 10000, count))
+            ])
+
+
+async def export_full(room_id: int):
+    """기존 방식: 모든 메시지를 읽어 JSON 배열 하나로 보내고 응답 전체를 받아 저장"""
+    from sqlalchemy import select
+    from core.ai_client import ai_client
+    from core.database import AsyncSessionLocal
+    from core.export_store import dumps, export_store
+    from core.models import Message, SUMMARY_MESSAGE
+
+    async with AsyncSessionLocal() as db:
+        messages = (await db.execute(select(Message).where(Message.chat_room_id == room_id, Message.is_system != SUMMARY_MESSAGE))).scalars().all()
+        conversation = [{"content": m.content, "is_system": m.is_system} for m in messages]
+        async with ai_client.post("/process", json=conversation) as resp:
+            ai_response = await resp.json()
+        async with export_store.open(room_id) as writer:
+            await writer.write(dumps(ai_response))
+        return writer.info
+
+
+async def export_streaming(room_id: int):
+    from core.database import AsyncSessionLocal
+    from core.room_export import export_room
+
+    async with AsyncSessionLocal() as db:
+        return await export_room(db, room_id)
+
+
+async def measure(name: str, func, room_id: int):
+    tracemalloc.start()
+    started = time.perf_counter()
+    info = await func(room_id)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"mode": name, "seconds": round(elapsed, 3), "peak_mb": round(peak / 1024 ** 2, 1), "file_mb": round(info.size / 1024 ** 2, 1)}
+
+
+async def run(count: int):
+    from benchmarks.ai_stub import AIStub
+
+    stub = AIStub(echo_process=True)
+    os.environ["AI_LANGCHAIN_URL"] = await stub.start()
+
+    from core.ai_client import ai_client
+    from sqlalchemy import create_engine
+    from core.database import Base
+    # 데이터 준비용 동기 엔진 (앱 모듈은 비동기 엔진만 만든다)
+    engine = create_engine(os.environ["DATABASE_URL"])
+    from core.models import ChatRoom, Message
+
+    seed(engine, Base, ChatRoom, Message, count)
+    try:
+        results = {"messages": count, "runs": []}
+        results["runs"].append(await measure("full", export_full, 1))
+        results["runs"].append(await measure("streaming", export_streaming, 1))
+        return results
+    finally:
+        await ai_client.close()
+        await stub.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(root, 'bench.db')}"
+        os.environ["EXPORT_DIR"] = os.path.join(root, "exports")
+        # 두 방식의 응답(AI 스텁이 돌려주는 본문)이 같도록 JSON 배열로 전송
+        os.environ["EXPORT_REQUEST_FORMAT"] = "json"
+        print(json.dumps(asyncio.run(run(args.messages)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""방 목록 조회(GET /chat/rooms)의 캐시 미적용/캐시 적용/304 응답 지연 시간과 응답 크기 비교 (SQLite).
+
+실행: python -m benchmarks.bench_room_list --rooms 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def seed(engine, Base, ChatRoom, count: int):
+    Base.metadata.create_all(bind=engine)
+    started = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(ChatRoom.__table__.insert(), [
+            {"name": f"room {i}", "repo_url": f"https://github.com/bench/auto-repo-{i}", "created_at": started + timedelta(seconds=i)}
+            for i in range(count)
+        ])
+
+
+async def measure(client, url: str, repeat: int, headers=None):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        resp = await client.get(url, headers=headers)
+        samples.append(time.perf_counter() - started)
+    return {"status": resp.status_code, "median_ms": round(statistics.median(samples) * 1000, 2), "bytes": len(resp.content)}
+
+
+async def run(count: int, repeat: int):
+    import httpx
+    from sqlalchemy import create_engine
+    from core.database import Base
+    # 데이터 준비용 동기 엔진 (앱 모듈은 비동기 엔진만 만든다)
+    engine = create_engine(os.environ["DATABASE_URL"])
+    from core.models import ChatRoom
+    from core.room_list_cache import room_list_cache
+    from main import app
+
+    seed(engine, Base, ChatRoom, count)
+    results = {"rooms": count}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        ttl = room_list_cache.ttl
+        room_list_cache.ttl = 0
+        results["uncached"] = await measure(client, "/chat/rooms", repeat)
+        room_list_cache.ttl = ttl
+        results["cached"] = await measure(client, "/chat/rooms", repeat)
+        results["cached_page"] = await measure(client, "/chat/rooms?limit=50&offset=1000", repeat)
+        etag = (await client.get("/chat/rooms")).headers["ETag"]
+        results["not_modified"] = await measure(client, "/chat/rooms", repeat, headers={"If-None-Match": etag})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(root, 'bench.db')}"
+        print(json.dumps(asyncio.run(run(args.rooms, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""서버 시작 시간 측정: main 모듈 import 시간(python -X importtime)과 프로세스 시작부터 첫 200 응답까지의 시간.
+
+첫 200 응답 시간은 uvicorn으로 main:app을 새 SQLite DB로 여러 번 띄워 중앙값을 구하며,
+시작 시 테이블 생성(DB_CREATE_SCHEMA=true)과 생략(false)을 비교한다. 커밋 간 결과를 비교할 수 있도록
+git 리비전을 함께 출력한다.
+
+실행: python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.load_test import ROOT, git_revision
+
+# "import time: self | cumulative | name" 줄 (name 앞 공백 수가 중첩 깊이)
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def base_env(root: str, create_schema: bool) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(root, 'startup.db')}",
+        "DB_CREATE_SCHEMA": "true" if create_schema else "false",
+        "PROJECT_DATA_DIR": root,
+        "EXPORT_DIR": os.path.join(root, "exports"),
+    })
+    return env
+
+
+def import_times(root: str, top: int) -> dict:
+    """main import에 걸린 전체 시간과 main이 직접 import한 모듈 중 오래 걸린 순서 top개 (ms)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, env=base_env(root, True), capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            entries.append((len(match.group(3)), match.group(4), int(match.group(2))))
+    main_depth, _, total = next(entry for entry in entries if entry[1] == "main")
+    children = sorted((entry for entry in entries if entry[0] == main_depth + 2), key=lambda entry: -entry[2])
+    return {
+        "main_ms": round(total / 1000, 1),
+        "top_imports_ms": {name: round(cumulative / 1000, 1) for _, name, cumulative in children[:top]},
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_200(create_schema: bool, timeout: float = 30) -> float:
+    """새 DB로 서버 프로세스를 띄워 GET /가 처음 200을 돌려줄 때까지의 시간(초).
+
+    create_schema가 False이면 마이그레이션을 마친 상태처럼 테이블을 미리 만들어 둔다 (측정 시간에서 제외).
+    """
+    with tempfile.TemporaryDirectory() as root:
+        if not create_schema:
+            subprocess.run(
+                [sys.executable, "-c", "import os, core.models; from sqlalchemy import create_engine; from core.database import Base; "
+                 "Base.metadata.create_all(bind=create_engine(os.environ['DATABASE_URL']))"],
+                cwd=ROOT, env=base_env(root, False), check=True,
+            )
+        port = free_port()
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", ROOT, "--port", str(port), "--log-level", "warning"],
+            cwd=root, env=base_env(root, create_schema), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = started + timeout
+            while time.perf_counter() < deadline:
+                if server.poll() is not None:
+                    raise RuntimeError(f"Server exited with code {server.returncode}")
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as resp:
+                        if resp.status == 200:
+                            return time.perf_counter() - started
+                except (urllib.error.URLError, ConnectionError):
+                    pass
+                time.sleep(0.005)
+            raise RuntimeError("Server did not become ready")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="출력할 import 모듈 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        results = {"revision": git_revision(), "imports": import_times(root, args.top)}
+    for create_schema in (True, False):
+        samples = [time_to_first_200(create_schema) for _ in range(args.runs)]
+        results[f"first_200_create_schema_{str(create_schema).lower()}"] = {
+            "median_ms": round(statistics.median(samples) * 1000, 1),
+            "min_ms": round(min(samples) * 1000, 1),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""비동기 DB 세션(core.database) 동작 확인: aiosqlite로 스키마를 만들고 AsyncSessionLocal/get_db로
+채팅 방과 메시지를 생성·조회·수정·삭제한 뒤, 같은 데이터를 채팅 API로 읽어 결과를 검사 (SQLite).
+
+실행: python -m benchmarks.check_async_session
+"""
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+
+async def run():
+    import httpx
+    from sqlalchemy import func, select
+    from core.database import AsyncSessionLocal, async_engine, create_schema, get_db
+    from core.models import ChatRoom, Message
+    from main import app
+
+    assert async_engine.url.drivername == "sqlite+aiosqlite", async_engine.url
+    await create_schema()
+
+    # 1. AsyncSessionLocal: 생성 후 다른 세션에서 조회
+    started = datetime(2025, 1, 1)
+    async with AsyncSessionLocal() as db:
+        room = ChatRoom(name="check", repo_url="https://example.com/repo")
+        db.add(room)
+        await db.flush()
+        db.add_all([
+            Message(chat_room_id=room.id, content=f"message {i}", is_system=i % 2, created_at=started + timedelta(seconds=i))
+            for i in range(5)
+        ])
+        await db.commit()
+        room_id = room.id
+    # expire_on_commit=False이므로 세션을 닫은 뒤에도 속성을 읽을 수 있음
+    assert room.name == "check"
+
+    async with AsyncSessionLocal() as db:
+        loaded = await db.get(ChatRoom, room_id)
+        assert loaded is not None and loaded.repo_url == "https://example.com/repo"
+        count = await db.scalar(select(func.count()).select_from(Message).where(Message.chat_room_id == room_id))
+        assert count == 5, count
+
+    # 2. get_db: 의존성과 같은 방식으로 세션을 받아 수정하고, 닫힌 뒤 새 세션에서 확인
+    sessions = get_db()
+    db = await anext(sessions)
+    loaded = await db.get(ChatRoom, room_id)
+    loaded.name = "renamed"
+    await db.commit()
+    await sessions.aclose()
+
+    async with AsyncSessionLocal() as db:
+        assert (await db.get(ChatRoom, room_id)).name == "renamed"
+
+    # 3. 같은 데이터를 API(get_db/get_read_db 의존성)로 조회, 생성, 삭제
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://check") as client:
+        resp = await client.get(f"/chat/rooms/{room_id}/messages", params={"limit": 3})
+        assert resp.status_code == 200, resp.text
+        assert [m["content"] for m in resp.json()] == ["message 2", "message 3", "message 4"], resp.json()
+        before_id = resp.headers["X-Next-Before-Id"]
+        resp = await client.get(f"/chat/rooms/{room_id}/messages", params={"before_id": before_id})
+        assert [m["content"] for m in resp.json()] == ["message 0", "message 1"], resp.json()
+
+        resp = await client.post("/chat/rooms", params={"repo_url": "https://example.com/other"})
+        assert resp.status_code == 200, resp.text
+        new_id = resp.json()["room_id"]
+        rooms = (await client.get("/chat/rooms")).json()
+        assert [r["room_id"] for r in rooms] == [room_id, new_id], rooms
+
+        assert (await client.delete(f"/chat/rooms/{new_id}")).status_code == 200
+        assert (await client.delete(f"/chat/rooms/{new_id}")).status_code == 404
+
+    async with AsyncSessionLocal() as db:
+        assert await db.get(ChatRoom, new_id) is None
+        assert (await db.scalars(select(ChatRoom.id))).all() == [room_id]
+
+    await async_engine.dispose()
+    print("check_async_session: ok")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(root, 'session.db')}"
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
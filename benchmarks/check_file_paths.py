@@ -0,0 +1,53 @@
+"""POST /github/check-files/ 확인: repo_name이나 파일 경로로 BASE_DIR/프로젝트 디렉토리 밖의 파일 정보를
+읽을 수 없는지 검사. 형식(기본 SSE, json, sse)마다 400을 돌려주고, 프로젝트 안의 파일은 그대로 확인된다.
+
+실행: python -m benchmarks.check_file_paths
+"""
+import asyncio
+import os
+import tempfile
+
+
+async def run(base_dir: str):
+    import httpx
+    import api.github.routes as github_routes
+    from main import app
+
+    github_routes.BASE_DIR = base_dir
+    project = os.path.join(base_dir, "demo")
+    os.makedirs(project)
+    with open(os.path.join(project, "app.py"), "w") as f:
+        f.write("print('hello')\n")
+    # 프로젝트 안에서 밖을 가리키는 심볼릭 링크
+    os.symlink("/etc", os.path.join(project, "escape"))
+
+    escapes = [
+        ("x/" + "../" * 12, ["etc/hostname"]),
+        ("..", ["hostname"]),
+        (".", ["demo/app.py"]),
+        ("/etc", ["hostname"]),
+        ("demo", ["../../../../../../../../etc/hostname"]),
+        ("demo", ["/etc/hostname"]),
+        ("demo", ["escape/hostname"]),
+    ]
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://check") as client:
+        for options in ({}, {"format": "json"}, {"format": "sse"}):
+            for repo_name, file_paths in escapes:
+                resp = await client.post("/github/check-files/", json={"repo_name": repo_name, "file_paths": file_paths, **options})
+                assert resp.status_code == 400, (options, repo_name, file_paths, resp.status_code, resp.text)
+                assert "hostname" not in resp.text or "outside" in resp.text, resp.text
+
+        resp = await client.post("/github/check-files/", json={"repo_name": "demo", "file_paths": ["app.py", "missing.py"], "format": "json"})
+        assert resp.status_code == 200, resp.text
+        assert [row[:2] for row in resp.json()["files"]] == [["app.py", True], ["missing.py", False]], resp.json()
+    print("check_file_paths: ok")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(root, 'paths.db')}"
+        asyncio.run(run(os.path.join(root, "projects")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""POST /jobs 확인: 허용된 작업 종류와 payload만 등록되고, github_pipeline 작업이 로컬 GitHub 스텁으로
+데이터 디렉토리 안의 파일만 푸시하는지 검사 (SQLite).
+
+실행: python -m benchmarks.check_job_routes
+"""
+import asyncio
+import os
+import tempfile
+
+HOST_DIR = "/host/docker"
+
+
+def make_project(data_dir: str) -> dict:
+    files = {"README.md": "# demo\n", "src/app.py": "print('hello')\n"}
+    for path, content in files.items():
+        local = os.path.join(data_dir, "demo", path)
+        os.makedirs(os.path.dirname(local), exist_ok=True)
+        with open(local, "w") as f:
+            f.write(content)
+    return files
+
+
+async def run(data_dir: str, files: dict):
+    from benchmarks.github_stub import GitHubStub
+
+    stub = GitHubStub()
+    os.environ["GITHUB_API_URL"] = await stub.start()
+
+    import httpx
+    from core.database import create_schema
+    from core.github_client import github_client
+    from core.jobs import SUCCEEDED, job_queue
+    from main import app
+
+    await create_schema()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://check") as client:
+            async def create(kind: str, payload: dict):
+                return await client.post("/jobs", json={"kind": kind, "payload": payload})
+
+            # 허용 목록에 없는 종류, 스키마에 맞지 않는 payload는 거절
+            assert (await create("cleanup", {})).status_code == 400
+            assert (await create("github_pipeline", {"room_id": 1})).status_code == 422
+            assert (await create("publish_repo", {"repo_name": "../other"})).status_code == 422
+
+            # 데이터 디렉토리 밖의 경로(절대 경로, .. 경로, 밖을 가리키는 심볼릭 링크)는 거절
+            os.symlink("/etc", os.path.join(data_dir, "escape"))
+            for path in ("/etc/passwd", os.path.join(os.getcwd(), ".env"), f"{HOST_DIR}/../../etc", f"{HOST_DIR}/escape/hostname"):
+                resp = await create("github_pipeline", {"room_id": 1, "project_folder_list": [f"{HOST_DIR}/demo", path]})
+                assert resp.status_code == 422, (path, resp.status_code, resp.text)
+            assert stub.total_requests == 0
+
+            # 호스트 경로로 지정한 프로젝트는 푸시됨 (프로젝트 안에서 밖의 파일을 가리키는 심볼릭 링크는 제외)
+            os.symlink("/etc/hostname", os.path.join(data_dir, "demo", "leak"))
+            resp = await create("github_pipeline", {"room_id": 7, "project_folder_list": [f"{HOST_DIR}/demo"]})
+            assert resp.status_code == 202, resp.text
+            job_id = resp.json()["job_id"]
+            events = await asyncio.wait_for(client.get(f"/jobs/{job_id}/events"), 10)
+            assert "File commit process completed" in events.text, events.text
+            job = (await client.get(f"/jobs/{job_id}")).json()
+            assert job["status"] == SUCCEEDED and job["room_id"] == 7, job
+
+            tree = stub.trees[stub.commits[stub.refs["auto-repo-7"]]]
+            assert set(files) <= set(tree) and "leak" not in tree, tree
+    finally:
+        await job_queue.stop()
+        await github_client.close()
+        await stub.stop()
+    print("check_job_routes: ok")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        data_dir = os.path.join(root, "data")
+        files = make_project(data_dir)
+        os.environ.update({
+            "DATABASE_URL": f"sqlite:///{os.path.join(root, 'jobs.db')}",
+            "GITHUB_TOKEN": "check-token",
+            "GITHUB_USERNAME": "stub-user",
+            "GITHUB_BACKOFF_BASE": "0.01",
+            "PROJECT_HOST_DIR": HOST_DIR,
+            "PROJECT_DATA_DIR": data_dir,
+            # 스냅샷과 내보내기 파일을 작업 트리가 아닌 임시 디렉토리에 저장
+            "GITHUB_SNAPSHOT_DIR": os.path.join(root, "repo_snapshots"),
+            "EXPORT_DIR": os.path.join(root, "exports"),
+        })
+        asyncio.run(run(data_dir, files))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""작업 큐(core.jobs) 동작 확인: 처리 함수나 DB 작업이 실패해도 워커가 살아 있고 다음 작업이 실행되는지,
+여러 프로세스가 같은 jobs 테이블을 써도 실행 중인 작업이 다시 실행되지 않는지 검사 (SQLite).
+
+실행: python -m benchmarks.check_jobs
+"""
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+
+async def collect(queue, job_id: int, timeout: float = 5) -> list:
+    """작업 진행 이벤트를 끝까지 읽음 (스트림이 끝나지 않으면 TimeoutError)"""
+    async def read():
+        return [line async for _, line in queue.events(job_id)]
+    return await asyncio.wait_for(read(), timeout)
+
+
+async def insert_job(status: str, updated_at: datetime) -> int:
+    """다른 프로세스가 만든 작업처럼 DB에만 기록"""
+    from core.database import AsyncSessionLocal
+    from core.models import Job
+
+    async with AsyncSessionLocal() as db:
+        job = Job(kind="ok", payload='{"n": 0}', status=status, updated_at=updated_at)
+        db.add(job)
+        await db.commit()
+    return job.id
+
+
+async def run():
+    from core.database import create_schema
+    from core.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue
+
+    await create_schema()
+    # 워커가 하나뿐이어야 앞 작업 실패 후에도 같은 워커가 다음 작업을 처리하는지 확인할 수 있음
+    queue = JobQueue(concurrency=1)
+
+    @queue.handler("ok")
+    async def ok(payload):
+        yield f"done {payload['n']}"
+
+    @queue.handler("boom")
+    async def boom(payload):
+        yield "starting"
+        raise RuntimeError("handler failed")
+
+    await queue.start()
+    try:
+        # 1. 처리 함수가 예외를 던진 작업은 failed, 다음 작업은 정상 실행
+        failed_id = await queue.enqueue("boom", {})
+        assert (await collect(queue, failed_id))[-1] == "Error: handler failed"
+        assert (await queue.get(failed_id)).status == FAILED
+
+        ok_id = await queue.enqueue("ok", {"n": 1})
+        assert (await collect(queue, ok_id))[-1] == "done 1"
+        assert (await queue.get(ok_id)).status == SUCCEEDED
+
+        # 2. 작업 선점(_claim) 중 DB 오류가 나도 진행 스트림이 끝나고 워커가 살아 있음
+        claim = queue._claim
+
+        async def broken_claim(job_id):
+            queue._claim = claim
+            raise RuntimeError("database is gone")
+
+        queue._claim = broken_claim
+        broken_id = await queue.enqueue("ok", {"n": 2})
+        assert (await collect(queue, broken_id))[-1] == "Error: database is gone"
+        assert (await queue.get(broken_id)).status == FAILED
+
+        ok_id = await queue.enqueue("ok", {"n": 3})
+        assert (await collect(queue, ok_id))[-1] == "done 3"
+        assert (await queue.get(ok_id)).status == SUCCEEDED
+        assert all(not task.done() for task in queue._workers), "worker died"
+
+        # 3. 다른 프로세스가 이미 실행 중인 작업을 받으면 실행하지 않고 진행 스트림만 닫음
+        busy_id = await insert_job(RUNNING, datetime.utcnow())
+        queue._put(busy_id)
+        assert "another worker" in (await collect(queue, busy_id))[-1]
+        assert (await queue.get(busy_id)).status == RUNNING
+    finally:
+        await queue.stop()
+
+    # 4. 다시 시작할 때 임대 시간이 지난 running 작업만 다시 실행 (갱신 중인 작업은 그대로)
+    stale_id = await insert_job(RUNNING, datetime.utcnow() - timedelta(hours=1))
+    restarted = JobQueue(concurrency=1)
+    restarted.handler("ok")(ok)
+    await restarted.start()
+    try:
+        assert (await collect(restarted, stale_id))[-1] == "done 0"
+        assert (await restarted.get(stale_id)).status == SUCCEEDED
+        assert busy_id not in restarted._active and (await restarted.get(busy_id)).status == RUNNING
+
+        # 5. 종료로 중단된 작업은 queued로 돌아가고 진행 스트림도 끝남
+        started = asyncio.Event()
+
+        @restarted.handler("slow")
+        async def slow(payload):
+            started.set()
+            yield "working"
+            await asyncio.sleep(60)
+
+        slow_id = await restarted.enqueue("slow", {})
+        await asyncio.wait_for(started.wait(), 5)
+    finally:
+        await restarted.stop()
+    assert (await collect(restarted, slow_id))[-1].startswith("Interrupted")
+    assert (await restarted.get(slow_id)).status == QUEUED
+    print("check_jobs: ok")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(root, 'jobs.db')}"
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import asyncio
+import base64
+import hashlib
+from collections import Counter
+
+from aiohttp import web
+from nacl import public
+
+
+class GitHubStub:
+    """GitHub REST API를 흉내내는 로컬 서버. 엔드포인트별 요청 수를 기록한다.
+
+    Args:
+        latency (float): 모든 응답에 추가할 지연 시간(초)
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.counts = Counter()
+        self.refs = {}  # 리포지토리 이름 -> 기본 브랜치 커밋 SHA
+        self.commits = {}  # 커밋 SHA -> 트리 SHA
+        self.trees = {}  # 트리 SHA -> {경로: blob SHA}
+        self.files = {}
+        self.secrets = {}
+        self.rotate_key()
+        self.app = web.Application(client_max_size=1024 ** 3)
+        self.app.router.add_get("/user", self.get_user)
+        self.app.router.add_post("/user/repos", self.create_repo)
+        self.app.router.add_get("/repos/{owner}/{repo}", self.get_repo)
+        self.app.router.add_put("/repos/{owner}/{repo}/contents/{path:.*}", self.put_contents)
+        self.app.router.add_get("/repos/{owner}/{repo}/actions/secrets/public-key", self.get_public_key)
+        self.app.router.add_put("/repos/{owner}/{repo}/actions/secrets/{name}", self.put_secret)
+        self.app.router.add_get("/repos/{owner}/{repo}/git/ref/heads/{branch}", self.get_ref)
+        self.app.router.add_get("/repos/{owner}/{repo}/git/commits/{sha}", self.get_commit)
+        self.app.router.add_post("/repos/{owner}/{repo}/git/blobs", self.create_blob)
+        self.app.router.add_get("/repos/{owner}/{repo}/git/trees/{sha}", self.get_tree)
+        self.app.router.add_post("/repos/{owner}/{repo}/git/trees", self.create_tree)
+        self.app.router.add_post("/repos/{owner}/{repo}/git/commits", self.create_commit)
+        self.app.router.add_patch("/repos/{owner}/{repo}/git/refs/heads/{branch}", self.update_ref)
+        self._runner = None
+        self.url = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    def reset(self):
+        self.counts.clear()
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.counts.values())
+
+    async def _hit(self, name: str):
+        self.counts[name] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def rotate_key(self):
+        """Actions 공개 키 교체. 이전 key_id로 보낸 시크릿은 422로 거절된다."""
+        self._private_key = public.PrivateKey.generate()
+        self.key_id = hashlib.sha1(bytes(self._private_key.public_key)).hexdigest()[:16]
+
+    @staticmethod
+    def _sha(data) -> str:
+        return hashlib.sha1(repr(data).encode()).hexdigest()
+
+    @staticmethod
+    def _blob_sha(data: bytes) -> str:
+        return hashlib.sha1(f"blob {len(data)}\0".encode() + data).hexdigest()
+
+    def _store_tree(self, files: dict) -> str:
+        sha = self._sha(sorted(files.items()))
+        self.trees[sha] = files
+        return sha
+
+    def _init_repo(self, name: str, readme: bool = True) -> str:
+        """초기 커밋(README.md 하나)을 만들고 커밋 SHA를 반환"""
+        files = {"README.md": self._blob_sha(f"# {name}\n".encode())} if readme else {}
+        tree_sha = self._store_tree(files)
+        commit_sha = self._sha(("init", name, tree_sha))
+        self.commits[commit_sha] = tree_sha
+        self.refs[name] = commit_sha
+        return commit_sha
+
+    async def get_user(self, request):
+        await self._hit("get_user")
+        return web.json_response({"login": "stub-user"})
+
+    async def create_repo(self, request):
+        await self._hit("create_repo")
+        body = await request.json()
+        if body["name"] in self.refs:
+            return web.json_response({
+                "message": "Repository creation failed.",
+                "errors": [{"resource": "Repository", "field": "name", "message": "name already exists on this account"}]
+            }, status=422)
+        self._init_repo(body["name"])
+        return web.json_response({"name": body["name"], "default_branch": "main"}, status=201)
+
+    async def get_repo(self, request):
+        await self._hit("get_repo")
+        return web.json_response({"name": request.match_info["repo"], "default_branch": "main"})
+
+    async def put_contents(self, request):
+        await self._hit("put_contents")
+        body = await request.json()
+        self.files[request.match_info["path"]] = body["content"]
+        return web.json_response({"content": {"path": request.match_info["path"]}}, status=201)
+
+    async def get_ref(self, request):
+        await self._hit("get_ref")
+        repo = request.match_info["repo"]
+        sha = self.refs.get(repo) or self._init_repo(repo, readme=False)
+        return web.json_response({"object": {"sha": sha}})
+
+    async def get_commit(self, request):
+        await self._hit("get_commit")
+        sha = request.match_info["sha"]
+        return web.json_response({"sha": sha, "tree": {"sha": self.commits.get(sha) or self._store_tree({})}})
+
+    async def get_tree(self, request):
+        await self._hit("get_tree")
+        files = self.trees.get(request.match_info["sha"], {})
+        tree = [{"path": path, "mode": "100644", "type": "blob", "sha": sha} for path, sha in sorted(files.items())]
+        return web.json_response({"sha": request.match_info["sha"], "tree": tree, "truncated": False})
+
+    async def create_blob(self, request):
+        await self._hit("create_blob")
+        body = await request.json()
+        data = base64.b64decode(body["content"]) if body.get("encoding") == "base64" else body["content"].encode()
+        return web.json_response({"sha": self._blob_sha(data)}, status=201)
+
+    async def create_tree(self, request):
+        await self._hit("create_tree")
+        body = await request.json()
+        files = dict(self.trees.get(body.get("base_tree"), {}))
+        for entry in body["tree"]:
+            if "content" in entry:
+                files[entry["path"]] = self._blob_sha(entry["content"].encode())
+            elif entry.get("sha") is None:
+                files.pop(entry["path"], None)
+            else:
+                files[entry["path"]] = entry["sha"]
+        return web.json_response({"sha": self._store_tree(files)}, status=201)
+
+    async def create_commit(self, request):
+        await self._hit("create_commit")
+        body = await request.json()
+        sha = self._sha(body)
+        self.commits[sha] = body["tree"]
+        return web.json_response({"sha": sha}, status=201)
+
+    async def update_ref(self, request):
+        await self._hit("update_ref")
+        body = await request.json()
+        self.refs[request.match_info["repo"]] = body["sha"]
+        return web.json_response({"object": {"sha": body["sha"]}})
+
+    async def get_public_key(self, request):
+        await self._hit("get_public_key")
+        key = base64.b64encode(bytes(self._private_key.public_key)).decode()
+        return web.json_response({"key_id": self.key_id, "key": key})
+
+    async def put_secret(self, request):
+        await self._hit("put_secret")
+        body = await request.json()
+        if body["key_id"] != self.key_id:
+            return web.json_response({"message": "Bad key_id"}, status=422)
+        sealed_box = public.SealedBox(self._private_key)
+        value = sealed_box.decrypt(base64.b64decode(body["encrypted_value"])).decode()
+        self.secrets[(request.match_info["repo"], request.match_info["name"])] = value
+        return web.Response(status=201)
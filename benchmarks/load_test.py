@@ -0,0 +1,300 @@
+"""main:app 전체를 대상으로 한 부하 테스트.
+
+SQLite DB와 로컬 AI/GitHub 스텁 서버를 띄우고 uvicorn으로 main:app을 실행한 뒤,
+동시 채팅 세션, 대화 내보내기(/process), 파일 푸시(채팅 -> project_folder_list -> GitHub 작업),
+배포(/cicd/publish-repo)를 차례로 실행해 시나리오별 처리량, p50/p95/p99 지연 시간,
+요청 수와 스텁 서버가 받은 요청 수를 JSON으로 출력한다. 커밋 간 결과를 diff로 비교할 수 있다.
+
+실행: python -m benchmarks.load_test --sessions 20 --messages 5 --pushes 5 --ai-latency 0.05 --output before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import aiohttp
+
+from benchmarks.ai_stub import AIStub
+from benchmarks.github_stub import GitHubStub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# AI 스텁이 project_folder_list를 돌려줄 메시지
+MAKE_KEYWORD = "makecode"
+# AI 서버가 알려주는 호스트 경로 (앱에서는 PROJECT_DATA_DIR로 변환됨)
+HOST_DIR = "/host/docker"
+
+UPSTREAM_SAMPLE = re.compile(r'^upstream_duration_seconds_(sum|count)\{target="([^"]+)"')
+
+
+class Scenario:
+    """시나리오 하나의 요청별 지연 시간과 오류 수"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.samples = []
+        self.errors = defaultdict(int)
+        self.started = None
+        self.finished = None
+
+    async def timed(self, call):
+        """call()을 실행해 지연 시간을 기록. 실패하면 오류 종류별로 집계하고 None 반환"""
+        started = time.perf_counter()
+        try:
+            result = await call()
+        except Exception as e:
+            self.errors[str(e) if isinstance(e, RequestFailed) else type(e).__name__] += 1
+            return None
+        self.samples.append(time.perf_counter() - started)
+        return result
+
+    def summary(self) -> dict:
+        elapsed = (self.finished or 0) - (self.started or 0)
+        ordered = sorted(self.samples)
+        pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2) if ordered else None
+        return {
+            "requests": len(ordered) + sum(self.errors.values()),
+            "errors": dict(self.errors),
+            "seconds": round(elapsed, 3),
+            "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed > 0 else None,
+            "p50_ms": pick(0.50),
+            "p95_ms": pick(0.95),
+            "p99_ms": pick(0.99),
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else None,
+        }
+
+
+class RequestFailed(Exception):
+    """응답 상태 코드 또는 스트림 결과가 기대와 다름"""
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_project(data_dir: str, files: int, size: int):
+    """PROJECT_DATA_DIR 아래에 생성된 프로젝트를 흉내낸 파일을 만들고, AI 서버가 돌려줄 호스트 경로 목록을 반환"""
+    project_dir = os.path.join(data_dir, "project")
+    for i in range(files):
+        path = os.path.join(project_dir, "src" if i % 2 else "", f"module_{i}.py")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(f"# module {i}\n" + "x = 1\n" * (size // 6))
+    return [f"{HOST_DIR}/project"]
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def wait_until_ready(session: aiohttp.ClientSession, base_url: str, server: subprocess.Popen, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            async with session.get(f"{base_url}/") as resp:
+                if resp.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not become ready")
+
+
+async def read_stream(resp: aiohttp.ClientResponse) -> list:
+    """SSE 응답을 끝까지 읽어 data 줄 목록을 반환"""
+    lines = []
+    async for raw in resp.content:
+        line = raw.decode().rstrip("\n")
+        if line.startswith("data: "):
+            lines.append(line[6:])
+    return lines
+
+
+async def run_chat(session, base_url, scenario_rooms, scenario_messages, sessions, messages):
+    """방을 만들고 메시지를 차례로 보내는 사용자를 sessions명 동시에 실행"""
+
+    async def create_room():
+        async with session.post(f"{base_url}/chat/rooms") as resp:
+            if resp.status != 200:
+                raise RequestFailed(f"create_room {resp.status}")
+            return (await resp.json())["room_id"]
+
+    async def user(index: int):
+        room_id = await scenario_rooms.timed(create_room)
+        if room_id is None:
+            return None
+
+        async def send(i=0):
+            async with session.post(f"{base_url}/chat/rooms/{room_id}/messages", json={"content": f"user {index} message {i}"}) as resp:
+                if resp.status != 200:
+                    raise RequestFailed(f"send_message {resp.status}")
+                await resp.read()
+
+        for i in range(messages):
+            await scenario_messages.timed(lambda: send(i))
+        return room_id
+
+    for scenario in (scenario_rooms, scenario_messages):
+        scenario.started = time.perf_counter()
+    room_ids = await asyncio.gather(*(user(i) for i in range(sessions)))
+    for scenario in (scenario_rooms, scenario_messages):
+        scenario.finished = time.perf_counter()
+    return [room_id for room_id in room_ids if room_id is not None]
+
+
+async def run_phase(scenario: Scenario, calls):
+    scenario.started = time.perf_counter()
+    results = await asyncio.gather(*(scenario.timed(call) for call in calls))
+    scenario.finished = time.perf_counter()
+    return results
+
+
+async def run(args) -> dict:
+    with tempfile.TemporaryDirectory(prefix="load_test_") as workdir:
+        return await run_in(args, workdir)
+
+
+async def run_in(args, workdir: str) -> dict:
+    data_dir = os.path.join(workdir, "data")
+    project_paths = make_project(data_dir, args.files, args.file_size)
+
+    ai_stub = AIStub(latency=args.ai_latency, project_files=project_paths, make_keyword=MAKE_KEYWORD)
+    github_stub = GitHubStub(latency=args.github_latency)
+    ai_url = await ai_stub.start()
+    github_url = await github_stub.start()
+
+    port = args.port or free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'load_test.db')}",
+        AI_LANGCHAIN_URL=ai_url,
+        GITHUB_API_URL=github_url,
+        GITHUB_TOKEN="load-test-token",
+        GITHUB_USERNAME="stub-user",
+        GITHUB_SNAPSHOT_DIR=os.path.join(workdir, "snapshots"),
+        GITHUB_BACKOFF_BASE="0.01",
+        PROJECT_HOST_DIR=HOST_DIR,
+        PROJECT_DATA_DIR=data_dir,
+        # 배포 시 등록할 시크릿 값 (비어 있으면 등록 실패로 처리됨)
+        **{name: os.environ.get(name) or f"load-test-{name.lower()}" for name in (
+            "NCP_REGISTRY_USER", "NCP_REGISTRY_PASSWORD", "JARVIS_DOMAIN", "NCP_DEV_SERVER_IP", "NCP_DEV_SSH_PASSWORD"
+        )},
+    )
+    # 작업 디렉토리를 임시 디렉토리로 두어 .env와 내보내기 파일이 저장소에 섞이지 않게 함
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", ROOT,
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        # 앱의 print 출력은 결과 JSON과 섞이지 않도록 stderr로
+        cwd=workdir, env=env, stdout=sys.stderr,
+    )
+
+    scenarios = {name: Scenario(name) for name in ("create_room", "send_message", "export", "push", "publish")}
+    connector = aiohttp.TCPConnector(limit=0)
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=None)) as session:
+            await wait_until_ready(session, base_url, server)
+
+            # 1. 채팅: 방 생성 후 메시지 전송 (generate-code -> Sub_question)
+            room_ids = await run_chat(
+                session, base_url, scenarios["create_room"], scenarios["send_message"], args.sessions, args.messages
+            )
+
+            # 2. 대화 내보내기 (/process)
+            async def export(room_id):
+                async with session.get(f"{base_url}/ai/rooms/{room_id}/export") as resp:
+                    if resp.status != 200:
+                        raise RequestFailed(f"export {resp.status}")
+                    await resp.read()
+
+            await run_phase(scenarios["export"], [lambda r=r: export(r) for r in room_ids])
+
+            # 3. 파일 푸시: project_folder_list를 받은 메시지가 GitHub 작업을 실행하고 진행 상황을 끝까지 스트리밍
+            async def push(room_id):
+                async with session.post(f"{base_url}/chat/rooms/{room_id}/messages", json={"content": MAKE_KEYWORD}) as resp:
+                    if resp.status != 200:
+                        raise RequestFailed(f"push {resp.status}")
+                    lines = await read_stream(resp)
+                if not lines or "completed" not in lines[-1]:
+                    print(f"Push for room {room_id} failed: {lines[-1] if lines else 'empty stream'}", file=sys.stderr)
+                    raise RequestFailed("push incomplete")
+                return room_id
+
+            pushed = await run_phase(scenarios["push"], [lambda r=r: push(r) for r in room_ids[:args.pushes]])
+
+            # 4. 배포: 시크릿 등록과 Dockerfile/워크플로 커밋
+            async def publish(room_id):
+                async with session.post(f"{base_url}/cicd/publish-repo", json={"repo_name": f"auto-repo-{room_id}"}) as resp:
+                    if resp.status != 200:
+                        raise RequestFailed(f"publish {resp.status}")
+                    await resp.read()
+
+            await run_phase(scenarios["publish"], [lambda r=r: publish(r) for r in pushed if r is not None])
+
+            async with session.get(f"{base_url}/metrics") as resp:
+                metrics_text = await resp.text()
+    finally:
+        server.terminate()
+        server.wait()
+        await ai_stub.stop()
+        await github_stub.stop()
+
+    # 앱이 기록한 외부 호출 소요 시간 합계 (대상별)
+    upstream = defaultdict(lambda: {"calls": 0, "seconds": 0.0})
+    for line in metrics_text.splitlines():
+        match = UPSTREAM_SAMPLE.match(line)
+        if match:
+            key = "seconds" if match.group(1) == "sum" else "calls"
+            upstream[match.group(2)][key] += float(line.rsplit(" ", 1)[1])
+    for values in upstream.values():
+        values["calls"] = int(values["calls"])
+        values["seconds"] = round(values["seconds"], 3)
+
+    return {
+        "revision": git_revision(),
+        "config": vars(args),
+        "scenarios": {name: scenario.summary() for name, scenario in scenarios.items()},
+        "stub_requests": {
+            "ai": dict(ai_stub.counts),
+            "github": dict(github_stub.counts),
+        },
+        "upstream": dict(upstream),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20, help="동시 채팅 세션 수")
+    parser.add_argument("--messages", type=int, default=5, help="세션별 메시지 수")
+    parser.add_argument("--pushes", type=int, default=5, help="동시 파일 푸시(및 배포) 수")
+    parser.add_argument("--files", type=int, default=50, help="푸시할 프로젝트 파일 수")
+    parser.add_argument("--file-size", type=int, default=2048, help="파일 하나의 크기(바이트)")
+    parser.add_argument("--ai-latency", type=float, default=0.05, help="AI 스텁 응답 지연(초)")
+    parser.add_argument("--github-latency", type=float, default=0.01, help="GitHub 스텁 응답 지연(초)")
+    parser.add_argument("--port", type=int, default=0, help="앱 포트 (0이면 빈 포트)")
+    parser.add_argument("--output", help="결과 JSON을 저장할 파일")
+    args = parser.parse_args()
+
+    result = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(result + "\n")
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
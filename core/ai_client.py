@@ -0,0 +1,111 @@
+import asyncio
+import codecs
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aiohttp
+
+from core.config import settings
+from core.tracing import span
+
+
+class AIClient:
+    """AI(LangChain) 서버 호출용 공유 클라이언트.
+
+    앱 수명 주기 동안 하나의 세션과 커넥션 풀을 재사용하고,
+    연결/읽기 타임아웃과 동시 요청 수 상한을 적용한다.
+
+    Args:
+        base_url (str, optional): AI 서버 URL, 기본값은 settings.AI_LANGCHAIN_URL
+        max_concurrency (int, optional): 동시 요청 수 상한, 기본값은 settings.AI_MAX_CONCURRENCY
+    """
+
+    def __init__(self, base_url: Optional[str] = None, max_concurrency: Optional[int] = None):
+        self.base_url = (base_url or settings.AI_LANGCHAIN_URL or "http://localhost:8001").rstrip("/")
+        self.max_concurrency = max_concurrency or settings.AI_MAX_CONCURRENCY
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self):
+        """커넥션 풀 세션 생성 (첫 요청 시 자동 호출)"""
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=settings.AI_POOL_SIZE,
+            limit_per_host=settings.AI_POOL_PER_HOST,
+            keepalive_timeout=settings.AI_KEEPALIVE_TIMEOUT,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=settings.AI_CONNECT_TIMEOUT,
+            sock_read=settings.AI_READ_TIMEOUT,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def close(self):
+        """세션과 커넥션 풀 종료 (앱 종료 시 호출)"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @asynccontextmanager
+    async def post(self, path: str, **kwargs):
+        """동시 요청 수 상한 안에서 AI 서버에 POST 요청을 보내고 응답을 제공.
+
+        Args:
+            path (str): AI 서버 경로 (예: "/generate-code/")
+            **kwargs: aiohttp 요청 인자 (json 등)
+
+        Yields:
+            aiohttp.ClientResponse: AI 서버 응답
+        """
+        if self._session is None or self._session.closed:
+            await self.start()
+        async with self._semaphore:
+            # 응답 본문을 다 읽을 때까지의 시간 (동시 요청 수 상한 대기 시간은 제외)
+            with span("ai", path):
+                async with self._session.post(f"{self.base_url}{path}", **kwargs) as resp:
+                    yield resp
+
+
+async def iter_stream_chunks(resp: aiohttp.ClientResponse) -> AsyncIterator[str]:
+    """AI 서버 응답을 도착하는 대로 텍스트 조각으로 반환.
+
+    text/event-stream 응답이면 이벤트마다 data 필드를 합쳐 하나의 조각으로,
+    그 외(chunked JSON 등)는 수신한 청크를 그대로 디코딩해 반환한다.
+    """
+    if resp.content_type != "text/event-stream":
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        async for chunk in resp.content.iter_any():
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+        return
+
+    # 긴 data 줄도 처리할 수 있도록 readline 대신 직접 줄 단위로 분리
+    buffer = b""
+    data_lines = []
+    async for chunk in resp.content.iter_any():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for raw_line in lines:
+            line = raw_line.decode("utf-8", errors="replace").rstrip("\r")
+            if not line:
+                # 빈 줄은 이벤트의 끝
+                if data_lines:
+                    yield "\n".join(data_lines)
+                    data_lines = []
+            elif line.startswith("data:"):
+                value = line[5:]
+                data_lines.append(value[1:] if value.startswith(" ") else value)
+    if buffer.startswith(b"data:"):
+        value = buffer[5:].decode("utf-8", errors="replace").rstrip("\r")
+        data_lines.append(value[1:] if value.startswith(" ") else value)
+    if data_lines:
+        yield "\n".join(data_lines)
+
+# 앱 전체에서 공유하는 클라이언트 인스턴스 (첫 요청 시 세션 생성, main.py lifespan에서 close)
+ai_client = AIClient()
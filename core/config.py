@@ -4,21 +4,121 @@ import os
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
+# messages.content 컬럼 길이 (core/models.py Message.content). 메시지로 저장하는 값은 이 길이를 넘으면 안 된다.
+MESSAGE_CONTENT_MAX_LENGTH = 500
+
 
 class Settings:
     # SQLAlchemy가 사용할 데이터베이스 연결 URL
     # 포트 번호를 포함한 연결 문자열 생성
     DATABASE_URL = os.getenv("DATABASE_URL")
+    # 비동기 드라이버 URL (미지정 시 DATABASE_URL의 드라이버를 aiomysql/aiosqlite로 변환)
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+    # 읽기 전용 복제본 URL (지정 시 메시지 조회와 대화 내보내기 읽기를 복제본으로 보냄, 복제 지연만큼 최신 메시지가 늦게 보일 수 있음)
+    DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+
+    # 커넥션 풀 크기 설정
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))  # 유지할 기본 연결 수
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))  # 기본 연결 외 추가로 허용할 연결 수
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # 연결 대기 최대 시간(초)
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 이 시간(초)보다 오래된 연결은 다시 연결 (MySQL wait_timeout보다 짧게, -1이면 비활성화)
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # 연결을 빌릴 때 끊긴 연결인지 확인
+    DB_CREATE_SCHEMA = os.getenv("DB_CREATE_SCHEMA", "true").lower() == "true"  # 서버 시작 시 없는 테이블 생성 (마이그레이션으로 스키마를 관리하면 false)
+
+    # generate-code에 보낼 대화 내역 제한
+    HISTORY_MAX_MESSAGES = int(os.getenv("HISTORY_MAX_MESSAGES", "50"))  # 최근 메시지 최대 개수
+    HISTORY_MAX_CHARS = int(os.getenv("HISTORY_MAX_CHARS", "20000"))  # 대화 내역 총 글자 수 상한
+    HISTORY_SUMMARY_ENABLED = os.getenv("HISTORY_SUMMARY_ENABLED", "false").lower() == "true"  # 잘린 내역을 요약 메시지로 유지
+    # 요약 메시지 최대 길이: 요약도 messages.content에 저장되므로 컬럼 길이를 넘는 값은 컬럼 길이로 제한
+    HISTORY_SUMMARY_MAX_CHARS = max(1, min(int(os.getenv("HISTORY_SUMMARY_MAX_CHARS", "500")), MESSAGE_CONTENT_MAX_LENGTH))
+
+    # 대화 방별 최근 내역 캐시
+    HISTORY_CACHE_MAX_ROOMS = int(os.getenv("HISTORY_CACHE_MAX_ROOMS", "1024"))  # 캐시할 최대 방 개수 (0이면 비활성화)
+    HISTORY_CACHE_TTL = float(os.getenv("HISTORY_CACHE_TTL", "300"))  # 캐시 항목 유효 시간(초)
+
+    # 백그라운드 작업 큐
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))  # 동시에 실행할 작업 수
+    JOB_EVENT_RETENTION = float(os.getenv("JOB_EVENT_RETENTION", "3600"))  # 끝난 작업의 진행 이벤트 보관 시간(초)
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))  # running 작업이 이 시간(초) 동안 갱신되지 않으면 중단된 것으로 보고 다시 실행
+
+    # 메시지 요청 중복 제거와 방별 직렬화
+    MESSAGE_ROOM_MAX_PENDING = int(os.getenv("MESSAGE_ROOM_MAX_PENDING", "4"))  # 방별로 앞 요청을 기다릴 수 있는 메시지 수 (넘으면 429)
+    IDEMPOTENCY_KEY_TTL = float(os.getenv("IDEMPOTENCY_KEY_TTL", "600"))  # Idempotency-Key 요청 결과 보관 시간(초)
+
+    # 대화 방 이벤트 구독 (GET /chat/rooms/{room_id}/events)
+    ROOM_EVENT_BUFFER = int(os.getenv("ROOM_EVENT_BUFFER", "64"))  # Last-Event-ID 재전송을 위해 방별로 보관할 최근 이벤트 수
+    ROOM_EVENT_QUEUE_SIZE = int(os.getenv("ROOM_EVENT_QUEUE_SIZE", "256"))  # 구독자별 대기 이벤트 수 상한 (넘으면 연결 종료)
+    ROOM_EVENT_HEARTBEAT = float(os.getenv("ROOM_EVENT_HEARTBEAT", "15"))  # 이벤트가 없을 때 연결 유지 주석 전송 간격(초)
+    ROOM_EVENT_MAX_ROOMS = int(os.getenv("ROOM_EVENT_MAX_ROOMS", "1024"))  # 구독자 없는 방의 이벤트를 보관할 최대 방 개수
+
+    # AI 처리 결과(대화 내보내기) 저장
+    EXPORT_DIR = os.getenv("EXPORT_DIR", "data/exports")  # 저장 디렉토리 ({EXPORT_DIR}/{room_id}/v{번호}.json[.gz])
+    EXPORT_GZIP = os.getenv("EXPORT_GZIP", "false").lower() == "true"  # gzip 압축 저장 여부
+    EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))  # gzip 압축 수준 (1~9)
+    EXPORT_MAX_VERSIONS = int(os.getenv("EXPORT_MAX_VERSIONS", "10"))  # 방별로 남길 최근 버전 수 (0이면 모두 보관)
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))  # 내보낼 메시지를 DB에서 한 번에 읽는 개수
+    EXPORT_REQUEST_FORMAT = os.getenv("EXPORT_REQUEST_FORMAT", "json")  # /process 요청 본문 형식 (json 배열, AI 서버가 지원하면 ndjson)
+    EXPORT_BATCH_CONCURRENCY = int(os.getenv("EXPORT_BATCH_CONCURRENCY", "8"))  # 일괄 내보내기에서 동시에 처리할 방 수
+    EXPORT_BATCH_MAX_CONCURRENCY = int(os.getenv("EXPORT_BATCH_MAX_CONCURRENCY", "16"))  # 요청으로 지정할 수 있는 동시 처리 방 수 상한 (DB 풀 크기를 넘으면 풀 크기로 제한)
+
+    # 생성된 프로젝트 파일 위치와 스캔 설정
+    PROJECT_HOST_DIR = os.getenv("PROJECT_HOST_DIR", "/root/docker")  # AI 서버가 알려주는 호스트 경로
+    PROJECT_DATA_DIR = os.getenv("PROJECT_DATA_DIR", "/app/data")  # 이 컨테이너에 마운트된 같은 디렉토리
+    PROJECT_SCAN_WORKERS = int(os.getenv("PROJECT_SCAN_WORKERS", str(min(32, (os.cpu_count() or 1) + 4))))  # stat/해시 스레드 수
+    PROJECT_SCAN_IGNORE = os.getenv(
+        "PROJECT_SCAN_IGNORE", ".git,__pycache__,*.pyc,node_modules,.venv,venv,.DS_Store,.idea,.pytest_cache"
+    )  # 푸시에서 제외할 파일/디렉토리 이름 패턴 (쉼표 구분)
+
+    # 요청 지연 시간 계측
+    SLOW_REQUEST_THRESHOLD = float(os.getenv("SLOW_REQUEST_THRESHOLD", "0"))  # 이 시간(초) 이상 걸린 요청을 로그로 출력 (0이면 비활성화)
+
+    # 방 목록(GET /chat/rooms) 캐시 및 페이지네이션
+    ROOM_LIST_CACHE_TTL = float(os.getenv("ROOM_LIST_CACHE_TTL", "30"))  # 캐시 유효 시간(초), 다른 프로세스의 변경 반영 주기 (0이면 비활성화)
+    ROOM_PAGE_MAX_LIMIT = int(os.getenv("ROOM_PAGE_MAX_LIMIT", "500"))  # 한 번에 조회할 최대 방 개수
+
+    # 메시지 목록 페이지네이션 최대 크기
+    MESSAGE_PAGE_MAX_LIMIT = int(os.getenv("MESSAGE_PAGE_MAX_LIMIT", "500"))
 
     # GitHub 액세스 토큰
     GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")  # GitHub API 호출에 사용
     GITHUB_USERNAME = os.getenv("GITHUB_USERNAME")
+    GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")  # GitHub API 기본 URL
+
+    # 파일 푸시 방식: "bulk"(Git Data API로 단일 커밋), "sync"(바뀐 파일만 단일 커밋) 또는 "contents"(파일별 커밋)
+    GITHUB_PUSH_MODE = os.getenv("GITHUB_PUSH_MODE", "bulk")
+    GITHUB_BLOB_CONCURRENCY = int(os.getenv("GITHUB_BLOB_CONCURRENCY", "8"))  # 동시 blob 생성 수 제한
+    GITHUB_MAX_FILE_SIZE = int(os.getenv("GITHUB_MAX_FILE_SIZE", str(100 * 1024 * 1024)))  # 업로드할 파일 최대 크기(바이트), GitHub 제한 100MB
+    GITHUB_SNAPSHOT_DIR = os.getenv("GITHUB_SNAPSHOT_DIR", "data/repo_snapshots")  # sync 모드의 리포지토리별 트리 스냅샷 저장 위치
+
+    # 공유 GitHub 클라이언트 커넥션 풀 및 재시도 설정
+    GITHUB_POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", "20"))  # 최대 동시 연결 수
+    GITHUB_KEEPALIVE_TIMEOUT = float(os.getenv("GITHUB_KEEPALIVE_TIMEOUT", "30"))  # 유휴 연결 유지 시간(초)
+    GITHUB_TIMEOUT = float(os.getenv("GITHUB_TIMEOUT", "60"))  # 요청 전체 타임아웃(초)
+    GITHUB_MAX_RETRIES = int(os.getenv("GITHUB_MAX_RETRIES", "3"))  # 403(레이트 리밋)/5xx 재시도 횟수
+    GITHUB_BACKOFF_BASE = float(os.getenv("GITHUB_BACKOFF_BASE", "0.5"))  # 지수 백오프 기본 대기(초)
+    GITHUB_RATE_LIMIT_MAX_WAIT = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "60"))  # 레이트 리밋 리셋 최대 대기(초)
+
+    # Actions 시크릿 등록 설정
+    GITHUB_PUBLIC_KEY_TTL = float(os.getenv("GITHUB_PUBLIC_KEY_TTL", "600"))  # 레포지토리별 공개 키 캐시 유지 시간(초)
+    GITHUB_SECRET_CONCURRENCY = int(os.getenv("GITHUB_SECRET_CONCURRENCY", "4"))  # 동시 시크릿 등록 요청 수
+
+    # CI/CD 배포 템플릿 (Dockerfile, 워크플로)
+    CICD_TEMPLATE_DIR = os.getenv("CICD_TEMPLATE_DIR")  # 템플릿 디렉토리 (미지정 시 api/cicd)
+    CICD_TEMPLATE_RELOAD = os.getenv("CICD_TEMPLATE_RELOAD", "false").lower() == "true"  # 파일 수정 시 다시 읽기
 
     # 외부 서버 URL
     FRONTEND_URL = os.getenv("FRONTEND_URL")  # 프론트엔드 서버와 통신
     FRONTEND_PROD_URL = os.getenv("FRONTEND_PROD_URL")  # 서버 프론트엔드 서버와 통신
     AI_LANGCHAIN_URL = os.getenv("AI_LANGCHAIN_URL")  # AI 서버와 통신
 
+    # 공유 AI 클라이언트 커넥션 풀 및 타임아웃 설정
+    AI_POOL_SIZE = int(os.getenv("AI_POOL_SIZE", "100"))  # 전체 최대 연결 수
+    AI_POOL_PER_HOST = int(os.getenv("AI_POOL_PER_HOST", "50"))  # 호스트별 최대 연결 수
+    AI_KEEPALIVE_TIMEOUT = float(os.getenv("AI_KEEPALIVE_TIMEOUT", "30"))  # 유휴 연결 유지 시간(초)
+    AI_CONNECT_TIMEOUT = float(os.getenv("AI_CONNECT_TIMEOUT", "5"))  # 연결 타임아웃(초)
+    AI_READ_TIMEOUT = float(os.getenv("AI_READ_TIMEOUT", "300"))  # 응답 읽기 타임아웃(초), 코드 생성은 오래 걸림
+    AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "64"))  # AI 서버 동시 요청 수 상한
+
     # 배포를 위한 변수들
     NCP_DEV_SERVER_IP = os.getenv("NCP_DEV_SERVER_IP")
     NCP_DEV_SSH_PASSWORD = os.getenv("NCP_DEV_SSH_PASSWORD")
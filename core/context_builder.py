@@ -0,0 +1,140 @@
+import json
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.history_cache import history_cache, to_cached
+from core.metrics import Counter, Histogram
+from core.models import Message, SUMMARY_MESSAGE
+
+# generate-code 요청 본문 크기와 잘려나간 메시지 수 메트릭
+PAYLOAD_BYTES = Histogram(
+    "ai_request_payload_bytes",
+    "Size of JSON payloads sent to the AI server",
+    buckets=(1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+    labelnames=("endpoint",),
+)
+HISTORY_MESSAGES = Histogram(
+    "ai_context_history_messages",
+    "Number of history messages included in generate-code payloads",
+    buckets=(0, 5, 10, 20, 50, 100, 200),
+)
+HISTORY_TRUNCATED = Counter(
+    "ai_context_truncated_total",
+    "generate-code payloads whose history was cut by the context window",
+)
+
+# 요약에 담을 메시지 한 건의 최대 길이
+SUMMARY_SNIPPET_CHARS = 120
+
+
+def _older_than(created_at: datetime, message_id: int):
+    """(created_at, id) 기준으로 주어진 메시지보다 먼저 작성된 메시지 조건"""
+    return or_(
+        Message.created_at < created_at,
+        and_(Message.created_at == created_at, Message.id < message_id)
+    )
+
+
+def _fold_summary(summary_text: str, messages: List[Message]) -> str:
+    """기존 요약 뒤에 창 밖으로 밀려난 메시지를 덧붙이고, 최대 길이를 넘으면 앞부분부터 잘라냄"""
+    lines = [summary_text] if summary_text else []
+    for msg in messages:
+        sender = "system" if bool(msg.is_system) else "user"
+        lines.append(f"{sender}: {msg.content[:SUMMARY_SNIPPET_CHARS]}")
+    text = "\n".join(lines)
+    return text[-settings.HISTORY_SUMMARY_MAX_CHARS:]
+
+
+async def _update_summary(db: AsyncSession, room_id: int, oldest_created_at: datetime, oldest_id: int):
+    """창 밖으로 밀려난 메시지를 대화 방의 요약 메시지에 누적하고 요약 메시지를 반환.
+
+    요약 메시지의 created_at은 마지막으로 반영한 메시지 시간으로, 다음 호출에서는
+    그 이후에 창 밖으로 밀려난 몇 건만 조회한다.
+    """
+    summary = (await db.execute(
+        select(Message).where(Message.chat_room_id == room_id, Message.is_system == SUMMARY_MESSAGE).limit(1)
+    )).scalars().first()
+
+    query = select(Message).where(
+        Message.chat_room_id == room_id,
+        Message.is_system != SUMMARY_MESSAGE,
+        _older_than(oldest_created_at, oldest_id),
+    )
+    if summary is not None:
+        query = query.where(Message.created_at > summary.created_at)
+    # 요약 길이가 제한되어 있으므로 가장 최근에 밀려난 메시지만 반영
+    query = query.order_by(Message.created_at.desc(), Message.id.desc()).limit(settings.HISTORY_MAX_MESSAGES)
+    dropped = list(reversed((await db.execute(query)).scalars().all()))
+    if not dropped:
+        return summary
+
+    if summary is None:
+        summary = Message(chat_room_id=room_id, content="", is_system=SUMMARY_MESSAGE)
+        db.add(summary)
+    summary.content = _fold_summary(summary.content, dropped)
+    summary.created_at = dropped[-1].created_at
+    return summary
+
+
+async def build_message_history(db: AsyncSession, room_id: int) -> List[dict]:
+    """generate-code에 보낼 대화 내역을 메시지 수와 총 글자 수 제한 안에서 구성.
+
+    방별 캐시에 없을 때만 DB에서 최근 HISTORY_MAX_MESSAGES건을 조회하고, 그중 최신 메시지부터
+    HISTORY_MAX_CHARS를 넘지 않는 만큼만 남긴다. HISTORY_SUMMARY_ENABLED이면
+    창 밖으로 밀려난 메시지를 대화 방의 요약 메시지에 누적해 내역 맨 앞에 붙인다.
+    요약 메시지 변경 사항은 호출한 쪽의 커밋에 함께 반영된다.
+
+    Args:
+        db (AsyncSession): DB 세션
+        room_id (int): 대화 방 ID
+
+    Returns:
+        List[dict]: 오래된 순으로 정렬된 대화 내역
+    """
+    # 방별 캐시에 최근 내역이 있으면 DB 조회와 직렬화를 건너뜀
+    tail = history_cache.get(room_id)
+    if tail is None:
+        rows = (await db.execute(
+            select(Message)
+            .where(Message.chat_room_id == room_id, Message.is_system != SUMMARY_MESSAGE)
+            .order_by(Message.created_at.desc(), Message.id.desc())
+            .limit(settings.HISTORY_MAX_MESSAGES + 1)
+        )).scalars().all()
+        tail = [to_cached(msg) for msg in reversed(rows)]
+        history_cache.set(room_id, tail)
+
+    # 최신 메시지부터 메시지 수/글자 수 예산 안에서 선택
+    kept = []
+    total_chars = 0
+    for item in reversed(tail[-settings.HISTORY_MAX_MESSAGES:]):
+        total_chars += len(item.data["content"] or "")
+        if kept and total_chars > settings.HISTORY_MAX_CHARS:
+            break
+        kept.append(item)
+    kept.reverse()
+
+    truncated = len(kept) < len(tail)
+    history = [item.data for item in kept]
+    if truncated:
+        HISTORY_TRUNCATED.inc()
+        if settings.HISTORY_SUMMARY_ENABLED:
+            summary = await _update_summary(db, room_id, kept[0].created_at, kept[0].id)
+            if summary is not None and summary.content:
+                history.insert(0, {
+                    "content": f"[Summary of earlier conversation]\n{summary.content}",
+                    "sender": "system",
+                    "created_at": summary.created_at.isoformat()
+                })
+    HISTORY_MESSAGES.observe(len(history))
+    return history
+
+
+def encode_payload(payload: dict, endpoint: str) -> bytes:
+    """AI 서버로 보낼 JSON 본문을 한 번만 직렬화하고 크기를 기록"""
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    PAYLOAD_BYTES.observe(len(body), endpoint=endpoint)
+    return body
@@ -1,21 +1,91 @@
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from core.config import settings
+from core.tracing import MeteredQueuePool, instrument_engine, instrument_pool
 
-# SQLAlchemy 엔진 생성: MySQL에 연결
-engine = create_engine(settings.DATABASE_URL)
+# 동기 드라이버 -> 비동기 드라이버 매핑
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
 
-# 세션 팩토리 생성: 데이터베이스 세션을 관리
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def to_async_url(database_url: str) -> str:
+    """동기 드라이버 URL(mysql+pymysql 등)을 비동기 드라이버 URL로 변환"""
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def pool_options(database_url: str, name: str) -> dict:
+    """비동기 엔진 커넥션 풀 설정. SQLite는 풀 크기 옵션을 지원하지 않으므로 제외
+
+    끊긴 연결 확인(pre_ping)과 오래된 연결 교체(recycle)는 모든 DB에 적용하고, 풀을 쓰는 DB는
+    연결 대기 시간을 기록하는 MeteredQueuePool을 사용한다 (name이 메트릭의 pool 라벨).
+    """
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return options
+    return {
+        **options,
+        "poolclass": MeteredQueuePool,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+def pool_capacity(database_url: str) -> Optional[int]:
+    """풀이 동시에 빌려줄 수 있는 최대 연결 수 (pool_size + max_overflow). SQLite처럼 풀 크기 제한이 없으면 None"""
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return None
+    return settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+
+def create_instrumented_engine(database_url: str, name: str):
+    """비동기 엔진을 만들고 쿼리 실행 시간과 풀 사용량을 /metrics에 기록"""
+    async_url = to_async_url(database_url)
+    created = create_async_engine(async_url, **pool_options(async_url, name))
+    instrument_engine(created.sync_engine)
+    instrument_pool(created.sync_engine, name)
+    return created
+
+
+# SQLAlchemy 비동기 엔진 생성: 요청 처리는 모두 비동기 드라이버(aiomysql/aiosqlite)로 수행
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+async_engine = create_instrumented_engine(ASYNC_DATABASE_URL, "primary")
+
+# 읽기 전용 복제본 엔진: 설정하지 않으면 기본 엔진을 그대로 사용
+read_engine = create_instrumented_engine(settings.DATABASE_READ_URL, "replica") if settings.DATABASE_READ_URL else async_engine
+read_pool_capacity = pool_capacity(settings.DATABASE_READ_URL or ASYNC_DATABASE_URL)
+
+# 비동기 세션 팩토리 생성: 커밋 후에도 객체 속성을 다시 조회하지 않도록 expire_on_commit=False
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+# 읽기 전용 세션 팩토리: 조회만 하는 요청에서 사용 (복제본이 없으면 기본 DB)
+ReadSessionLocal = async_sessionmaker(bind=read_engine, autoflush=False, expire_on_commit=False)
 
 # SQLAlchemy 모델의 기본 클래스: 테이블 정의에 사용
 Base = declarative_base()
 
+# 모델 기준으로 없는 테이블 생성 (이미 있는 테이블은 변경하지 않음): 서버 시작 시 lifespan에서 실행
+async def create_schema():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
 # 데이터베이스 세션을 의존성 주입으로 제공하는 함수
-def get_db():
-    db = SessionLocal()  # 새로운 세션 생성
-    try:
-        yield db         # FastAPI에서 사용하도록 세션 제공
-    finally:
-        db.close()       # 요청이 끝나면 세션 닫기
+async def get_db():
+    async with AsyncSessionLocal() as db:  # 새로운 세션 생성, 요청이 끝나면 세션 닫기
+        yield db                           # FastAPI에서 사용하도록 세션 제공
+
+# 조회 전용 엔드포인트용 세션 (DATABASE_READ_URL 지정 시 복제본으로 연결)
+async def get_read_db():
+    async with ReadSessionLocal() as db:
+        yield db
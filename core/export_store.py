@@ -0,0 +1,194 @@
+import asyncio
+import json
+import os
+import re
+import tempfile
+import zlib
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, List, NamedTuple, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 직렬화
+    orjson = None
+
+from core.config import settings
+
+# 버전 파일 이름: v{번호}.json 또는 v{번호}.json.gz
+_VERSION_FILE = re.compile(r"^v(\d+)\.json(\.gz)?$")
+
+
+def dumps(data: Any) -> bytes:
+    """JSON을 공백 없이 UTF-8 바이트로 직렬화 (orjson이 있으면 사용)"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ExportInfo(NamedTuple):
+    """저장된 내보내기 파일 하나"""
+    room_id: int
+    version: int
+    path: str
+    size: int  # 저장된(압축된) 크기
+    compressed: bool
+    created_at: datetime
+
+    def to_dict(self) -> dict:
+        return {
+            "room_id": self.room_id,
+            "version": self.version,
+            "size": self.size,
+            "compressed": self.compressed,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+class ExportWriter:
+    """내보내기 파일 하나를 임시 파일에 이어 쓰는 객체. 쓰기는 이벤트 루프 밖(스레드)에서 실행된다."""
+
+    def __init__(self, fd: int, tmp_path: str, compress: bool, level: int):
+        self.tmp_path = tmp_path
+        self.compressed = compress
+        self.bytes_written = 0  # 압축 전 크기
+        self.info: Optional[ExportInfo] = None
+        self._file = os.fdopen(fd, "wb")
+        # wbits=31: gzip 헤더/트레일러를 포함해 조각 단위로 압축
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31) if compress else None
+
+    def _write(self, data: bytes):
+        self.bytes_written += len(data)
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        if data:
+            self._file.write(data)
+
+    async def write(self, data: bytes):
+        await asyncio.to_thread(self._write, data)
+
+    def close(self):
+        """남은 압축 데이터를 쓰고 디스크에 반영한 뒤 파일을 닫음"""
+        if self._compressor is not None:
+            self._file.write(self._compressor.flush())
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+    def discard(self):
+        """파일을 닫고 임시 파일 삭제"""
+        self._file.close()
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+
+class ExportStore:
+    """AI 처리 결과(내보내기)를 방별 디렉토리에 버전 번호를 붙여 보관하는 저장소.
+
+    파일은 같은 디렉토리의 임시 파일에 모두 쓴 뒤 fsync하고 새 버전 이름으로 하드 링크해 공개하므로,
+    읽는 쪽은 완성된 파일만 보고 여러 프로세스가 동시에 저장해도 버전 번호가 겹치지 않는다.
+    파일 I/O는 모두 스레드에서 실행하고, gzip 압축은 조각 단위로 하므로 큰 결과도 한 번에 메모리에 올리지 않는다.
+
+    Args:
+        directory (str): 저장 디렉토리 ({directory}/{room_id}/v{번호}.json[.gz])
+        compress (bool): gzip 압축 여부
+        level (int): gzip 압축 수준
+        max_versions (int): 방별로 남길 최근 버전 수, 0이면 모두 보관
+    """
+
+    def __init__(self, directory: str, compress: bool = False, level: int = 6, max_versions: int = 0):
+        self.directory = directory
+        self.compress = compress
+        self.level = level
+        self.max_versions = max_versions
+
+    def room_dir(self, room_id: int) -> str:
+        return os.path.join(self.directory, str(room_id))
+
+    def _scan(self, room_id: int) -> List[ExportInfo]:
+        room_dir = self.room_dir(room_id)
+        versions = []
+        try:
+            with os.scandir(room_dir) as it:
+                for entry in it:
+                    match = _VERSION_FILE.match(entry.name)
+                    if match is None:
+                        continue
+                    stat = entry.stat()
+                    versions.append(ExportInfo(
+                        room_id, int(match.group(1)), entry.path, stat.st_size,
+                        match.group(2) is not None, datetime.utcfromtimestamp(stat.st_mtime)
+                    ))
+        except FileNotFoundError:
+            return []
+        versions.sort(key=lambda info: info.version)
+        return versions
+
+    async def versions(self, room_id: int) -> List[ExportInfo]:
+        """방의 내보내기 버전 목록 (오래된 순)"""
+        return await asyncio.to_thread(self._scan, room_id)
+
+    async def get(self, room_id: int, version: Optional[int] = None) -> Optional[ExportInfo]:
+        """특정 버전(미지정 시 최신 버전)의 정보, 없으면 None"""
+        versions = await self.versions(room_id)
+        if version is None:
+            return versions[-1] if versions else None
+        return next((info for info in versions if info.version == version), None)
+
+    def _publish(self, room_id: int, writer: ExportWriter) -> ExportInfo:
+        """임시 파일을 다음 버전 이름으로 링크하고 오래된 버전을 정리"""
+        writer.close()
+        room_dir = self.room_dir(room_id)
+        suffix = ".json.gz" if writer.compressed else ".json"
+        versions = self._scan(room_id)
+        version = versions[-1].version + 1 if versions else 1
+        while True:
+            path = os.path.join(room_dir, f"v{version}{suffix}")
+            try:
+                # 이미 같은 이름이 있으면 실패하므로 다른 프로세스와 번호가 겹치지 않음
+                os.link(writer.tmp_path, path)
+                break
+            except FileExistsError:
+                version += 1
+        os.remove(writer.tmp_path)
+        stat = os.stat(path)
+        info = ExportInfo(room_id, version, path, stat.st_size, writer.compressed, datetime.utcfromtimestamp(stat.st_mtime))
+
+        if self.max_versions > 0:
+            for old in (versions + [info])[:-self.max_versions]:
+                try:
+                    os.remove(old.path)
+                except OSError:
+                    pass
+        return info
+
+    def _create_writer(self, room_id: int) -> ExportWriter:
+        room_dir = self.room_dir(room_id)
+        os.makedirs(room_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=room_dir)
+        return ExportWriter(fd, tmp_path, self.compress, self.level)
+
+    @asynccontextmanager
+    async def open(self, room_id: int) -> AsyncIterator[ExportWriter]:
+        """새 버전을 조각 단위로 쓰는 writer를 반환. 블록이 정상 종료되면 writer.info에 저장 결과가 담긴다.
+
+        블록에서 예외가 나면 임시 파일을 지우고 새 버전을 만들지 않는다.
+        """
+        writer = await asyncio.to_thread(self._create_writer, room_id)
+        try:
+            yield writer
+        except BaseException:
+            await asyncio.to_thread(writer.discard)
+            raise
+        writer.info = await asyncio.to_thread(self._publish, room_id, writer)
+
+
+# 앱 전체에서 공유하는 내보내기 저장소
+export_store = ExportStore(
+    directory=settings.EXPORT_DIR,
+    compress=settings.EXPORT_GZIP,
+    level=settings.EXPORT_GZIP_LEVEL,
+    max_versions=settings.EXPORT_MAX_VERSIONS,
+)
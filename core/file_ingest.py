@@ -0,0 +1,114 @@
+import asyncio
+import base64
+import hashlib
+import json
+import mmap
+import os
+from typing import AsyncIterator, Dict
+
+from core.config import settings
+from core.tracing import span
+
+# 한 번에 인코딩할 원본 크기. 3의 배수여야 청크별 Base64 결과를 이어 붙여도 패딩이 중간에 생기지 않는다.
+CHUNK_SIZE = 3 * 64 * 1024
+
+
+# 읽고 난 매핑 페이지를 RSS에서 바로 내릴 수 있는지 (madvise 지원 및 청크가 페이지 경계에 맞는 경우)
+_CAN_RELEASE = hasattr(mmap, "MADV_DONTNEED") and CHUNK_SIZE % mmap.PAGESIZE == 0
+
+
+def _release(mm: mmap.mmap, offset: int, length: int):
+    """이미 처리한 구간의 페이지를 반환해 큰 파일을 읽어도 RSS가 늘지 않게 함 (내용은 파일에서 다시 읽을 수 있음)"""
+    if _CAN_RELEASE:
+        mm.madvise(mmap.MADV_DONTNEED, offset, min(length, len(mm) - offset))
+
+
+class FileTooLargeError(Exception):
+    """업로드 크기 제한을 넘는 파일"""
+
+    def __init__(self, path: str, size: int, limit: int):
+        super().__init__(f"'{path}' is {size} bytes, exceeding the {limit} byte limit")
+        self.path = path
+        self.size = size
+        self.limit = limit
+
+
+def check_size(path: str, limit: int = None) -> int:
+    """파일 크기를 반환. 제한(기본값 GITHUB_MAX_FILE_SIZE)을 넘으면 FileTooLargeError 발생"""
+    limit = limit or settings.GITHUB_MAX_FILE_SIZE
+    size = os.path.getsize(path)
+    if size > limit:
+        raise FileTooLargeError(path, size, limit)
+    return size
+
+
+def git_blob_sha(path: str, size: int = None) -> str:
+    """파일 내용의 Git blob SHA-1 계산 (GitHub가 같은 내용에 대해 돌려주는 blob SHA와 동일).
+
+    파일을 메모리 매핑해 청크 단위로 해시하므로 파일 전체를 메모리에 복사하지 않는다.
+    size를 이미 알고 있으면 다시 stat하지 않는다.
+    """
+    size = os.path.getsize(path) if size is None else size
+    digest = hashlib.sha1(f"blob {size}\0".encode())
+    with span("file", "hash"):
+        if size <= CHUNK_SIZE:
+            # 작은 파일은 메모리 매핑보다 한 번에 읽는 편이 빠름
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        else:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    for offset in range(0, len(view), CHUNK_SIZE):
+                        with view[offset:offset + CHUNK_SIZE] as chunk:
+                            digest.update(chunk)
+                        _release(mm, offset, CHUNK_SIZE)
+    return digest.hexdigest()
+
+
+class Base64JsonBody:
+    """로컬 파일을 Base64로 인코딩해 JSON 요청 본문으로 스트리밍하는 비동기 반복 객체.
+
+    {"message": ..., "content": "<base64>"}와 같은 본문을 파일을 메모리 매핑한 상태에서
+    CHUNK_SIZE씩 인코딩해 내보내므로, 파일 크기와 관계없이 청크 하나 분량의 메모리만 사용한다.
+    반복할 때마다 파일을 처음부터 다시 읽으므로 재시도 요청에도 그대로 쓸 수 있다.
+
+    Args:
+        path (str): 로컬 파일 경로
+        fields (Dict[str, str]): 본문에 함께 넣을 JSON 필드
+        key (str): Base64 내용을 담을 필드 이름
+    """
+
+    def __init__(self, path: str, fields: Dict[str, str] = None, key: str = "content"):
+        self.path = path
+        self.size = os.path.getsize(path)
+        head = json.dumps(fields or {})[:-1]
+        separator = ", " if fields else ""
+        self.prefix = f"{head}{separator}{json.dumps(key)}: \"".encode()
+        self.suffix = b"\"}"
+
+    @property
+    def content_length(self) -> int:
+        return len(self.prefix) + 4 * ((self.size + 2) // 3) + len(self.suffix)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """청크 전송 대신 정확한 길이로 보내기 위한 요청 헤더"""
+        return {"Content-Type": "application/json", "Content-Length": str(self.content_length)}
+
+    @staticmethod
+    def _encode(mm: mmap.mmap, view: memoryview, offset: int) -> bytes:
+        """청크 하나를 Base64로 인코딩하고 읽은 페이지를 반환 (디스크 읽기와 인코딩이 일어나므로 스레드에서 실행)"""
+        with view[offset:offset + CHUNK_SIZE] as chunk:
+            encoded = base64.b64encode(chunk)
+        _release(mm, offset, CHUNK_SIZE)
+        return encoded
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self.prefix
+        if self.size:
+            with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    for offset in range(0, self.size, CHUNK_SIZE):
+                        # 큰 파일을 올리는 동안 이벤트 루프가 다른 요청을 처리할 수 있도록 인코딩은 스레드에서
+                        yield await asyncio.to_thread(self._encode, mm, view, offset)
+        yield self.suffix
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import time
+from typing import Any, Optional, Tuple
+
+import aiohttp
+
+from core.config import settings
+from core.tracing import github_operation, span
+
+# 재시도할 서버 오류 상태 코드
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class GitHubError(Exception):
+    """GitHub API 호출 실패"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class GitHubResponse:
+    """본문까지 읽어 둔 GitHub API 응답"""
+
+    def __init__(self, status: int, headers, body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+    @property
+    def message(self) -> str:
+        """GitHub 오류 응답의 message 필드, 없으면 본문 전체"""
+        try:
+            return self.json().get("message", self.text)
+        except (ValueError, AttributeError):
+            return self.text
+
+
+class GitHubClient:
+    """모든 라우터가 공유하는 비동기 GitHub API 클라이언트.
+
+    앱 시작 시 keep-alive 커넥션 풀을 가진 세션을 한 번 열고 종료 시 닫는다.
+    레이트 리밋 헤더를 추적하고, 403(레이트 리밋)/429/5xx 및 네트워크 오류는 백오프 후 재시도한다.
+
+    Args:
+        token (str, optional): GitHub 토큰, 기본값은 settings.GITHUB_TOKEN
+        api_url (str, optional): GitHub API 기본 URL, 기본값은 settings.GITHUB_API_URL
+    """
+
+    def __init__(self, token: Optional[str] = None, api_url: Optional[str] = None):
+        self.token = token or settings.GITHUB_TOKEN
+        self.api_url = (api_url or settings.GITHUB_API_URL).rstrip("/")
+        self.max_retries = settings.GITHUB_MAX_RETRIES
+        self.backoff_base = settings.GITHUB_BACKOFF_BASE
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset: Optional[float] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self):
+        """커넥션 풀 세션 생성 (첫 요청 시 자동 호출)"""
+        if self._session is not None and not self._session.closed:
+            return
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        connector = aiohttp.TCPConnector(
+            limit=settings.GITHUB_POOL_SIZE,
+            keepalive_timeout=settings.GITHUB_KEEPALIVE_TIMEOUT,
+        )
+        self._session = aiohttp.ClientSession(
+            headers=headers,
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=settings.GITHUB_TIMEOUT),
+        )
+
+    async def close(self):
+        """세션과 커넥션 풀 종료 (앱 종료 시 호출)"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("GitHubClient is not started")
+        return self._session
+
+    def _update_rate_limit(self, headers):
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None:
+            self.rate_limit_remaining = int(remaining)
+        if reset is not None:
+            self.rate_limit_reset = float(reset)
+
+    def _retry_delay(self, resp: GitHubResponse, attempt: int) -> Optional[float]:
+        """재시도까지 기다릴 시간(초)을 계산. 재시도 대상이 아니면 None"""
+        backoff = self.backoff_base * (2 ** attempt)
+        retry_after = resp.headers.get("Retry-After")
+        if resp.status in (403, 429):
+            if retry_after is not None:
+                return float(retry_after)
+            if resp.headers.get("X-RateLimit-Remaining") == "0" and self.rate_limit_reset:
+                wait = self.rate_limit_reset - time.time()
+                return max(0.0, min(wait, settings.GITHUB_RATE_LIMIT_MAX_WAIT))
+            if "rate limit" in resp.text.lower():
+                return backoff
+            # 권한 부족 등 일반 403은 재시도하지 않음
+            return None
+        if resp.status in RETRY_STATUSES:
+            return backoff
+        return None
+
+    async def request(self, method: str, path: str, **kwargs) -> GitHubResponse:
+        """GitHub API 호출. 재시도 후에도 실패하면 마지막 응답을 그대로 반환한다.
+
+        Args:
+            method (str): HTTP 메서드
+            path (str): API 경로(예: "/user") 또는 전체 URL
+            **kwargs: aiohttp 요청 인자 (json 등)
+
+        Returns:
+            GitHubResponse: 본문을 읽은 응답
+        """
+        url = path if path.startswith("http") else f"{self.api_url}{path}"
+        if self._session is None or self._session.closed:
+            await self.start()
+        operation = github_operation(method, url[len(self.api_url):] if url.startswith(self.api_url) else path)
+        attempt = 0
+        while True:
+            try:
+                # 재시도마다 따로 기록해 백오프 대기 시간은 포함하지 않음
+                with span("github", operation):
+                    async with self.session.request(method, url, **kwargs) as raw:
+                        resp = GitHubResponse(raw.status, raw.headers, await raw.read())
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise GitHubError(503, f"{method} {url} failed: {e!r}")
+                await asyncio.sleep(self.backoff_base * (2 ** attempt))
+                attempt += 1
+                continue
+
+            self._update_rate_limit(resp.headers)
+            delay = self._retry_delay(resp, attempt)
+            if delay is None or attempt >= self.max_retries:
+                return resp
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def request_json(self, method: str, path: str, expected: Tuple[int, ...] = (200,), **kwargs) -> Any:
+        """GitHub API를 호출해 JSON 본문을 반환하고, 기대한 상태 코드가 아니면 GitHubError 발생"""
+        resp = await self.request(method, path, **kwargs)
+        if resp.status not in expected:
+            raise GitHubError(resp.status, f"{method} {path} failed ({resp.status}): {resp.message}")
+        return resp.json()
+
+
+# 앱 전체에서 공유하는 클라이언트 인스턴스 (첫 요청 시 세션 생성, main.py lifespan에서 close)
+github_client = GitHubClient()
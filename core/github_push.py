@@ -0,0 +1,513 @@
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from core.config import settings
+from core.file_ingest import Base64JsonBody, FileTooLargeError, check_size, git_blob_sha
+from core.github_client import GitHubClient, GitHubError
+from core.tracing import span
+
+# (리포지토리 내 경로, 로컬 파일 경로) 쌍
+FileEntry = Tuple[str, str]
+
+# 이 크기 이하의 UTF-8 텍스트 파일은 blob을 따로 만들지 않고 트리 요청에 내용을 직접 포함
+INLINE_FILE_LIMIT = 64 * 1024
+# 트리 요청 하나에 직접 포함할 내용의 총량 상한
+INLINE_TOTAL_LIMIT = 4 * 1024 * 1024
+# 업로드한 blob SHA를 기억할 최대 리포지토리 수
+KNOWN_BLOB_REPOS = 256
+
+# 리포지토리별로 이미 업로드한 blob SHA. 같은 내용의 파일은 다시 업로드하지 않고 SHA만 트리에 넣는다.
+_known_blobs: "OrderedDict[str, Set[str]]" = OrderedDict()
+
+
+def _repo_blobs(repo_url: str) -> Set[str]:
+    blobs = _known_blobs.setdefault(repo_url, set())
+    _known_blobs.move_to_end(repo_url)
+    while len(_known_blobs) > KNOWN_BLOB_REPOS:
+        _known_blobs.popitem(last=False)
+    return blobs
+
+
+# 리포지토리별 마지막 푸시 상태 {"commit": 커밋 SHA, "files": {경로: blob SHA}}. 디스크에도 저장해 재시작 후에도 사용
+_snapshots: Dict[str, Optional[dict]] = {}
+
+
+def _snapshot_path(owner: str, repo_name: str) -> str:
+    return os.path.join(settings.GITHUB_SNAPSHOT_DIR, f"{owner}__{repo_name}.json")
+
+
+def _read_snapshot(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_snapshot(path: str, snapshot: dict):
+    """임시 파일에 쓴 뒤 교체해 중간에 실패해도 이전 스냅샷이 깨지지 않게 함"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+async def load_snapshot(owner: str, repo_name: str) -> Optional[dict]:
+    """리포지토리의 마지막 푸시 상태를 반환 (메모리에 없으면 디스크에서 읽음)"""
+    path = _snapshot_path(owner, repo_name)
+    if path not in _snapshots:
+        _snapshots[path] = await asyncio.to_thread(_read_snapshot, path)
+    return _snapshots[path]
+
+
+async def save_snapshot(owner: str, repo_name: str, commit_sha: str, files: Dict[str, str]):
+    path = _snapshot_path(owner, repo_name)
+    snapshot = _snapshots[path] = {"commit": commit_sha, "files": files}
+    try:
+        await asyncio.to_thread(_write_snapshot, path, snapshot)
+    except OSError as e:
+        print(f"Failed to save snapshot for {owner}/{repo_name}: {e}")
+
+
+def forget_repo(owner: str, repo_name: str):
+    """리포지토리의 업로드 기록과 스냅샷 제거 (같은 이름으로 새로 만든 리포지토리에는 이전 내용이 없음)"""
+    _known_blobs.pop(f"/repos/{owner}/{repo_name}", None)
+    path = _snapshot_path(owner, repo_name)
+    _snapshots[path] = None
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _read_inline_text(local_path: str) -> Optional[str]:
+    """트리에 직접 포함할 수 있는 작은 UTF-8 텍스트 파일이면 내용을, 아니면 None을 반환"""
+    if os.path.getsize(local_path) > INLINE_FILE_LIMIT:
+        return None
+    with span("file", "read"), open(local_path, "rb") as f:
+        data = f.read()
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+async def _get_head(client: GitHubClient, repo_url: str, branch: str) -> Tuple[str, str]:
+    """브랜치의 최신 커밋 SHA와 그 커밋의 트리 SHA를 반환"""
+    ref = await client.request_json("GET", f"{repo_url}/git/ref/heads/{branch}")
+    parent_sha = ref["object"]["sha"]
+    parent = await client.request_json("GET", f"{repo_url}/git/commits/{parent_sha}")
+    return parent_sha, parent["tree"]["sha"]
+
+
+async def _commit_tree(
+    client: GitHubClient,
+    repo_url: str,
+    branch: str,
+    parent_sha: str,
+    base_tree_sha: str,
+    tree: List[dict],
+    message: str,
+) -> str:
+    """트리 생성 -> 커밋 생성 -> 브랜치 ref 갱신 후 새 커밋 SHA를 반환"""
+    new_tree = await client.request_json(
+        "POST", f"{repo_url}/git/trees", (201,),
+        json={"base_tree": base_tree_sha, "tree": tree}
+    )
+    commit = await client.request_json(
+        "POST", f"{repo_url}/git/commits", (201,),
+        json={
+            "message": message,
+            "tree": new_tree["sha"],
+            "parents": [parent_sha]
+        }
+    )
+    await client.request_json(
+        "PATCH", f"{repo_url}/git/refs/heads/{branch}", (200,),
+        json={"sha": commit["sha"]}
+    )
+    return commit["sha"]
+
+
+async def push_files_contents(
+    client: GitHubClient,
+    owner: str,
+    repo_name: str,
+    files: List[FileEntry],
+    branch: str = "main",
+) -> AsyncIterator[str]:
+    """파일마다 contents API(PUT)로 커밋하는 기존 방식. 파일 수만큼 커밋과 왕복이 발생한다."""
+    repo_url = f"/repos/{owner}/{repo_name}"
+    for repo_path, local_path in files:
+        try:
+            check_size(local_path)
+        except FileTooLargeError as e:
+            yield f"Skipped '{repo_path}': {e}"
+            continue
+        # 파일 내용을 메모리에 올리지 않고 Base64 JSON 본문으로 스트리밍
+        body = Base64JsonBody(local_path, {"message": f"Add {repo_path} via API", "branch": branch})
+        resp = await client.request("PUT", f"{repo_url}/contents/{repo_path}", data=body, headers=body.headers)
+        if resp.status not in (200, 201):
+            yield f"Error committing '{repo_path}': {resp.message}"
+            continue
+        yield f"Successfully committed '{repo_path}' to '{repo_name}'"
+
+
+def _hash_file(local_path: str, known_sha: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """크기 제한을 확인하고 (blob SHA, 오류 메시지)를 반환. 이미 계산한 SHA가 있으면 다시 해시하지 않음"""
+    try:
+        check_size(local_path)
+    except FileTooLargeError as e:
+        return None, str(e)
+    return known_sha or git_blob_sha(local_path), None
+
+
+async def _build_tree(
+    client: GitHubClient,
+    repo_url: str,
+    files: List[Tuple[str, str, str]],
+    tree: List[dict],
+    concurrency: int,
+) -> AsyncIterator[str]:
+    """(리포지토리 내 경로, 로컬 파일 경로, blob SHA) 목록을 트리 항목으로 만들어 tree에 추가.
+
+    작은 UTF-8 텍스트 파일은 내용을 직접 포함하고, 그 외 파일은 blob으로 스트리밍 업로드한다.
+    이 리포지토리에 이미 올린 blob SHA이면 업로드를 건너뛴다.
+    """
+    blob_files = []
+    inline_count = 0
+    inline_total = 0
+    for repo_path, local_path, blob_sha in files:
+        text = await asyncio.to_thread(_read_inline_text, local_path)
+        if text is not None and inline_total + len(text) <= INLINE_TOTAL_LIMIT:
+            inline_count += 1
+            inline_total += len(text)
+            tree.append({"path": repo_path, "mode": "100644", "type": "blob", "content": text})
+        else:
+            blob_files.append((repo_path, local_path, blob_sha))
+
+    yield f"Prepared {inline_count} inline files, uploading {len(blob_files)} blobs (concurrency {concurrency})"
+
+    semaphore = asyncio.Semaphore(concurrency)
+    known_blobs = _repo_blobs(repo_url)
+
+    async def create_blob(repo_path: str, local_path: str, blob_sha: str):
+        async with semaphore:
+            if blob_sha in known_blobs:
+                return repo_path, blob_sha, False
+            body = Base64JsonBody(local_path, {"encoding": "base64"})
+            blob = await client.request_json(
+                "POST", f"{repo_url}/git/blobs", (201,),
+                data=body, headers=body.headers
+            )
+            known_blobs.add(blob["sha"])
+        return repo_path, blob["sha"], True
+
+    tasks = [asyncio.ensure_future(create_blob(*entry)) for entry in blob_files]
+    try:
+        for done, future in enumerate(asyncio.as_completed(tasks), start=1):
+            repo_path, blob_sha, uploaded = await future
+            tree.append({"path": repo_path, "mode": "100644", "type": "blob", "sha": blob_sha})
+            if uploaded:
+                yield f"Uploaded '{repo_path}' ({done}/{len(blob_files)})"
+            else:
+                yield f"Unchanged '{repo_path}', reused blob {blob_sha[:7]} ({done}/{len(blob_files)})"
+    finally:
+        # 오류나 클라이언트 연결 종료 시 남은 blob 업로드 취소
+        for task in tasks:
+            task.cancel()
+
+
+async def _hash_files(
+    files: List[FileEntry],
+    shas: Dict[str, str],
+    skipped: List[str],
+    known: Optional[Dict[str, str]] = None,
+) -> AsyncIterator[str]:
+    """로컬 파일의 blob SHA를 계산해 shas에 기록. 크기 제한을 넘는 파일은 skipped에 추가"""
+    known = known or {}
+
+    def check_known() -> List[Tuple[Optional[str], Optional[str]]]:
+        # SHA를 이미 아는 파일은 크기만 확인하면 되므로 한 번의 스레드 호출로 처리
+        return [_hash_file(local_path, known[repo_path]) for repo_path, local_path in files if repo_path in known]
+
+    hashed = await asyncio.gather(
+        asyncio.to_thread(check_known),
+        *(asyncio.to_thread(_hash_file, local_path) for repo_path, local_path in files if repo_path not in known)
+    )
+    known_results = iter(hashed[0])
+    other_results = iter(hashed[1:])
+    results = [next(known_results) if repo_path in known else next(other_results) for repo_path, _ in files]
+    for (repo_path, _), (blob_sha, error) in zip(files, results):
+        if error is not None:
+            skipped.append(repo_path)
+            yield f"Skipped '{repo_path}': {error}"
+        else:
+            shas[repo_path] = blob_sha
+
+
+async def _commit_and_record(
+    client: GitHubClient,
+    owner: str,
+    repo_name: str,
+    branch: str,
+    parent_sha: str,
+    base_tree_sha: str,
+    tree: List[dict],
+    message: str,
+    files: Dict[str, str],
+) -> str:
+    """트리를 커밋하고 푸시한 파일 목록을 스냅샷으로 저장한 뒤 커밋 SHA를 반환"""
+    repo_url = f"/repos/{owner}/{repo_name}"
+    try:
+        commit_sha = await _commit_tree(client, repo_url, branch, parent_sha, base_tree_sha, tree, message)
+    except GitHubError as e:
+        # 기억해 둔 blob이 리포지토리에 없으면(다시 만든 리포지토리 등) 다음 푸시에서 전부 업로드
+        if e.status_code == 422:
+            forget_repo(owner, repo_name)
+        raise
+    await save_snapshot(owner, repo_name, commit_sha, files)
+    return commit_sha
+
+
+async def push_files_bulk(
+    client: GitHubClient,
+    owner: str,
+    repo_name: str,
+    files: List[FileEntry],
+    branch: str = "main",
+    message: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    shas: Optional[Dict[str, str]] = None,
+) -> AsyncIterator[str]:
+    """Git Data API로 blob -> tree -> commit -> ref 갱신 순서로 모든 파일을 단일 커밋으로 푸시.
+
+    작은 UTF-8 텍스트 파일은 트리 요청에 내용을 직접 포함하고, 그 외 파일만 blob으로 만든다.
+    blob은 파일을 메모리 매핑해 Base64로 스트리밍 업로드하고, 이 리포지토리에 이미 올린 내용
+    (같은 blob SHA)이면 업로드를 건너뛴다. GITHUB_MAX_FILE_SIZE를 넘는 파일은 제외한다.
+    blob 생성은 세마포어로 동시 실행 수를 제한하며, 완료되는 순서대로 진행 상황을 반환한다.
+    빈 리포지토리에는 blob을 만들 수 없으므로 리포지토리는 auto_init으로 생성되어 있어야 한다.
+    푸시한 파일 목록은 다음 sync 모드 푸시를 위해 스냅샷으로 저장한다.
+
+    Args:
+        client (GitHubClient): GitHub API 클라이언트
+        owner (str): 리포지토리 소유자
+        repo_name (str): 리포지토리 이름
+        files (List[FileEntry]): (리포지토리 내 경로, 로컬 파일 경로) 목록
+        branch (str): 커밋할 브랜치
+        message (str, optional): 커밋 메시지
+        concurrency (int, optional): 동시 blob 생성 수
+        shas (Dict[str, str], optional): 프로젝트 스캔에서 이미 계산한 경로별 blob SHA
+
+    Yields:
+        str: 진행 상황 메시지
+
+    Raises:
+        GitHubError: GitHub API 호출 실패 시
+    """
+    repo_url = f"/repos/{owner}/{repo_name}"
+    concurrency = concurrency or settings.GITHUB_BLOB_CONCURRENCY
+
+    # 현재 브랜치의 최신 커밋과 트리 조회
+    parent_sha, base_tree_sha = await _get_head(client, repo_url, branch)
+
+    local_shas: Dict[str, str] = {}
+    async for line in _hash_files(files, local_shas, [], shas):
+        yield line
+
+    tree = []
+    entries = [(repo_path, local_path, local_shas[repo_path]) for repo_path, local_path in files if repo_path in local_shas]
+    async for line in _build_tree(client, repo_url, entries, tree, concurrency):
+        yield line
+
+    # 이전에 푸시한 파일은 그대로 남아 있으므로 스냅샷에 함께 기록
+    snapshot = await load_snapshot(owner, repo_name)
+    recorded = dict(snapshot["files"]) if snapshot else {}
+    recorded.update(local_shas)
+
+    # 트리 -> 커밋 -> ref 갱신
+    commit_sha = await _commit_and_record(
+        client, owner, repo_name, branch, parent_sha, base_tree_sha, tree,
+        message or f"Add {len(tree)} files via API", recorded
+    )
+    yield f"Committed {len(tree)} files to '{repo_name}' in a single commit ({commit_sha[:7]})"
+
+
+async def push_files_sync(
+    client: GitHubClient,
+    owner: str,
+    repo_name: str,
+    files: List[FileEntry],
+    branch: str = "main",
+    message: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    shas: Optional[Dict[str, str]] = None,
+) -> AsyncIterator[str]:
+    """로컬 파일과 리포지토리를 비교해 추가/변경/삭제된 파일만 단일 커밋으로 푸시.
+
+    로컬 파일의 Git blob SHA를 계산해 원격 트리의 SHA와 비교한다. 마지막 푸시 이후 브랜치가
+    바뀌지 않았으면 저장해 둔 스냅샷을 원격 트리로 사용하고, 바뀌었으면 트리를 한 번만 조회한다.
+    삭제는 이전에 이 서버가 푸시한 파일(스냅샷에 있는 파일) 중 이번 목록에 없는 파일만 대상으로 하므로
+    README 등 다른 곳에서 추가한 파일은 건드리지 않는다. 바뀐 파일이 없으면 커밋하지 않는다.
+    커밋이 없는 빈 리포지토리에는 파일별 커밋(contents 방식)으로 푸시한다.
+
+    Args:
+        client (GitHubClient): GitHub API 클라이언트
+        owner (str): 리포지토리 소유자
+        repo_name (str): 리포지토리 이름
+        files (List[FileEntry]): (리포지토리 내 경로, 로컬 파일 경로) 목록
+        branch (str): 커밋할 브랜치
+        message (str, optional): 커밋 메시지
+        concurrency (int, optional): 동시 blob 생성 수
+        shas (Dict[str, str], optional): 프로젝트 스캔에서 이미 계산한 경로별 blob SHA
+
+    Yields:
+        str: 진행 상황 메시지
+
+    Raises:
+        GitHubError: GitHub API 호출 실패 시
+    """
+    repo_url = f"/repos/{owner}/{repo_name}"
+    concurrency = concurrency or settings.GITHUB_BLOB_CONCURRENCY
+
+    try:
+        parent_sha, base_tree_sha = await _get_head(client, repo_url, branch)
+    except GitHubError as e:
+        if e.status_code not in (404, 409):
+            raise
+        yield f"Repository '{repo_name}' has no commits, committing files one by one"
+        async for line in push_files_contents(client, owner, repo_name, files, branch=branch):
+            yield line
+        return
+
+    local_shas: Dict[str, str] = {}
+    skipped: List[str] = []
+    async for line in _hash_files(files, local_shas, skipped, shas):
+        yield line
+
+    snapshot = await load_snapshot(owner, repo_name)
+    previous = snapshot["files"] if snapshot else {}
+    if snapshot and snapshot["commit"] == parent_sha:
+        remote = previous
+        yield f"Using cached tree snapshot of '{repo_name}' ({len(remote)} files)"
+    else:
+        data = await client.request_json("GET", f"{repo_url}/git/trees/{base_tree_sha}?recursive=1")
+        remote = {entry["path"]: entry["sha"] for entry in data["tree"] if entry["type"] == "blob"}
+        yield f"Fetched remote tree of '{repo_name}' ({len(remote)} files)"
+
+    local_paths = dict(files)
+    changed = [(path, local_paths[path], sha) for path, sha in local_shas.items() if remote.get(path) != sha]
+    deleted = [path for path in previous if path not in local_shas and path not in skipped and path in remote]
+    unchanged = len(local_shas) - len(changed)
+
+    # 크기 제한으로 건너뛴 파일은 이전 상태를 유지
+    recorded = {path: previous[path] for path in skipped if path in previous}
+    recorded.update(local_shas)
+
+    if not changed and not deleted:
+        await save_snapshot(owner, repo_name, parent_sha, recorded)
+        yield f"'{repo_name}' is up to date ({unchanged} files unchanged)"
+        return
+
+    yield f"Syncing {len(changed)} added/changed, {len(deleted)} deleted, {unchanged} unchanged files"
+
+    tree = []
+    async for line in _build_tree(client, repo_url, changed, tree, concurrency):
+        yield line
+    tree += [{"path": path, "mode": "100644", "type": "blob", "sha": None} for path in deleted]
+
+    commit_sha = await _commit_and_record(
+        client, owner, repo_name, branch, parent_sha, base_tree_sha, tree,
+        message or f"Update {len(changed)} files, delete {len(deleted)} files via API", recorded
+    )
+    yield f"Committed {len(changed)} added/changed and {len(deleted)} deleted files to '{repo_name}' ({commit_sha[:7]})"
+
+
+async def push_contents_bulk(
+    client: GitHubClient,
+    owner: str,
+    repo_name: str,
+    contents: Dict[str, str],
+    branch: str = "main",
+    message: Optional[str] = None,
+) -> str:
+    """메모리에 있는 텍스트 파일들을 트리에 직접 포함해 단일 커밋으로 푸시하고 커밋 SHA를 반환.
+
+    Args:
+        client (GitHubClient): GitHub API 클라이언트
+        owner (str): 리포지토리 소유자
+        repo_name (str): 리포지토리 이름
+        contents (Dict[str, str]): {리포지토리 내 경로: 파일 내용}
+        branch (str): 커밋할 브랜치
+        message (str, optional): 커밋 메시지
+
+    Returns:
+        str: 새 커밋 SHA
+
+    Raises:
+        GitHubError: GitHub API 호출 실패 시 (빈 리포지토리는 ref 조회가 404/409로 실패)
+    """
+    repo_url = f"/repos/{owner}/{repo_name}"
+    parent_sha, base_tree_sha = await _get_head(client, repo_url, branch)
+    tree = [
+        {"path": repo_path, "mode": "100644", "type": "blob", "content": text}
+        for repo_path, text in contents.items()
+    ]
+    return await _commit_tree(
+        client, repo_url, branch, parent_sha, base_tree_sha, tree,
+        message or f"Add {len(tree)} files via API"
+    )
+
+
+async def push_files(
+    client: GitHubClient,
+    owner: str,
+    repo_name: str,
+    files: List[FileEntry],
+    mode: Optional[str] = None,
+    branch: str = "main",
+    shas: Optional[Dict[str, str]] = None,
+) -> AsyncIterator[str]:
+    """설정된 방식(bulk/sync/contents)으로 파일을 푸시하고 진행 상황을 반환"""
+    mode = mode or settings.GITHUB_PUSH_MODE
+    if mode == "bulk":
+        progress = push_files_bulk(client, owner, repo_name, files, branch=branch, shas=shas)
+    elif mode == "sync":
+        progress = push_files_sync(client, owner, repo_name, files, branch=branch, shas=shas)
+    else:
+        progress = push_files_contents(client, owner, repo_name, files, branch=branch)
+    async for line in progress:
+        yield line
+
+
+async def ensure_repo(
+    client: GitHubClient,
+    owner: str,
+    repo_name: str,
+    description: str,
+    auto_init: bool = True,
+    private: bool = False,
+) -> Tuple[str, bool]:
+    """리포지토리를 만들고 (기본 브랜치, 새로 만들었는지)를 반환. 같은 이름의 리포지토리가 있으면 그대로 사용.
+
+    Raises:
+        GitHubError: 생성 실패 시 (이미 있는 경우 제외)
+    """
+    create_payload = {
+        "name": repo_name,
+        "private": private,
+        "description": description,
+        "auto_init": auto_init
+    }
+    resp = await client.request("POST", "/user/repos", json=create_payload)
+    if resp.status == 201:
+        forget_repo(owner, repo_name)
+        return resp.json().get("default_branch") or "main", True
+    if resp.status == 422 and "already exists" in resp.text:
+        repo = await client.request_json("GET", f"/repos/{owner}/{repo_name}")
+        return repo.get("default_branch") or "main", False
+    raise GitHubError(resp.status, f"Failed to create repository - {resp.text}")
@@ -0,0 +1,119 @@
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+
+from core.config import settings
+from core.metrics import Counter
+from core.models import Message, SUMMARY_MESSAGE
+
+CACHE_REQUESTS = Counter(
+    "history_cache_requests_total",
+    "Room history cache lookups",
+    labelnames=("result",),
+)
+CACHE_EVICTIONS = Counter(
+    "history_cache_evictions_total",
+    "Room history cache entries removed",
+    labelnames=("reason",),
+)
+
+
+class CachedMessage(NamedTuple):
+    """캐시에 보관하는 메시지: 정렬/커서용 키와 직렬화된 본문"""
+    id: int
+    created_at: datetime
+    data: dict
+
+
+def serialize_message(msg: Message) -> dict:
+    """generate-code 요청에 넣을 메시지 형식으로 변환"""
+    return {"content": msg.content, "sender": "system" if bool(msg.is_system) else "user", "created_at": msg.created_at.isoformat()}
+
+
+def to_cached(msg: Message) -> CachedMessage:
+    return CachedMessage(msg.id, msg.created_at, serialize_message(msg))
+
+
+class _Entry:
+    __slots__ = ("messages", "expires_at")
+
+    def __init__(self, messages: List[CachedMessage], expires_at: float):
+        self.messages = messages
+        self.expires_at = expires_at
+
+
+class HistoryCache:
+    """대화 방별 최근 대화 내역(직렬화 완료)을 보관하는 LRU 캐시.
+
+    DB에서 채울 때 최근 max_messages건을 보관하고, 새 메시지가 커밋되면 뒤에 덧붙인다(write-through).
+    방 개수(max_rooms)를 넘으면 가장 오래 쓰지 않은 방부터, TTL이 지나면 조회 시점에 제거한다.
+    다른 워커 프로세스의 쓰기는 반영되지 않으므로 TTL이 최대 지연 시간이 된다.
+
+    Args:
+        max_rooms (int): 캐시할 최대 방 개수
+        ttl (float): 항목 유효 시간(초)
+        max_messages (int): 방마다 보관할 최근 메시지 수
+    """
+
+    def __init__(self, max_rooms: int, ttl: float, max_messages: int):
+        self.max_rooms = max_rooms
+        self.ttl = ttl
+        self.max_messages = max_messages
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, room_id: int) -> Optional[List[CachedMessage]]:
+        """캐시된 대화 내역(오래된 순)을 반환. 없거나 만료되었으면 None"""
+        entry = self._entries.get(room_id)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[room_id]
+            CACHE_EVICTIONS.inc(reason="ttl")
+            entry = None
+        if entry is None:
+            self.misses += 1
+            CACHE_REQUESTS.inc(result="miss")
+            return None
+        self._entries.move_to_end(room_id)
+        self.hits += 1
+        CACHE_REQUESTS.inc(result="hit")
+        return list(entry.messages)
+
+    def set(self, room_id: int, messages: List[CachedMessage]):
+        """DB에서 읽은 대화 내역(오래된 순)으로 방 항목을 채움"""
+        if self.max_rooms <= 0:
+            return
+        self._entries[room_id] = _Entry(list(messages[-self.max_messages:]), time.monotonic() + self.ttl)
+        self._entries.move_to_end(room_id)
+        while len(self._entries) > self.max_rooms:
+            self._entries.popitem(last=False)
+            CACHE_EVICTIONS.inc(reason="size")
+
+    def append(self, room_id: int, msg: Message):
+        """커밋된 새 메시지를 캐시된 방 항목 뒤에 추가. 캐시에 없는 방은 다음 조회 때 DB에서 채움"""
+        entry = self._entries.get(room_id)
+        if entry is None or msg.is_system == SUMMARY_MESSAGE:
+            return
+        entry.messages.append(to_cached(msg))
+        if len(entry.messages) > self.max_messages:
+            del entry.messages[:-self.max_messages]
+
+    def invalidate(self, room_id: int):
+        """방 항목 제거 (방 삭제 시)"""
+        if self._entries.pop(room_id, None) is not None:
+            CACHE_EVICTIONS.inc(reason="invalidate")
+
+    def clear(self):
+        self._entries.clear()
+
+
+# 앱 전체에서 공유하는 캐시 인스턴스. 잘림 여부를 판단할 수 있도록 창 크기보다 1건 더 보관
+history_cache = HistoryCache(
+    max_rooms=settings.HISTORY_CACHE_MAX_ROOMS,
+    ttl=settings.HISTORY_CACHE_TTL,
+    max_messages=settings.HISTORY_MAX_MESSAGES + 1,
+)
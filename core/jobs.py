@@ -0,0 +1,305 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import select, update
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.models import Job
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태 값
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATUSES = (SUCCEEDED, FAILED)
+
+# 작업 처리 함수: payload를 받아 진행 상황 메시지를 차례로 반환하는 비동기 제너레이터
+JobHandler = Callable[[dict], AsyncIterator[str]]
+
+
+class _JobLog:
+    """작업 하나의 진행 상황 이벤트 기록. 구독자는 새 이벤트가 올 때까지 대기한다."""
+
+    def __init__(self):
+        self.events: List[str] = []
+        self.finished = False
+        self.changed = asyncio.Event()
+
+    def publish(self, line: str):
+        self.events.append(line)
+        self._wake()
+
+    def finish(self):
+        self.finished = True
+        self._wake()
+
+    def _wake(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+
+def job_to_dict(job: Job) -> dict:
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "room_id": job.room_id,
+        "status": job.status,
+        "message": job.message,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+    }
+
+
+class JobQueue:
+    """jobs 테이블을 기반으로 한 프로세스 내 비동기 작업 큐.
+
+    작업은 DB에 먼저 기록된 뒤 asyncio 워커 풀에서 실행되므로, 요청한 클라이언트의 연결이
+    끊겨도 계속 진행된다. 진행 상황은 메모리에 이벤트로 쌓여 작업 ID로 언제든 다시 구독할 수 있다.
+
+    여러 프로세스(uvicorn 워커)가 같은 jobs 테이블을 써도 작업은 한 번만 실행된다.
+    queued -> running 전환(_claim)은 조건부 UPDATE라 한 프로세스만 성공하고, 실행 중인 작업은
+    JOB_LEASE_SECONDS / 3마다 updated_at을 갱신한다. running 작업은 이 갱신이 JOB_LEASE_SECONDS
+    넘게 끊긴 경우(프로세스가 죽은 경우)에만 다시 큐에 넣는다. 정상 종료 시에는 실행 중이던 작업을
+    queued로 되돌린다.
+
+    Args:
+        concurrency (int): 동시에 실행할 작업 수(워커 수)
+    """
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self._handlers: Dict[str, JobHandler] = {}
+        self._logs: Dict[int, _JobLog] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._reaper: Optional[asyncio.Task] = None
+        # 이 프로세스의 큐에 있거나 실행 중인 작업 (같은 작업을 두 번 넣지 않도록)
+        self._active: Set[int] = set()
+
+    def handler(self, kind: str):
+        """작업 종류별 처리 함수를 등록하는 데코레이터"""
+        def register(func: JobHandler) -> JobHandler:
+            self._handlers[kind] = func
+            return func
+        return register
+
+    @property
+    def kinds(self) -> List[str]:
+        return sorted(self._handlers)
+
+    async def start(self):
+        """대기 중인 작업과 중단된 작업을 큐에 넣고 워커 시작 (앱 시작 시 호출)"""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        # queued 작업은 _claim으로 한 프로세스만 실행하므로 모두 넣어도 중복 실행되지 않음
+        await self._recover(include_queued=True)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._reaper = asyncio.create_task(self._reap())
+
+    async def stop(self):
+        """워커 종료 (앱 종료 시 호출). 실행 중이던 작업은 queued로 되돌려 다음 시작 때 다시 실행된다."""
+        tasks = self._workers + ([self._reaper] if self._reaper else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._reaper = None
+        self._queue = None
+        self._active.clear()
+
+    def _put(self, job_id: int):
+        self._active.add(job_id)
+        self._logs.setdefault(job_id, _JobLog())
+        self._queue.put_nowait(job_id)
+
+    async def _recover(self, include_queued: bool = False):
+        """임대 시간이 지난 running 작업(실행하던 프로세스가 죽은 작업)을 queued로 되돌려 큐에 넣음.
+
+        include_queued이면 queued 작업을 모두, 아니면 임대 시간 동안 아무도 가져가지 않은 queued 작업만 넣는다.
+        """
+        stale = datetime.utcnow() - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Job).where(Job.status == RUNNING, Job.updated_at < stale).values(status=QUEUED)
+            )
+            await db.commit()
+            query = select(Job.id).where(Job.status == QUEUED).order_by(Job.id)
+            if not include_queued:
+                query = query.where(Job.updated_at < stale)
+            pending = (await db.execute(query)).scalars().all()
+        for job_id in pending:
+            if job_id not in self._active:
+                self._put(job_id)
+
+    async def _reap(self):
+        """다른 프로세스가 죽어 멈춘 작업을 주기적으로 찾아 다시 실행"""
+        while True:
+            await asyncio.sleep(settings.JOB_LEASE_SECONDS)
+            try:
+                await self._recover()
+            except Exception:
+                logger.exception("Failed to recover stale jobs")
+
+    async def enqueue(self, kind: str, payload: dict, room_id: Optional[int] = None) -> int:
+        """작업을 DB에 기록하고 큐에 넣은 뒤 작업 ID를 반환"""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if self._queue is None:
+            await self.start()
+        async with AsyncSessionLocal() as db:
+            job = Job(kind=kind, room_id=room_id, payload=json.dumps(payload), status=QUEUED)
+            db.add(job)
+            await db.commit()
+        self._put(job.id)
+        self._logs[job.id].publish(f"Queued as job {job.id}")
+        return job.id
+
+    async def get(self, job_id: int) -> Optional[Job]:
+        async with AsyncSessionLocal() as db:
+            return await db.get(Job, job_id)
+
+    async def events(self, job_id: int, last_event_id: int = 0) -> AsyncIterator[tuple]:
+        """작업 진행 상황을 (이벤트 번호, 메시지)로 반환. last_event_id 이후부터 이어서 받고, 작업이 끝나면 종료.
+
+        메모리에 기록이 없는 작업(보관 기간이 지났거나 다른 프로세스에서 실행된 작업)은
+        DB의 최종 상태만 반환한다.
+        """
+        seq = last_event_id
+        while True:
+            log = self._logs.get(job_id)
+            if log is None:
+                job = await self.get(job_id)
+                if job is not None:
+                    yield seq + 1, f"Job {job.id} {job.status}" + (f": {job.message}" if job.message else "")
+                return
+            changed = log.changed
+            while seq < len(log.events):
+                seq += 1
+                yield seq, log.events[seq - 1]
+            if log.finished:
+                return
+            await changed.wait()
+
+    async def sse_stream(self, job_id: int, last_event_id: int = 0) -> AsyncIterator[str]:
+        """작업 진행 상황을 이벤트 번호가 붙은 SSE 프레임으로 반환 (Last-Event-ID로 재개 가능)"""
+        async for seq, line in self.events(job_id, last_event_id):
+            yield f"id: {seq}\ndata: {line}\n\n"
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # _run이 처리하지 못한 예외가 있어도 워커는 종료하지 않음
+                logger.exception("Job worker failed on job %s", job_id)
+            finally:
+                self._active.discard(job_id)
+                self._queue.task_done()
+
+    async def _set_status(self, job_id: int, status: str, message: Optional[str] = None):
+        async with AsyncSessionLocal() as db:
+            values = {"status": status}
+            if message is not None:
+                values["message"] = message[:500]
+            await db.execute(update(Job).where(Job.id == job_id).values(**values))
+            await db.commit()
+
+    async def _heartbeat(self, job_id: int):
+        """실행 중인 작업의 임대를 연장 (updated_at 갱신)"""
+        while True:
+            await asyncio.sleep(settings.JOB_LEASE_SECONDS / 3)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(Job).where(Job.id == job_id, Job.status == RUNNING).values(updated_at=datetime.utcnow())
+                    )
+                    await db.commit()
+            except Exception:
+                logger.exception("Failed to extend the lease of job %s", job_id)
+
+    async def _release(self, job_id: int):
+        """서버 종료로 중단된 작업을 queued로 되돌림. 실패하면 임대 시간이 지난 뒤 다시 실행된다."""
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(update(Job).where(Job.id == job_id, Job.status == RUNNING).values(status=QUEUED))
+                await db.commit()
+        except Exception:
+            logger.exception("Job %s could not be released", job_id)
+
+    async def _claim(self, job_id: int) -> bool:
+        """queued 상태인 작업만 running으로 바꿔 한 워커만 실행하도록 보장"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(Job).where(Job.id == job_id, Job.status == QUEUED).values(status=RUNNING)
+            )
+            await db.commit()
+        return result.rowcount == 1
+
+    async def _run(self, job_id: int):
+        """작업 하나를 실행. 처리 함수뿐 아니라 조회/상태 변경 중 DB 오류가 나도 예외를 밖으로 내보내지 않고
+        작업을 failed로 기록하므로 워커는 계속 다음 작업을 처리한다. 어떤 경로로 끝나든 진행 기록을 마무리해
+        구독자가 기다리다 멈추지 않게 한다."""
+        log = self._logs.setdefault(job_id, _JobLog())
+        retention = settings.JOB_EVENT_RETENTION
+        heartbeat = None
+        try:
+            job = await self.get(job_id)
+            if job is None:
+                return
+            if not await self._claim(job_id):
+                # 다른 프로세스가 이미 실행 중이거나 끝낸 작업: 이 프로세스의 기록은 바로 닫고,
+                # 이후 구독자는 DB의 최종 상태를 받는다
+                log.publish(f"Job {job_id} is handled by another worker")
+                retention = 0
+                return
+
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            last_line = None
+            try:
+                handler = self._handlers[job.kind]
+                async for line in handler(json.loads(job.payload or "{}")):
+                    last_line = line
+                    log.publish(line)
+            except asyncio.CancelledError:
+                # 서버 종료로 중단된 작업은 queued로 되돌려 다음 시작 때 다시 실행
+                log.publish("Interrupted by server shutdown, will resume after restart")
+                await self._release(job_id)
+                raise
+            except Exception as e:
+                log.publish(f"Error: {e}")
+                await self._set_status(job_id, FAILED, str(e))
+            else:
+                await self._set_status(job_id, SUCCEEDED, last_line)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("Job %s could not be processed", job_id)
+            log.publish(f"Error: {e}")
+            await self._mark_failed(job_id, str(e))
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            log.finish()
+            # 끝난 작업의 이벤트 기록은 보관 기간이 지나면 메모리에서 제거
+            asyncio.get_running_loop().call_later(retention, self._logs.pop, job_id, None)
+
+    async def _mark_failed(self, job_id: int, message: str):
+        """DB 오류 후 작업을 failed로 기록. 이마저 실패하면 DB 상태가 그대로 남아 다음 시작 때 다시 실행된다."""
+        try:
+            await self._set_status(job_id, FAILED, message)
+        except Exception:
+            logger.exception("Job %s could not be marked as failed", job_id)
+
+
+# 앱 전체에서 공유하는 작업 큐 (main.py lifespan에서 start/stop)
+job_queue = JobQueue(concurrency=settings.JOB_WORKERS)
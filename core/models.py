@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, Text
+from core.config import MESSAGE_CONTENT_MAX_LENGTH
 from core.database import Base
 from datetime import datetime
 
@@ -10,11 +11,31 @@ class ChatRoom(Base):
     repo_url = Column(String(255), nullable=True)       # GitHub 리포지토리 URL, 선택적
     created_at = Column(DateTime, default=datetime.utcnow)  # 생성 시간, 기본값 UTC 현재 시간
 
+# is_system 값: 대화 방별 롤링 요약 메시지 (대화 내역 조회에서는 제외)
+SUMMARY_MESSAGE = 2
+
 # 메시지 테이블 정의
 class Message(Base):
     __tablename__ = "messages"  # 테이블 이름
     id = Column(Integer, primary_key=True, index=True)  # 고유 식별자, 인덱스 적용
     chat_room_id = Column(Integer, ForeignKey("chat_rooms.id"))  # 외래 키, ChatRoom 참조
-    content = Column(String(500))  # 메시지 내용, 최대 500자
-    is_system = Column(Integer, default=0)  # 0: 사용자 메시지, 1: 시스템 메시지
+    content = Column(String(MESSAGE_CONTENT_MAX_LENGTH))  # 메시지 내용, 최대 500자
+    is_system = Column(Integer, default=0)  # 0: 사용자 메시지, 1: 시스템 메시지, 2: 요약 메시지
+    created_at = Column(DateTime, default=datetime.utcnow)  # 생성 시간, 기본값 UTC 현재 시간
+
+    __table_args__ = (
+        # 대화 방별 메시지를 시간순으로 조회/페이지네이션할 때 사용하는 복합 인덱스
+        Index("ix_messages_room_created_id", "chat_room_id", "created_at", "id"),
+    )
+
+# 백그라운드 작업 테이블 정의
+class Job(Base):
+    __tablename__ = "jobs"  # 테이블 이름
+    id = Column(Integer, primary_key=True, index=True)  # 고유 식별자, 인덱스 적용
+    kind = Column(String(50), nullable=False)  # 작업 종류 (예: github_pipeline, publish_repo)
+    room_id = Column(Integer, nullable=True)  # 관련 대화 방 ID, 선택적
+    payload = Column(Text, nullable=False, default="{}")  # 작업 입력 (JSON 문자열)
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, succeeded, failed
+    message = Column(String(500), nullable=True)  # 마지막 진행 상황 또는 오류 메시지
     created_at = Column(DateTime, default=datetime.utcnow)  # 생성 시간, 기본값 UTC 현재 시간
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # 마지막 상태 변경 시간
@@ -0,0 +1,272 @@
+import asyncio
+import fnmatch
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from core.config import settings
+from core.file_ingest import git_blob_sha
+
+# 한 번에 스레드 풀로 넘길 파일 수 (파일마다 작업을 만들면 이벤트 루프 오버헤드가 커짐)
+BATCH_SIZE = 64
+
+# 스캔에 사용할 공유 스레드 풀 (처음 사용할 때 생성)
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class ManifestEntry(NamedTuple):
+    """프로젝트 파일 하나의 정보"""
+    path: str  # 프로젝트 루트 기준 상대 경로 ("/" 구분), 리포지토리 내 경로로 그대로 사용
+    local_path: str
+    size: int
+    mtime: float
+    sha: Optional[str]  # Git blob SHA (해시하지 않았거나 크기 제한을 넘으면 None)
+
+
+class ProjectManifest(NamedTuple):
+    """프로젝트 루트와 그 아래 파일 목록"""
+    root: str
+    entries: List[ManifestEntry]
+    missing: List[str]  # 요청했지만 존재하지 않는 경로
+
+    @property
+    def files(self) -> List[Tuple[str, str]]:
+        """푸시에 사용할 (리포지토리 내 경로, 로컬 파일 경로) 목록"""
+        return [(entry.path, entry.local_path) for entry in self.entries]
+
+    @property
+    def shas(self) -> Dict[str, str]:
+        """이미 계산한 경로별 blob SHA"""
+        return {entry.path: entry.sha for entry in self.entries if entry.sha}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.PROJECT_SCAN_WORKERS, thread_name_prefix="scan")
+    return _executor
+
+
+def ignore_patterns() -> Tuple[str, ...]:
+    return tuple(p.strip() for p in settings.PROJECT_SCAN_IGNORE.split(",") if p.strip())
+
+
+def _ignore_matcher(patterns: Sequence[str]) -> Callable[[str], bool]:
+    """무시 규칙 검사 함수. 와일드카드가 없는 이름은 집합으로, 나머지는 하나의 정규식으로 검사"""
+    names = {p for p in patterns if not any(c in p for c in "*?[")}
+    globs = [p for p in patterns if p not in names]
+    regex = re.compile("|".join(fnmatch.translate(p) for p in globs)) if globs else None
+    if regex is None:
+        return names.__contains__
+    return lambda name: name in names or regex.match(name) is not None
+
+
+def to_data_path(path: str) -> str:
+    """AI 서버가 알려준 호스트 경로(PROJECT_HOST_DIR)를 이 컨테이너의 경로(PROJECT_DATA_DIR)로 변환"""
+    host_dir = settings.PROJECT_HOST_DIR.rstrip("/")
+    if path == host_dir or path.startswith(host_dir + "/"):
+        return settings.PROJECT_DATA_DIR.rstrip("/") + path[len(host_dir):]
+    return path
+
+
+class UnsafePathError(ValueError):
+    """프로젝트 데이터 디렉토리(PROJECT_DATA_DIR) 밖을 가리키는 경로"""
+
+
+def _is_within(base: str, resolved: str) -> bool:
+    return resolved == base or resolved.startswith(base + os.sep)
+
+
+def confine_path(base: str, path: str) -> str:
+    """base 기준 상대 경로의 심볼릭 링크와 ".."를 풀어, base 안의 실제 경로만 반환.
+
+    Raises:
+        UnsafePathError: base 밖을 가리키는 경로일 때 (절대 경로 포함)
+    """
+    base = os.path.realpath(base)
+    resolved = os.path.realpath(os.path.join(base, path))
+    if not _is_within(base, resolved):
+        raise UnsafePathError(f"Path '{path}' is outside the allowed directory")
+    return resolved
+
+
+def resolve_data_path(path: str) -> str:
+    """호스트 경로를 컨테이너 경로로 바꾼 뒤 심볼릭 링크와 ".."를 풀어, PROJECT_DATA_DIR 안의 경로만 반환.
+
+    AI 서버나 클라이언트가 보낸 경로로 서버의 다른 파일(.env, /etc 등)을 읽어 푸시하지 않도록 한다.
+
+    Raises:
+        UnsafePathError: 데이터 디렉토리 밖의 경로일 때
+    """
+    data_dir = os.path.realpath(settings.PROJECT_DATA_DIR)
+    resolved = os.path.realpath(to_data_path(path))
+    if not _is_within(data_dir, resolved):
+        raise UnsafePathError(f"Path '{path}' is outside the project data directory")
+    return resolved
+
+
+def walk(root: str, patterns: Sequence[str] = ()) -> List[str]:
+    """os.scandir로 디렉토리를 순회해 무시 규칙에 걸리지 않는 파일 경로 목록을 반환.
+
+    심볼릭 링크는 디렉토리든 파일이든 따라가지 않고 건너뛴다. 링크가 데이터 디렉토리 밖의 파일을
+    가리키면 그 내용이 리포지토리에 푸시되기 때문이다.
+    """
+    ignored = _ignore_matcher(patterns)
+    files = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if ignored(entry.name):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append(entry.path)
+        except OSError:
+            continue
+    return files
+
+
+def _describe(root: str, local_paths: List[str], hash_files: bool) -> List[Optional[ManifestEntry]]:
+    """파일 묶음의 크기/수정 시간을 읽고 blob SHA를 계산 (스레드 풀에서 실행)"""
+    entries = []
+    prefix = os.path.join(root, "")
+    for local_path in local_paths:
+        try:
+            stat = os.stat(local_path)
+            sha = None
+            if hash_files and stat.st_size <= settings.GITHUB_MAX_FILE_SIZE:
+                sha = git_blob_sha(local_path, stat.st_size)
+        except OSError:
+            entries.append(None)
+            continue
+        rel_path = local_path[len(prefix):] if local_path.startswith(prefix) else os.path.relpath(local_path, root)
+        rel_path = rel_path.replace(os.sep, "/")
+        entries.append(ManifestEntry(rel_path, local_path, stat.st_size, stat.st_mtime, sha))
+    return entries
+
+
+def _stat_batch(paths: List[str]) -> List[Optional[os.stat_result]]:
+    results = []
+    for path in paths:
+        try:
+            results.append(os.stat(path))
+        except OSError:
+            results.append(None)
+    return results
+
+
+async def stat_many(paths: Sequence[str]) -> List[Optional[os.stat_result]]:
+    """여러 경로를 공유 스레드 풀에서 BATCH_SIZE개씩 나눠 stat. 존재하지 않는 경로는 None"""
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    paths = list(paths)
+    batches = await asyncio.gather(*(
+        loop.run_in_executor(executor, _stat_batch, paths[i:i + BATCH_SIZE])
+        for i in range(0, len(paths), BATCH_SIZE)
+    ))
+    return [result for batch in batches for result in batch]
+
+
+def _describe_exact(root: str, names: List[str], hash_files: bool) -> List[Optional[ManifestEntry]]:
+    """요청한 이름 그대로 파일 정보를 반환 (스레드 풀에서 실행). 디렉토리는 크기 0, SHA 없이 반환"""
+    entries = []
+    for name in names:
+        local_path = os.path.join(root, name)
+        try:
+            stat = os.stat(local_path)
+            sha = None
+            is_file = not os.path.isdir(local_path)
+            if hash_files and is_file and stat.st_size <= settings.GITHUB_MAX_FILE_SIZE:
+                sha = git_blob_sha(local_path, stat.st_size)
+        except OSError:
+            entries.append(None)
+            continue
+        entries.append(ManifestEntry(name, local_path, stat.st_size if is_file else 0, stat.st_mtime, sha))
+    return entries
+
+
+async def describe_paths(root: str, names: Sequence[str], hash_files: bool = True) -> List[Optional[ManifestEntry]]:
+    """root 기준 경로 목록의 크기/수정 시간/blob SHA를 요청 순서대로 반환. 존재하지 않는 경로는 None.
+
+    공유 스레드 풀에서 BATCH_SIZE개씩 나눠 동시에 처리한다.
+    """
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    names = list(names)
+    batches = await asyncio.gather(*(
+        loop.run_in_executor(executor, _describe_exact, root, names[i:i + BATCH_SIZE], hash_files)
+        for i in range(0, len(names), BATCH_SIZE)
+    ))
+    return [entry for batch in batches for entry in batch]
+
+
+def project_root(paths: Iterable[str]) -> str:
+    """경로들의 공통 상위 디렉토리. PROJECT_DATA_DIR 아래라면 그 바로 아래 프로젝트 디렉토리까지만 올라감"""
+    directories = [p if os.path.isdir(p) else os.path.dirname(p) for p in paths]
+    if not directories:
+        return settings.PROJECT_DATA_DIR
+    root = os.path.commonpath(directories)
+    data_dir = os.path.abspath(settings.PROJECT_DATA_DIR)
+    rel = os.path.relpath(root, data_dir)
+    if not rel.startswith("..") and rel != "." and os.sep in rel:
+        root = os.path.join(data_dir, rel.split(os.sep)[0])
+    return root
+
+
+async def scan_project(
+    root: Optional[str] = None,
+    paths: Optional[Sequence[str]] = None,
+    hash_files: bool = True,
+    patterns: Optional[Sequence[str]] = None,
+) -> ProjectManifest:
+    """프로젝트 파일 목록(상대 경로, 크기, 수정 시간, blob SHA)을 만든다.
+
+    paths의 디렉토리는 하위 파일 전체로, 파일은 그대로 포함한다(root 기준 상대 경로 또는 절대 경로).
+    paths가 없으면 root 전체를 순회한다. root가 없으면 paths의 공통 프로젝트 디렉토리를 사용한다.
+    디렉토리 순회는 한 스레드에서, stat과 해시는 공유 스레드 풀에서 BATCH_SIZE개씩 나눠 실행한다.
+
+    Args:
+        root (str, optional): 프로젝트 루트 디렉토리
+        paths (Sequence[str], optional): 포함할 파일/디렉토리
+        hash_files (bool): blob SHA 계산 여부
+        patterns (Sequence[str], optional): 무시할 이름 패턴, 기본값은 PROJECT_SCAN_IGNORE
+
+    Returns:
+        ProjectManifest: 상대 경로 순으로 정렬된 파일 목록
+    """
+    patterns = ignore_patterns() if patterns is None else tuple(patterns)
+
+    def collect() -> Tuple[str, List[str], List[str]]:
+        if paths is None:
+            base = os.path.abspath(root)
+            return base, walk(base, patterns), []
+        absolute = [os.path.join(root, p) if root else p for p in paths]
+        base = os.path.abspath(root or project_root(p for p in absolute if os.path.exists(p)))
+        found, missing = [], []
+        for requested, path in zip(paths, absolute):
+            if os.path.isdir(path):
+                found += walk(path, patterns)
+            elif os.path.isfile(path):
+                found.append(path)
+            else:
+                missing.append(requested)
+        return base, found, missing
+
+    root, local_paths, missing = await asyncio.to_thread(collect)
+    # 중복 지정된 파일 제거
+    local_paths = list(dict.fromkeys(os.path.abspath(p) for p in local_paths))
+
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    batches = await asyncio.gather(*(
+        loop.run_in_executor(executor, _describe, root, local_paths[i:i + BATCH_SIZE], hash_files)
+        for i in range(0, len(local_paths), BATCH_SIZE)
+    ))
+    entries = [entry for batch in batches for entry in batch if entry is not None]
+    entries.sort(key=lambda entry: entry.path)
+    return ProjectManifest(root, entries, missing)
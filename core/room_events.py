@@ -0,0 +1,164 @@
+import asyncio
+import json
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Deque, Optional, Set, Tuple
+
+from core.config import settings
+from core.metrics import Counter
+
+ROOM_EVENTS_PUBLISHED = Counter(
+    "room_events_published_total",
+    "Events published to room subscribers",
+    labelnames=("event",),
+)
+ROOM_SUBSCRIBERS_DROPPED = Counter(
+    "room_event_subscribers_dropped_total",
+    "Room subscribers disconnected because their buffer was full",
+)
+
+
+def sse_event(event: str, data) -> str:
+    """이름 있는 SSE 이벤트 프레임 생성 (data는 JSON 인코딩)"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_frame(seq: int, event: str, data) -> str:
+    """이벤트 번호가 붙은 SSE 프레임 (data는 JSON 인코딩)"""
+    return f"id: {seq}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class _Subscriber:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+
+    def close(self):
+        """스트림 종료 표시. 큐에 자리가 있으면 대기 중인 구독자를 바로 깨움"""
+        self.closed = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+
+class _Room:
+    def __init__(self, buffer_size: int):
+        self.seq = 0
+        self.buffer: Deque[Tuple[int, str]] = deque(maxlen=buffer_size)
+        self.subscribers: Set[_Subscriber] = set()
+
+
+class RoomEventHub:
+    """대화 방별 이벤트를 여러 SSE 구독자에게 전달하는 프로세스 내 pub/sub.
+
+    이벤트는 발행할 때 한 번만 SSE 프레임으로 직렬화해 구독자별 제한된 asyncio 큐에 넣는다.
+    큐가 가득 찬 느린 구독자는 연결을 끊어 다른 구독자와 발행하는 쪽이 기다리지 않게 하고,
+    방마다 최근 이벤트를 링 버퍼에 남겨 재연결한 클라이언트가 Last-Event-ID 이후 이벤트를 다시 받게 한다.
+
+    Args:
+        buffer_size (int): 방별로 보관할 최근 이벤트 수
+        queue_size (int): 구독자별 대기 이벤트 수 상한
+        heartbeat (float): 이벤트가 없을 때 연결 유지용 주석을 보낼 간격(초)
+        max_rooms (int): 구독자가 없는 방의 상태를 보관할 최대 방 개수
+    """
+
+    def __init__(self, buffer_size: int, queue_size: int, heartbeat: float, max_rooms: int):
+        self.buffer_size = buffer_size
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.max_rooms = max_rooms
+        self._rooms: "OrderedDict[int, _Room]" = OrderedDict()
+
+    def _room(self, room_id: int) -> _Room:
+        room = self._rooms.get(room_id)
+        if room is None:
+            room = self._rooms[room_id] = _Room(self.buffer_size)
+            self._evict()
+        else:
+            self._rooms.move_to_end(room_id)
+        return room
+
+    def _evict(self):
+        """구독자가 없는 오래된 방부터 제거해 방 개수를 max_rooms 이하로 유지"""
+        excess = len(self._rooms) - self.max_rooms
+        if excess <= 0:
+            return
+        for room_id in [room_id for room_id, room in self._rooms.items() if not room.subscribers][:excess]:
+            del self._rooms[room_id]
+
+    def subscriber_count(self, room_id: int) -> int:
+        room = self._rooms.get(room_id)
+        return len(room.subscribers) if room else 0
+
+    def publish(self, room_id: int, event: str, data) -> int:
+        """방의 모든 구독자에게 이벤트를 보내고 이벤트 번호를 반환. 기다리지 않으므로 어디서든 바로 호출 가능"""
+        room = self._room(room_id)
+        room.seq += 1
+        frame = sse_frame(room.seq, event, data)
+        room.buffer.append((room.seq, frame))
+        ROOM_EVENTS_PUBLISHED.inc(event=event)
+        for subscriber in list(room.subscribers):
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # 느린 구독자는 끊고, 재연결 시 링 버퍼에서 이어 받도록 함
+                room.subscribers.discard(subscriber)
+                subscriber.closed = True
+                ROOM_SUBSCRIBERS_DROPPED.inc()
+        return room.seq
+
+    def close(self, room_id: int):
+        """방 삭제 시 구독자 스트림을 모두 종료하고 방 상태를 제거"""
+        room = self._rooms.pop(room_id, None)
+        if room is None:
+            return
+        for subscriber in room.subscribers:
+            subscriber.close()
+        room.subscribers.clear()
+
+    async def subscribe(self, room_id: int, last_event_id: Optional[int] = None) -> AsyncIterator[str]:
+        """방 이벤트를 SSE 프레임으로 반환. last_event_id가 있으면 링 버퍼에서 그 이후 이벤트를 먼저 보낸다.
+
+        링 버퍼에 남아 있지 않은 이벤트가 있으면 reset 이벤트를 보내 클라이언트가 메시지 목록을 다시 조회하게 한다.
+        구독자가 끊겼거나(느린 구독자) 방이 삭제되면 스트림이 끝난다.
+        """
+        room = self._room(room_id)
+        subscriber = _Subscriber(self.queue_size)
+        # 구독 등록과 버퍼 복사 사이에 대기가 없으므로 재전송과 실시간 이벤트가 겹치거나 빠지지 않음
+        room.subscribers.add(subscriber)
+        backlog = list(room.buffer)
+
+        try:
+            if last_event_id is not None:
+                # 서버 재시작 등으로 번호가 초기화된 경우 처음부터 다시 받음
+                if last_event_id > room.seq:
+                    last_event_id = 0
+                oldest = backlog[0][0] if backlog else room.seq + 1
+                if last_event_id < oldest - 1:
+                    yield f"event: reset\ndata: {json.dumps({'last_event_id': last_event_id})}\n\n"
+                for seq, frame in backlog:
+                    if seq > last_event_id:
+                        yield frame
+
+            while True:
+                if subscriber.closed and subscriber.queue.empty():
+                    return
+                try:
+                    frame = await asyncio.wait_for(subscriber.queue.get(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            room.subscribers.discard(subscriber)
+
+
+# 앱 전체에서 공유하는 방 이벤트 허브
+room_events = RoomEventHub(
+    buffer_size=settings.ROOM_EVENT_BUFFER,
+    queue_size=settings.ROOM_EVENT_QUEUE_SIZE,
+    heartbeat=settings.ROOM_EVENT_HEARTBEAT,
+    max_rooms=settings.ROOM_EVENT_MAX_ROOMS,
+)
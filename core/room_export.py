@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.ai_client import ai_client
+from core.config import settings
+from core.context_builder import PAYLOAD_BYTES
+from core.database import ReadSessionLocal, read_pool_capacity
+from core.export_store import ExportInfo, dumps, export_store
+from core.metrics import Counter
+from core.models import ChatRoom, Message, SUMMARY_MESSAGE
+
+logger = logging.getLogger(__name__)
+
+BATCH_EXPORT_ROOMS = Counter(
+    "batch_export_rooms_total",
+    "Rooms processed by batch exports",
+    labelnames=("status",),
+)
+
+# AI 응답을 디스크로 옮길 때 한 번에 읽는 크기
+RESPONSE_CHUNK_SIZE = 64 * 1024
+
+# 요청 본문 형식별 Content-Type
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+
+class ExportUpstreamError(Exception):
+    """AI 서버가 내보내기 요청을 처리하지 못함"""
+
+
+def conversation_query(room_id: int):
+    """내보낼 대화(요약 메시지 제외)를 시간순으로 조회하는 쿼리. 필요한 컬럼만 읽는다."""
+    return (
+        select(Message.content, Message.is_system)
+        .where(Message.chat_room_id == room_id, Message.is_system != SUMMARY_MESSAGE)
+        .order_by(Message.created_at, Message.id)
+    )
+
+
+async def has_messages(db: AsyncSession, room_id: int) -> bool:
+    query = select(Message.id).where(Message.chat_room_id == room_id, Message.is_system != SUMMARY_MESSAGE).limit(1)
+    return (await db.execute(query)).first() is not None
+
+
+def encode_rows(rows: List[Tuple[str, int]]) -> bytes:
+    """메시지 묶음을 NDJSON 줄들로 직렬화"""
+    return b"".join(dumps({"content": content, "is_system": is_system}) + b"\n" for content, is_system in rows)
+
+
+async def iter_conversation(db: AsyncSession, room_id: int, batch_size: int) -> AsyncIterator[bytes]:
+    """대화를 batch_size개씩 서버 측 커서로 읽어 NDJSON 조각으로 반환 (전체 대화를 메모리에 올리지 않음)"""
+    result = await db.stream(conversation_query(room_id).execution_options(yield_per=batch_size))
+    try:
+        async for rows in result.partitions():
+            yield encode_rows(rows)
+    finally:
+        await result.close()
+
+
+async def request_body(db: AsyncSession, room_id: int, batch_size: int, body_format: str) -> AsyncIterator[bytes]:
+    """AI 서버로 보낼 chunked 요청 본문.
+
+    json이면 기존과 같은 JSON 배열, ndjson이면 메시지마다 한 줄을 조각 단위로 만든다.
+    """
+    sent = 0
+    first = True
+    if body_format == "json":
+        yield b"["
+        sent += 1
+    async for chunk in iter_conversation(db, room_id, batch_size):
+        if body_format == "json":
+            # 줄 구분자를 배열 구분자로 바꿈
+            chunk = (b"" if first else b",") + chunk[:-1].replace(b"\n", b",")
+        first = False
+        sent += len(chunk)
+        yield chunk
+    if body_format == "json":
+        yield b"]"
+        sent += 1
+    PAYLOAD_BYTES.observe(sent, endpoint="process")
+
+
+async def export_room(db: AsyncSession, room_id: int) -> ExportInfo:
+    """방의 대화를 AI 서버 /process로 스트리밍 전송하고 응답을 그대로 새 내보내기 버전으로 저장.
+
+    요청 본문은 settings.EXPORT_BATCH_SIZE개씩 읽은 메시지로 조각 단위로 만들고, 응답도 받는 대로
+    파일에 쓰므로 대화 크기와 관계없이 메모리 사용량이 일정하다.
+
+    Args:
+        db (AsyncSession): 대화를 읽을 세션 (전송이 끝날 때까지 사용)
+        room_id (int): 대화 방 ID
+
+    Returns:
+        ExportInfo: 저장된 내보내기 버전
+
+    Raises:
+        ExportUpstreamError: AI 서버가 오류 상태나 JSON이 아닌 응답을 돌려줄 때
+        asyncio.TimeoutError, aiohttp.ClientError: AI 서버 연결/응답 지연
+    """
+    body_format = settings.EXPORT_REQUEST_FORMAT
+    body = request_body(db, room_id, settings.EXPORT_BATCH_SIZE, body_format)
+    async with ai_client.post("/process", data=body, headers={"Content-Type": CONTENT_TYPES[body_format]}) as resp:
+        if resp.status != 200:
+            raise ExportUpstreamError(f"AI process request failed ({resp.status}): {(await resp.text())[:200]}")
+        if resp.content_type not in ("application/json", "application/x-ndjson"):
+            raise ExportUpstreamError(f"Unexpected AI process response type: {resp.content_type}")
+        async with export_store.open(room_id) as writer:
+            async for chunk in resp.content.iter_chunked(RESPONSE_CHUNK_SIZE):
+                await writer.write(chunk)
+    return writer.info
+
+
+async def exportable_rooms(
+    db: AsyncSession,
+    room_ids: Optional[List[int]] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> List[Tuple[int, int]]:
+    """내보낼 메시지가 있는 방과 메시지 수를 한 번의 GROUP BY 쿼리로 조회 (방 ID 순).
+
+    Args:
+        room_ids (list, optional): 대상 방 ID 목록
+        created_from (datetime, optional): 이 시각 이후(포함) 생성된 방만
+        created_to (datetime, optional): 이 시각 이전(미포함) 생성된 방만
+    """
+    query = (
+        select(Message.chat_room_id, func.count())
+        .where(Message.is_system != SUMMARY_MESSAGE)
+        .group_by(Message.chat_room_id)
+        .order_by(Message.chat_room_id)
+    )
+    if room_ids is not None:
+        query = query.where(Message.chat_room_id.in_(room_ids))
+    if created_from is not None or created_to is not None:
+        query = query.join(ChatRoom, ChatRoom.id == Message.chat_room_id)
+        if created_from is not None:
+            query = query.where(ChatRoom.created_at >= created_from)
+        if created_to is not None:
+            query = query.where(ChatRoom.created_at < created_to)
+    return [(room_id, count) for room_id, count in (await db.execute(query)).all()]
+
+
+def max_batch_concurrency() -> int:
+    """일괄 내보내기에서 동시에 처리할 수 있는 방 수.
+
+    방마다 읽기 세션(연결)을 하나씩 쓰므로 EXPORT_BATCH_MAX_CONCURRENCY가 읽기 엔진 풀 크기
+    (pool_size + max_overflow)보다 크면 풀 크기로 제한한다. 넘으면 남는 워커가 풀 대기 시간 초과로 실패한다.
+    """
+    if read_pool_capacity is None:
+        return settings.EXPORT_BATCH_MAX_CONCURRENCY
+    return max(min(settings.EXPORT_BATCH_MAX_CONCURRENCY, read_pool_capacity), 1)
+
+
+async def export_one(room_id: int, messages: int) -> dict:
+    """방 하나를 새 읽기 전용 세션으로 내보내고 결과를 dict로 반환. 실패해도 예외 대신 failed 결과를 반환한다."""
+    started = time.perf_counter()
+    try:
+        async with ReadSessionLocal() as db:
+            info = await export_room(db, room_id)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning("Batch export failed for room %s: %r", room_id, e)
+        BATCH_EXPORT_ROOMS.inc(status="failed")
+        return {"room_id": room_id, "status": "failed", "messages": messages, "error": str(e) or type(e).__name__}
+    BATCH_EXPORT_ROOMS.inc(status="exported")
+    return {
+        **info.to_dict(),
+        "status": "exported",
+        "messages": messages,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+async def export_rooms(rooms: Iterable[Tuple[int, int]], concurrency: int) -> AsyncIterator[dict]:
+    """여러 방을 최대 concurrency개씩 동시에 내보내고, 끝나는 순서대로 방별 결과를 반환.
+
+    방마다 작업을 만들지 않고 concurrency개의 워커가 방 목록을 나눠 처리하므로 방이 수천 개여도
+    동시에 열리는 세션과 AI 요청 수가 제한된다. 호출한 쪽이 중간에 반복을 멈추면 남은 작업은 취소된다.
+
+    Args:
+        rooms (Iterable[Tuple[int, int]]): (방 ID, 메시지 수) 목록
+        concurrency (int): 동시에 내보낼 방 수 (max_batch_concurrency()를 넘으면 그 값으로 제한)
+
+    Yields:
+        dict: 방별 결과 (status: exported 또는 failed)
+    """
+    concurrency = min(max(concurrency, 1), max_batch_concurrency())
+    pending = iter(rooms)
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def worker():
+        for room_id, messages in pending:
+            await results.put(await export_one(room_id, messages))
+
+    async def run_workers():
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        finally:
+            await results.put(None)
+
+    runner = asyncio.create_task(run_workers())
+    try:
+        while True:
+            result = await results.get()
+            if result is None:
+                break
+            yield result
+        await runner
+    finally:
+        if not runner.done():
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
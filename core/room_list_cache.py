@@ -0,0 +1,128 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.metrics import Counter
+from core.models import ChatRoom
+
+ROOM_LIST_CACHE_REQUESTS = Counter(
+    "room_list_cache_requests_total",
+    "Room list cache lookups",
+    labelnames=("result",),
+)
+
+# 캐시할 페이지(limit/offset 조합) 수 상한
+MAX_CACHED_PAGES = 64
+
+
+class RoomPage(NamedTuple):
+    """직렬화가 끝난 방 목록 페이지"""
+    body: bytes
+    etag: str
+    total: int
+
+
+def serialize_room(room: ChatRoom) -> bytes:
+    return json.dumps({
+        "room_id": room.id,
+        "name": room.name,
+        "repo_url": room.repo_url,
+        "created_at": room.created_at.isoformat()
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def make_etag(body: bytes) -> str:
+    """응답 본문 해시로 만든 강한 ETag (서버가 재시작되어도 내용이 같으면 같은 값)"""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+class RoomListCache:
+    """GET /chat/rooms 응답용 방 목록 캐시.
+
+    방마다 JSON을 한 번만 직렬화해 두고, 요청한 limit/offset 범위를 이어 붙인 본문과 ETag를
+    페이지별로 보관한다. 방 생성/삭제 시 invalidate()로 비우고, 다른 프로세스에서 바뀐 내용도
+    반영되도록 ttl초가 지나면 DB에서 다시 읽는다. 동시에 여러 요청이 비어 있는 캐시를 만나도
+    DB 조회는 한 번만 실행한다.
+
+    Args:
+        ttl (float): 캐시 유효 시간(초), 0이면 캐시하지 않음
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._rows: Optional[List[bytes]] = None
+        self._pages: Dict[Tuple[int, Optional[int]], RoomPage] = {}
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self._generation += 1
+        self._rows = None
+        self._pages.clear()
+
+    async def _load(self, db: AsyncSession) -> List[bytes]:
+        rooms = (await db.execute(select(ChatRoom).order_by(ChatRoom.id))).scalars().all()
+        return [serialize_room(room) for room in rooms]
+
+    async def _get_rows(self, db: AsyncSession) -> List[bytes]:
+        if self.ttl <= 0:
+            return await self._load(db)
+        if self._rows is not None and self._expires_at > time.monotonic():
+            ROOM_LIST_CACHE_REQUESTS.inc(result="hit")
+            return self._rows
+        async with self._lock:
+            # 잠금을 기다리는 동안 다른 요청이 이미 채웠으면 그대로 사용
+            if self._rows is not None and self._expires_at > time.monotonic():
+                ROOM_LIST_CACHE_REQUESTS.inc(result="hit")
+                return self._rows
+            ROOM_LIST_CACHE_REQUESTS.inc(result="miss")
+            generation = self._generation
+            rows = await self._load(db)
+            # 조회 중에 방이 생성/삭제되었으면 이번 결과는 캐시하지 않음
+            if generation == self._generation:
+                self._rows = rows
+                self._pages.clear()
+                self._expires_at = time.monotonic() + self.ttl
+            return rows
+
+    async def page(self, db: AsyncSession, offset: int = 0, limit: Optional[int] = None) -> RoomPage:
+        """방 목록 중 offset부터 limit개(미지정 시 끝까지)를 직렬화된 JSON 배열로 반환"""
+        rows = await self._get_rows(db)
+        key = (offset, limit)
+        cached = self._pages.get(key) if rows is self._rows else None
+        if cached is not None:
+            return cached
+        selected = rows[offset:offset + limit] if limit is not None else rows[offset:]
+        body = b"[" + b",".join(selected) + b"]"
+        result = RoomPage(body, make_etag(body), len(rows))
+        if rows is self._rows:
+            if len(self._pages) >= MAX_CACHED_PAGES:
+                self._pages.clear()
+            self._pages[key] = result
+        return result
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 (GET 조건부 요청은 약한 비교를 사용)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+# 앱 전체에서 공유하는 방 목록 캐시
+room_list_cache = RoomListCache(ttl=settings.ROOM_LIST_CACHE_TTL)
@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from core.config import settings
+from core.metrics import Counter
+
+FLIGHT_REQUESTS = Counter(
+    "generate_code_flights_total",
+    "Message requests by how they were served (leader, coalesced, replayed, rejected)",
+    labelnames=("result",),
+)
+
+# 완료된 멱등 키 결과 보관 개수 상한
+MAX_STORED_RESULTS = 1024
+
+
+class RoomBusyError(Exception):
+    """방에서 처리 중이거나 대기 중인 요청이 너무 많음"""
+
+
+class IdempotencyConflictError(Exception):
+    """같은 멱등 키로 다른 내용의 요청을 보냄"""
+
+
+class Flight:
+    """acquire()가 돌려주는 요청 하나의 처리 상태.
+
+    leader이면 호출한 쪽이 실제로 처리하고 result에 결과를 넣는다.
+    leader가 아니면 같은 요청의 결과가 이미 result에 들어 있다.
+    """
+
+    def __init__(self, leader: bool, result: Any = None):
+        self.leader = leader
+        self.result = result
+
+
+class _RoomQueue:
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0  # 잠금을 가진 요청과 기다리는 요청 수
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class RoomSingleFlight:
+    """대화 방별 요청 중복 제거와 직렬화.
+
+    같은 방에 같은 내용(또는 같은 멱등 키)의 요청이 처리 중이면 새로 처리하지 않고 진행 중인 요청의
+    결과를 함께 기다린다. 처리는 방마다 하나씩 순서대로 실행하고, 앞 요청을 기다리는 요청이
+    max_pending개를 넘으면 RoomBusyError를 발생시킨다. 멱등 키가 있는 요청의 결과는 result_ttl초 동안
+    보관해 재시도한 요청에도 같은 결과를 돌려준다. 처리하던 요청이 취소되면 기다리던 요청 중 하나가
+    이어서 처리한다.
+
+    Args:
+        max_pending (int): 방별로 앞 요청을 기다릴 수 있는 요청 수
+        result_ttl (float): 멱등 키 결과 보관 시간(초)
+    """
+
+    def __init__(self, max_pending: int, result_ttl: float):
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._inflight: Dict[Tuple, Tuple[asyncio.Future, str]] = {}
+        self._results: "OrderedDict[Tuple, Tuple[float, str, Any]]" = OrderedDict()
+        self._rooms: Dict[int, _RoomQueue] = {}
+
+    def _stored(self, key: Tuple) -> Optional[Tuple[float, str, Any]]:
+        entry = self._results.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._results[key]
+            return None
+        return entry
+
+    def _store(self, key: Tuple, digest: str, result: Any):
+        self._results[key] = (time.monotonic() + self.result_ttl, digest, result)
+        self._results.move_to_end(key)
+        while len(self._results) > MAX_STORED_RESULTS:
+            self._results.popitem(last=False)
+
+    @asynccontextmanager
+    async def _room_slot(self, room_id: int):
+        """방의 처리 순서를 기다렸다가 잠금을 잡음. 대기 중인 요청이 max_pending개를 넘으면 RoomBusyError"""
+        queue = self._rooms.get(room_id)
+        if queue is None:
+            queue = self._rooms[room_id] = _RoomQueue()
+        queue.users += 1
+        try:
+            if queue.users > self.max_pending + 1:
+                raise RoomBusyError(f"Room {room_id} has too many pending messages")
+            async with queue.lock:
+                yield
+        finally:
+            queue.users -= 1
+            if queue.users == 0:
+                self._rooms.pop(room_id, None)
+
+    @asynccontextmanager
+    async def acquire(self, room_id: int, content: str, idempotency_key: Optional[str] = None) -> AsyncIterator[Flight]:
+        """요청 하나를 처리할 Flight를 반환. leader이면 with 블록 안에서 처리하고 flight.result에 결과를 넣는다.
+
+        Args:
+            room_id (int): 대화 방 ID
+            content (str): 요청 내용 (중복 판별에 사용)
+            idempotency_key (str, optional): 클라이언트가 보낸 멱등 키, 지정 시 내용 대신 이 값으로 중복 판별
+
+        Raises:
+            RoomBusyError: 방에서 기다리는 요청이 너무 많을 때
+            IdempotencyConflictError: 같은 멱등 키로 다른 내용을 보냈을 때
+        """
+        digest = content_hash(content)
+        key = (room_id, "idempotency", idempotency_key) if idempotency_key else (room_id, "content", digest)
+
+        while True:
+            stored = self._stored(key) if idempotency_key else None
+            if stored is not None:
+                if stored[1] != digest:
+                    raise IdempotencyConflictError(f"Idempotency key '{idempotency_key}' was used with different content")
+                FLIGHT_REQUESTS.inc(result="replayed")
+                yield Flight(leader=False, result=stored[2])
+                return
+
+            entry = self._inflight.get(key)
+            if entry is None:
+                break
+            future, entry_digest = entry
+            if entry_digest != digest:
+                raise IdempotencyConflictError(f"Idempotency key '{idempotency_key}' was used with different content")
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # 처리하던 요청이 취소되었으면 이 요청이 이어서 처리
+                if future.cancelled():
+                    continue
+                raise
+            FLIGHT_REQUESTS.inc(result="coalesced")
+            yield Flight(leader=False, result=result)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (future, digest)
+        flight = Flight(leader=True)
+        try:
+            async with self._room_slot(room_id):
+                FLIGHT_REQUESTS.inc(result="leader")
+                yield flight
+        except (asyncio.CancelledError, GeneratorExit):
+            future.cancel()
+            raise
+        except BaseException as e:
+            if isinstance(e, RoomBusyError):
+                FLIGHT_REQUESTS.inc(result="rejected")
+            future.set_exception(e)
+            # 기다리는 요청이 없어도 경고가 남지 않도록 예외를 확인 처리
+            future.exception()
+            raise
+        else:
+            future.set_result(flight.result)
+            if idempotency_key:
+                self._store(key, digest, flight.result)
+        finally:
+            self._inflight.pop(key, None)
+
+
+# 앱 전체에서 공유하는 메시지 요청 중복 제거기
+message_flights = RoomSingleFlight(
+    max_pending=settings.MESSAGE_ROOM_MAX_PENDING,
+    result_ttl=settings.IDEMPOTENCY_KEY_TTL,
+)
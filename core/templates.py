@@ -0,0 +1,93 @@
+import os
+import re
+from typing import Dict, FrozenSet, NamedTuple, Optional
+
+# {{ name }} 형식의 자리표시자. GitHub Actions 표현식 ${{ ... }}은 치환하지 않는다.
+PLACEHOLDER = re.compile(r"(?<!\$)\{\{\s*([A-Za-z_]\w*)\s*\}\}")
+
+
+class TemplateError(Exception):
+    """템플릿 로드/검증/렌더링 실패"""
+
+
+class Template(NamedTuple):
+    """메모리에 올려 둔 템플릿 하나"""
+    name: str
+    repo_path: str  # 리포지토리에 커밋할 경로
+    source_path: str  # 로컬 템플릿 파일 경로
+    text: str
+    mtime: float
+    placeholders: FrozenSet[str]
+
+
+class TemplateRegistry:
+    """리포지토리에 커밋할 파일 템플릿을 한 번만 읽어 두고 프로젝트별 값으로 렌더링하는 저장소.
+
+    load()에서 모든 템플릿을 읽고 검증하므로 파일이 없거나 알 수 없는 자리표시자가 있으면
+    앱 시작 시점에 실패한다. reload=True이면 조회할 때마다 파일 수정 시간을 확인해
+    바뀐 템플릿만 다시 읽는다(다시 읽다 실패하면 기존 템플릿을 유지).
+
+    Args:
+        directory (str): 템플릿 파일이 있는 디렉토리
+        files (Dict[str, str]): {템플릿 파일 이름: 리포지토리 내 경로}
+        variables (Dict[str, Optional[str]]): 사용할 수 있는 자리표시자와 기본값 (None이면 렌더링 시 필수)
+        reload (bool): 파일 수정 시 다시 읽을지 여부
+    """
+
+    def __init__(self, directory: str, files: Dict[str, str], variables: Dict[str, Optional[str]], reload: bool = False):
+        self.directory = directory
+        self.files = dict(files)
+        self.variables = dict(variables)
+        self.reload = reload
+        self._templates: Dict[str, Template] = {}
+
+    def _read(self, name: str) -> Template:
+        source_path = os.path.join(self.directory, name)
+        try:
+            mtime = os.path.getmtime(source_path)
+            with open(source_path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            raise TemplateError(f"Failed to load template '{name}': {e}") from e
+        if not text.strip():
+            raise TemplateError(f"Template '{name}' is empty")
+        placeholders = frozenset(PLACEHOLDER.findall(text))
+        unknown = placeholders - set(self.variables)
+        if unknown:
+            raise TemplateError(f"Template '{name}' uses unknown placeholders: {', '.join(sorted(unknown))}")
+        return Template(name, self.files[name], source_path, text, mtime, placeholders)
+
+    def load(self):
+        """모든 템플릿을 읽고 검증 (앱 시작 시 호출)"""
+        self._templates = {name: self._read(name) for name in self.files}
+
+    def get(self, name: str) -> Template:
+        """템플릿 조회. 아직 로드하지 않았으면 로드하고, reload이면 수정된 파일을 다시 읽음"""
+        if not self._templates:
+            self.load()
+        template = self._templates[name]
+        if self.reload:
+            try:
+                changed = os.path.getmtime(template.source_path) != template.mtime
+            except OSError:
+                changed = False
+            if changed:
+                try:
+                    template = self._templates[name] = self._read(name)
+                except TemplateError as e:
+                    print(f"Keeping previous template: {e}")
+        return template
+
+    def render(self, name: str, **values: str) -> str:
+        """템플릿의 자리표시자를 주어진 값(없으면 기본값)으로 치환"""
+        template = self.get(name)
+        merged = {key: value for key, value in self.variables.items() if value is not None}
+        merged.update({key: str(value) for key, value in values.items() if value is not None})
+        missing = template.placeholders - set(merged)
+        if missing:
+            raise TemplateError(f"Missing values for template '{name}': {', '.join(sorted(missing))}")
+        return PLACEHOLDER.sub(lambda m: merged[m.group(1)], template.text)
+
+    def render_all(self, **values: str) -> Dict[str, str]:
+        """모든 템플릿을 렌더링해 {리포지토리 내 경로: 내용}으로 반환"""
+        return {self.files[name]: self.render(name, **values) for name in self.files}
@@ -0,0 +1,185 @@
+import re
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from core.config import settings
+from core.metrics import LATENCY_BUCKETS, Gauge, Histogram
+
+# 라우트별 요청 처리 시간 (스트리밍 응답은 마지막 청크를 보낼 때까지)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request until its response body is fully sent",
+    buckets=LATENCY_BUCKETS,
+    labelnames=("method", "route", "status"),
+)
+# 라우트별 응답 헤더를 보내기까지의 시간 (SSE 응답에서 첫 바이트 지연 확인용)
+REQUEST_FIRST_BYTE = Histogram(
+    "http_request_first_byte_seconds",
+    "Time from receiving a request until its response headers are sent",
+    buckets=LATENCY_BUCKETS,
+    labelnames=("method", "route"),
+)
+# 외부 호출별 소요 시간 (target: db, ai, github, file)
+UPSTREAM_LATENCY = Histogram(
+    "upstream_duration_seconds",
+    "Time spent in calls to the database, the AI server, the GitHub API and the local filesystem",
+    buckets=LATENCY_BUCKETS,
+    labelnames=("target", "operation", "outcome"),
+)
+# 커넥션 풀에서 연결을 빌리기까지 기다린 시간 (풀 크기가 부족하면 길어짐)
+DB_POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a connection from the database pool",
+    buckets=(0.0005, 0.001, 0.005) + LATENCY_BUCKETS,
+    labelnames=("pool", "outcome"),
+)
+# 커넥션 풀 연결 수 (state: in_use, idle, size)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Database pool connections checked out (in_use), idle in the pool (idle) and the configured pool size (size)",
+    labelnames=("pool", "state"),
+)
+
+# GitHub API 경로를 메트릭 라벨로 쓸 수 있도록 리포지토리/브랜치/SHA 같은 가변 부분을 치환
+_REPO_PATH = re.compile(r"^/repos/[^/]+/[^/]+")
+_GITHUB_SEGMENTS = {"git": 2, "contents": 1, "actions": 3}
+
+# 라우트 정규식을 요청 경로 끝부분에 매칭하기 위한 캐시 (_route 참고)
+_suffix_patterns = {}
+
+
+def span(target: str, operation: str):
+    """외부 호출 한 번의 소요 시간을 UPSTREAM_LATENCY에 기록하는 컨텍스트 매니저"""
+    return UPSTREAM_LATENCY.time(target=target, operation=operation)
+
+
+def github_operation(method: str, path: str) -> str:
+    """GitHub API 호출을 "GET /repos/{repo}/git/trees"와 같은 라벨로 변환"""
+    path = path.split("?", 1)[0]
+    match = _REPO_PATH.match(path)
+    if match is None:
+        return f"{method} {path}"
+    parts = path[match.end():].strip("/").split("/")
+    keep = _GITHUB_SEGMENTS.get(parts[0], 1)
+    parts = parts[:keep]
+    if parts[0] == "actions" and len(parts) == 3 and parts[2] != "public-key":
+        parts[2] = "{name}"
+    return f"{method} /repos/{{repo}}" + "".join(f"/{p}" for p in parts if p)
+
+
+def instrument_engine(engine: Engine):
+    """SQLAlchemy 엔진의 쿼리 실행 시간을 UPSTREAM_LATENCY(target="db")에 기록.
+
+    비동기 엔진은 async_engine.sync_engine을 넘긴다.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        _observe(conn, statement, "ok")
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        if context.connection is not None:
+            _observe(context.connection, context.statement or "", "error")
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """연결을 빌릴 때까지 기다린 시간을 DB_POOL_CHECKOUT에 기록하는 비동기 엔진용 커넥션 풀.
+
+    create_async_engine(poolclass=MeteredQueuePool, pool_logging_name=이름)으로 사용하며,
+    pool_logging_name이 메트릭의 pool 라벨이 된다.
+    """
+
+    def _do_get(self):
+        with DB_POOL_CHECKOUT.time(pool=self._orig_logging_name or "default"):
+            return super()._do_get()
+
+
+def instrument_pool(engine: Engine, name: str):
+    """엔진 커넥션 풀의 사용 중/유휴 연결 수를 DB_POOL_CONNECTIONS로 노출.
+
+    dispose() 후 새로 만들어진 풀도 반영되도록 노출할 때마다 engine.pool을 다시 읽는다.
+    크기 개념이 없는 풀(SQLite 메모리 DB의 StaticPool 등)은 노출하지 않는다.
+    """
+    if not isinstance(engine.pool, QueuePool):
+        return
+    DB_POOL_CONNECTIONS.set_function(lambda: engine.pool.checkedout(), pool=name, state="in_use")
+    DB_POOL_CONNECTIONS.set_function(lambda: engine.pool.checkedin(), pool=name, state="idle")
+    DB_POOL_CONNECTIONS.set_function(lambda: engine.pool.size(), pool=name, state="size")
+
+
+def _observe(conn, statement: str, outcome: str):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+    UPSTREAM_LATENCY.observe(time.perf_counter() - starts.pop(), target="db", operation=operation, outcome=outcome)
+
+
+class TimingMiddleware:
+    """요청마다 라우트 템플릿(/chat/rooms/{room_id} 등) 기준으로 처리 시간을 기록하는 ASGI 미들웨어.
+
+    응답 본문을 감싸지 않는 순수 ASGI 미들웨어라 스트리밍 응답도 그대로 전달된다.
+    SLOW_REQUEST_THRESHOLD초 이상 걸린 요청은 로그로 출력한다.
+
+    Args:
+        app: 감쌀 ASGI 앱
+        slow_threshold (float, optional): 느린 요청 기준(초), 기본값은 settings.SLOW_REQUEST_THRESHOLD
+    """
+
+    def __init__(self, app, slow_threshold: Optional[float] = None):
+        self.app = app
+        self.slow_threshold = settings.SLOW_REQUEST_THRESHOLD if slow_threshold is None else slow_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                REQUEST_FIRST_BYTE.observe(time.perf_counter() - start, method=scope["method"], route=_route(scope))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            duration = time.perf_counter() - start
+            route = _route(scope)
+            REQUEST_LATENCY.observe(duration, method=scope["method"], route=route, status=status)
+            if self.slow_threshold and duration >= self.slow_threshold:
+                print(f"Slow request: {scope['method']} {scope['path']} ({route}) -> {status} in {duration:.3f}s")
+
+
+def _route(scope) -> str:
+    """라우터가 scope에 남긴 라우트 템플릿(include_router prefix 포함). 매칭되지 않은 요청은 "unmatched"로 묶음"""
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    regex = getattr(route, "path_regex", None)
+    if regex is None:
+        return template
+    # 라우터를 포함시킨 방식에 따라 route.path에 prefix가 빠져 있을 수 있으므로, 요청 경로에서 라우트가 매칭된 앞부분을 붙임
+    path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    suffix = _suffix_patterns.get(regex.pattern)
+    if suffix is None:
+        suffix = _suffix_patterns[regex.pattern] = re.compile(regex.pattern.lstrip("^"))
+    match = suffix.search(path)
+    return path[:match.start()] + template if match else template
@@ -1,14 +1,42 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware  # CORS 미들웨어 임포트
-from core.database import Base, engine
+from core.database import async_engine, create_schema, read_engine
 from core.config import settings  # 환경 변수 로드
+from core.ai_client import ai_client
+from core.github_client import github_client
+from core.jobs import job_queue
+from core import metrics
+from core.tracing import TimingMiddleware
 from api.chat.routes import router as chat_router
 from api.ai.routes import router as ai_router
 from api.github.routes import router as github_router
-from api.cicd.routes import router as cicd_router
+from api.cicd.routes import router as cicd_router, cicd_templates
+from api.jobs.routes import router as jobs_router
+
+# 앱 수명 주기: 시작 시 스키마 확인과 작업 큐 시작, 종료 시 공유 클라이언트와 DB 연결 정리
+# (AI/GitHub 클라이언트 세션은 처음 요청할 때 생성)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 데이터베이스 테이블 생성: 마이그레이션으로 관리하면 DB_CREATE_SCHEMA=false로 건너뜀
+    if settings.DB_CREATE_SCHEMA:
+        await create_schema()
+    # 배포 템플릿을 한 번 읽고 검증 (파일이 없거나 잘못되면 시작 실패)
+    cicd_templates.load()
+    # 재시작 전에 끝나지 않은 작업을 다시 큐에 넣고 워커 시작
+    await job_queue.start()
+    try:
+        yield
+    finally:
+        await job_queue.stop()
+        await ai_client.close()
+        await github_client.close()
+        await async_engine.dispose()
+        if read_engine is not async_engine:
+            await read_engine.dispose()
 
 # FastAPI 애플리케이션 인스턴스 생성
-app = FastAPI(root_path="/api")
+app = FastAPI(root_path="/api", lifespan=lifespan)
 
 # CORS 설정
 # 허용할 출처 목록: 프론트엔드와 AI 서버 URL
@@ -25,21 +53,26 @@ app.add_middleware(
     allow_methods=["*"],            # 모든 HTTP 메서드 허용 (GET, POST, PUT 등)
     allow_headers=["*"],            # 모든 헤더 허용
 )
-
-# 데이터베이스 테이블 생성: 서버 시작 시 실행
-Base.metadata.create_all(bind=engine)
+# 요청 처리 시간 계측 (CORS 미들웨어 바깥에서 전체 처리 시간을 측정)
+app.add_middleware(TimingMiddleware)
 
 # API 라우터 등록: 각 기능별 엔드포인트를 모듈화
 app.include_router(chat_router, prefix="/chat", tags=["chat"])
 app.include_router(ai_router, prefix="/ai", tags=["ai"])
 app.include_router(github_router, prefix="/github", tags=["github"])
 app.include_router(cicd_router, prefix="/cicd", tags=["cicd"])
+app.include_router(jobs_router, prefix="/jobs", tags=["jobs"])
 
 # 루트 엔드포인트
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the JAVIS"}
 
+# Prometheus 메트릭 엔드포인트
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 #
 # # 레포지토리 생성 함수
 # def create_github_repo(repo_name: str):